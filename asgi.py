@@ -0,0 +1,9 @@
+# asgi.py
+# Run with: uvicorn asgi:app --host 0.0.0.0 --port 5000
+# /bp_llama/api/messages/process is streamed on the event loop; every other
+# route is served by the Flask app exactly as under wsgi.py.
+from backend.app import create_app
+from backend.app.bp_llama.asgi_routes import create_asgi_app
+
+flask_app = create_app()
+app = create_asgi_app(flask_app)
@@ -7,8 +7,15 @@ from flask_cors import CORS
 from flask_login import LoginManager
 from flask_migrate import Migrate
 
-from backend.app.extensions import JWTManager, db
+from backend.app.extensions import (JWTManager, assistant_settings,
+                                    chunked_uploads, content_index, db,
+                                    entity_client, listing_cache, replay_store,
+                                    stream_executor, tool_backend,
+                                    tool_scheduler, upload_pipeline,
+                                    vector_stores)
 from backend.app.services.logging_service.logger import LoggingUtility
+from backend.app.services.serialization_services.sdk_json import \
+    SDKJSONProvider
 from config import config
 
 login_manager = LoginManager()
@@ -21,6 +28,7 @@ load_dotenv()
 def create_app(config_name="default"):
 
     app = Flask(__name__)
+    app.json = SDKJSONProvider(app)
     logging_utility = LoggingUtility(app)
     configure_app(app, config_name)
     login_manager.init_app(app)
@@ -34,6 +42,17 @@ def create_app(config_name="default"):
 
     CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
     db.init_app(app)
+    stream_executor.init_app(app)
+    replay_store.init_app(app)
+    tool_scheduler.init_app(app)
+    tool_backend.init_app(app)
+    entity_client.init_app(app)
+    listing_cache.init_app(app)
+    assistant_settings.init_app(app)
+    vector_stores.init_app(app)
+    content_index.init_app(app)
+    upload_pipeline.init_app(app)
+    chunked_uploads.init_app(app)
     migrate = Migrate(app, db)
     register_blueprints(app)
     register_template_filters(app)
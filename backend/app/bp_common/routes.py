@@ -1,16 +1,20 @@
-import json
+import hashlib
 import logging
-import os
 import time
+from collections import namedtuple
 from datetime import datetime
 from pipes import quote
 
-from flask import Response, jsonify, request, stream_with_context
+from flask import Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from projectdavid import Entity  # Main SDK entry point
 from projectdavid_common import (UtilsInterface,  # Common utilities
                                  ValidationInterface)
 
+from backend.app.extensions import (assistant_settings, entity_client,
+                                    listing_cache)
+from backend.app.services.serialization_services.sdk_json import (
+    sdk_serializers, stream_json_list)
+
 from . import bp_common
 
 # ─────────────────────────────────────────────────────────────
@@ -58,45 +62,67 @@ def _log_info_safe(message, *args, **kwargs):
 # ─────────────────────────────────────────────────────────────
 def _safe_count(obj):
     """Return a length if we can, otherwise None (handles SDK list-like containers)."""
-    for attr in ("data", "items", "messages", "results"):
-        seq = getattr(obj, attr, None)
-        if isinstance(seq, (list, tuple)):
-            return len(seq)
-    try:
-        return len(obj)  # will work for real sequences
-    except Exception:
-        try:
-            return len(list(obj))  # last resort if it's an iterable
-        except Exception:
-            return None
+    return sdk_serializers.count(obj)
 
 
 def _jsonify_sdk_list(obj):
-    """Best-effort conversion of SDK list-like objects to a JSON-serializable structure."""
-    if isinstance(obj, (list, tuple)):
-        return obj
-    for attr in ("data", "items", "messages", "results"):
-        seq = getattr(obj, attr, None)
-        if isinstance(seq, (list, tuple)):
-            return seq
-    # Fallback: try to serialize directly; if it fails, return a representation
-    try:
-        json.dumps(obj)
+    """
+    The items of an SDK list wrapper (or the object itself if the JSON
+    provider can serialize it); a repr placeholder for anything else.
+    """
+    items = sdk_serializers.list_items(obj)
+    if items is not None:
+        return items
+    if sdk_serializers.can_serialize(obj):
         return obj
-    except Exception:
-        return {"repr": repr(obj), "type": type(obj).__name__}
+    return {"repr": repr(obj), "type": type(obj).__name__}
+
+
+def _list_response(key, items, extra=None):
+    """jsonify({key: items, **extra}), streamed once the list is large."""
+    if len(items) < current_app.config.get("JSON_STREAM_MIN_ITEMS", 500):
+        return jsonify({key: items, **(extra or {})})
+    return Response(
+        stream_json_list(key, items, current_app.json.dumps, extra),
+        mimetype="application/json",
+    )
+
+
+# A thread's messages as served by /api/message/list: the JSON-ready items,
+# id -> position (for `after` cursors) and an ETag over the whole list.
+MessageSnapshot = namedtuple("MessageSnapshot", ["items", "positions", "etag"])
+
+
+def _item_id(item):
+    return item.get("id") if isinstance(item, dict) else getattr(item, "id", None)
+
+
+def _message_snapshot(messages):
+    """Converts an SDK message list once per load, so cached reads skip it."""
+    items = _jsonify_sdk_list(messages)
+    if isinstance(items, (list, tuple)):
+        items = sdk_serializers.to_plain(items)
+    positions = {}
+    if isinstance(items, (list, tuple)):
+        positions = {_item_id(item): i for i, item in enumerate(items)}
+    digest = hashlib.sha1(current_app.json.dumps(items).encode()).hexdigest()
+    return MessageSnapshot(items, positions, digest)
+
+
+def _page_etag(snapshot, after, limit):
+    """The ETag for one page of a snapshot: the list's own for the full list."""
+    if after is None and limit is None:
+        return snapshot.etag
+    key = f"{snapshot.etag}:{after or ''}:{limit or ''}"
+    return hashlib.sha1(key.encode()).hexdigest()
 
 
 # ─────────────────────────────────────────────────────────────
 # SDK Client Initialization
 # ─────────────────────────────────────────────────────────────
-try:
-    client = Entity(api_key=os.environ.get("ENTITIES_API_KEY"))
-except Exception as e:
-    _log_error_safe(
-        "Failed to initialize ProjectDavid Entity client: %s", e, exc_info=True
-    )
-    client = None
+# Shared across blueprints and created on first use; falsy while the SDK
+# client can't be initialised (see EntityClientProvider).
+client = entity_client.lazy()
 
 
 # ─────────────────────────────────────────────────────────────
@@ -150,10 +176,9 @@ def update_deep_research():
             assistant_id,
         )
 
-        # 3. Call SDK
-        updated_assistant = client.assistants.update_assistant(
-            assistant_id=assistant_id,
-            deep_research=deep_research_state,
+        # 3. Call SDK (coalesced with concurrent toggles, see /api/assistant/settings)
+        updated_assistant = assistant_settings.update(
+            client.assistants, assistant_id, {"deep_research": deep_research_state}
         )
 
         # 4. Return Response
@@ -238,10 +263,9 @@ def update_web_access():
             assistant_id,
         )
 
-        # 3. Call SDK
-        updated_assistant = client.assistants.update_assistant(
-            assistant_id=assistant_id,
-            web_access=web_access_state,
+        # 3. Call SDK (coalesced with concurrent toggles, see /api/assistant/settings)
+        updated_assistant = assistant_settings.update(
+            client.assistants, assistant_id, {"web_access": web_access_state}
         )
 
         # 4. Return Response
@@ -276,6 +300,80 @@ def update_web_access():
         return jsonify({"error": f"Failed to update assistant: {error_msg}"}), 500
 
 
+@bp_common.route("/api/assistant/settings", methods=["GET", "POST"])
+@jwt_required()
+def assistant_settings_batch():
+    """
+    GET:  the assistant's feature flags (cached).
+    POST: {"deep_research": true, "web_access": false, ...} — any subset of
+          ASSISTANT_SETTINGS_FLAGS, applied in one upstream update. Toggles
+          arriving within the debounce window are merged into the same update.
+    """
+    if not client:
+        return jsonify({"error": "Service configuration error"}), 503
+
+    # FIXME: Hardcoded like the single-flag endpoints above.
+    assistant_id = "asst_13HyDgBnZxVwh5XexYu74F"
+
+    try:
+        if request.method == "GET":
+            assistant = assistant_settings.get(client.assistants, assistant_id)
+        else:
+            if not request.is_json:
+                return jsonify({"error": "Request must be JSON"}), 415
+
+            data = request.get_json()
+            if not isinstance(data, dict) or not data:
+                return jsonify({"error": "Expected a JSON object of settings"}), 400
+
+            try:
+                changes = assistant_settings.validate(data)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            _log_info_safe(
+                "Updating settings %s for assistant ID: %s", changes, assistant_id
+            )
+            assistant = assistant_settings.update(
+                client.assistants, assistant_id, changes
+            )
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "assistant_id": assistant.id,
+                    "settings": assistant_settings.settings_of(assistant),
+                    "data": _jsonify_sdk_list(assistant),
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        error_msg = str(e)
+        _log_error_safe("Failed to update assistant settings. Error: %s", error_msg)
+
+        if "404" in error_msg:
+            return (
+                jsonify(
+                    {
+                        "error": f"Assistant not found. ID '{assistant_id}' may be incorrect."
+                    }
+                ),
+                404,
+            )
+
+        return jsonify({"error": f"Failed to update assistant: {error_msg}"}), 500
+
+
+@bp_common.route("/api/assistant/settings/stats", methods=["GET"])
+@jwt_required()
+def assistant_settings_stats():
+    """Requested vs. upstream updates, and the assistant cache counters."""
+    return jsonify(assistant_settings.stats()), 200
+
+
 # Thread Endpoints
 # ─────────────────────────────────────────────────────────────
 @bp_common.route("/api/thread/create", methods=["POST"])
@@ -289,6 +387,7 @@ def create_thread():
     _log_info_safe("Received request to create a thread for user ID: %s", userId)
     try:
         thread = client.threads.create_thread(participant_ids=[userId])
+        listing_cache.invalidate("threads", userId)
         _log_info_safe(
             "Thread created successfully. Thread ID: %s",
             getattr(thread, "id", "unknown"),
@@ -310,7 +409,9 @@ def list_threads():
 
     _log_info_safe("Received request to fetch threads for user ID: %s", user_id)
     try:
-        threads = client.threads.list_threads(user_id=user_id)
+        threads = listing_cache.get_or_load(
+            "threads", user_id, lambda: client.threads.list_threads(user_id=user_id)
+        )
         count = _safe_count(threads)
         if count is not None:
             _log_info_safe("Threads listed successfully. Number of threads: %s", count)
@@ -318,7 +419,10 @@ def list_threads():
             _log_info_safe(
                 "Threads listed successfully. Type=%s", type(threads).__name__
             )
-        return jsonify({"threads": _jsonify_sdk_list(threads)}), 200
+        items = _jsonify_sdk_list(threads)
+        if isinstance(items, (list, tuple)):
+            return _list_response("threads", items), 200
+        return jsonify({"threads": items}), 200
     except Exception as e:
         _log_error_safe(
             "Failed to list threads for user ID: %s. Error: %s", user_id, str(e)
@@ -341,6 +445,10 @@ def delete_thread():
         current_user = get_jwt_identity()  # not used yet; keep for future auth checks
 
         deleted = client.threads.delete_thread(thread_id=thread_id)
+        # Thread listings are cached per requested user id, which the delete
+        # request doesn't reliably carry: drop them all.
+        listing_cache.invalidate_all("threads")
+        listing_cache.invalidate("messages", thread_id)
 
         # DELETE is idempotent; return 200 whether it was deleted now or was already gone.
         return (
@@ -369,21 +477,69 @@ def delete_thread():
 @bp_common.route("/api/message/list", methods=["GET"])
 @jwt_required()
 def list_messages():
+    """
+    Lists a thread's messages.
+
+    Query params:
+      after  – only messages after this message id (incremental sync); an
+               unknown id returns the whole list with "cursor_reset": true
+      limit  – at most this many messages; "has_more" says if there are more
+
+    Responses carry an ETag for the thread's current message list and the
+    requested page (after / limit); a request whose If-None-Match still
+    matches gets 304 with no body.
+    """
     thread_id = request.args.get("thread_id")
     if not thread_id:
         return jsonify({"error": "Missing 'thread_id' parameter"}), 400
+
+    after = request.args.get("after")
+    limit = request.args.get("limit")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return jsonify({"error": "'limit' must be a positive integer"}), 400
+
     try:
-        messages = client.messages.list_messages(thread_id=thread_id)
-        count = _safe_count(messages)
-        if count is not None:
-            _log_info_safe(
-                "Listed messages successfully. Number of messages: %s", count
-            )
+        snapshot = listing_cache.get_or_load(
+            "messages",
+            thread_id,
+            lambda: _message_snapshot(
+                client.messages.list_messages(thread_id=thread_id)
+            ),
+        )
+
+        etag = _page_etag(snapshot, after, limit)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
         else:
-            _log_info_safe(
-                "Listed messages successfully. Type=%s", type(messages).__name__
-            )
-        return jsonify({"messages": _jsonify_sdk_list(messages)}), 200
+            page, body = snapshot.items, {}
+            if isinstance(page, (list, tuple)):
+                if after:
+                    position = snapshot.positions.get(after)
+                    if position is None:
+                        body["cursor_reset"] = True
+                    else:
+                        page = page[position + 1 :]
+                has_more = limit is not None and len(page) > limit
+                if has_more:
+                    page = page[:limit]
+                body["has_more"] = has_more
+                body["last_id"] = _item_id(page[-1]) if page else after
+                _log_info_safe(
+                    "Listed messages successfully. Number of messages: %s", len(page)
+                )
+                response = _list_response("messages", page, body)
+            else:
+                body["messages"] = page
+                response = jsonify(body)
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
     except Exception as e:
         _log_error_safe(
             "Failed to list messages for thread ID: %s. Error: %s", thread_id, str(e)
@@ -391,6 +547,20 @@ def list_messages():
         return jsonify({"error": "Failed to list messages"}), 500
 
 
+@bp_common.route("/api/cache/stats", methods=["GET"])
+@jwt_required()
+def listing_cache_stats():
+    """Hit-rate and tier counters for the thread / message listing cache."""
+    return jsonify(listing_cache.stats()), 200
+
+
+@bp_common.route("/api/client/stats", methods=["GET"])
+@jwt_required()
+def entity_client_stats():
+    """Shared SDK client health, pool settings and single-flight counters."""
+    return jsonify(entity_client.stats()), 200
+
+
 # ─────────────────────────────────────────────────────────────
 # Run Endpoints
 # ─────────────────────────────────────────────────────────────
@@ -2,21 +2,67 @@
 # ------------------------------------------------------------
 # POST /bp_files/api/files/upload
 # Streams uploaded files into the user’s “file_search” vector-store.
+#
+# POST/GET/PUT/DELETE /bp_files/api/files/uploads[/<id>[/complete]]
+# Resumable chunked uploads of single large files.
 # ------------------------------------------------------------
-import os
-import tempfile
+import json
+import time
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from projectdavid import Entity
 from projectdavid_common.utils import LoggingUtility
-from werkzeug.utils import secure_filename
+
+from backend.app.extensions import (chunked_uploads, content_index,
+                                    entity_client, upload_pipeline,
+                                    vector_stores)
+from backend.app.services.vector_store_services.chunked_uploads import (
+    ChecksumMismatch, OffsetMismatch, UploadNotFound)
+from backend.app.services.vector_store_services.content_index import HASH_KEY
 
 from . import bp_files
 
 LOG = LoggingUtility()
-client = Entity(api_key=os.environ.get("ENTITIES_API_KEY"))
+client = entity_client.lazy()
+
+
+def _upload_summary(results):
+    """Response body for a finished upload: successes as file_metadata, plus every per-file result."""
+    results = sorted(results, key=lambda r: r["index"])
+    return {
+        "file_metadata": [
+            {k: r[k] for k in ("id", "name", "size", "mime")}
+            for r in results
+            if r["status"] == "success"
+        ],
+        "results": results,
+    }
+
+
+def _add_to_store(user_id, path, filename, content_hash):
+    """Ingests one file into the user's store unless its content is already there."""
+    user_metadata = {
+        "uploaded_by": user_id,
+        "original_name": filename,
+        "uploaded_at": datetime.utcnow().isoformat() + "Z",
+        HASH_KEY: content_hash,
+    }
+
+    def add(vector_store_id):
+        return content_index.add_file(
+            client.vectors,
+            vector_store_id,
+            content_hash,
+            lambda: client.vectors.add_file_to_vector_store(
+                vector_store_id=vector_store_id,
+                file_path=path,
+                user_metadata=user_metadata,
+            ),
+        )
+
+    record, duplicate = vector_stores.with_store(client.vectors, user_id, add)
+    return {"id": record.id, "duplicate": duplicate}
 
 
 # ──────────────────────────────────────────────────────────────
@@ -25,67 +71,268 @@ client = Entity(api_key=os.environ.get("ENTITIES_API_KEY"))
 def upload_files_to_vector_store():
     """
     Accepts multipart/form-data with 1‒N <input type="file"> parts.
-    • Saves each part to a temp file (preserving the extension)
-    • Adds it to the earliest vector-store named “file_search”
+    • Spools each part to a temp file as it arrives (preserving the extension)
+    • Adds it to the earliest vector-store named “file_search” while later
+      parts are still arriving, several files at a time (see UploadPipeline)
+    • Skips ingestion for files whose content (SHA-256) is already in the
+      store and returns the existing file id instead (see ContentIndex)
     • Deletes the temp file
-    • Returns [{id,name,size,mime}, …] → front-end maps to fileIds
+    • Returns [{id,name,size,mime}, …] → front-end maps to fileIds, plus
+      per-file results (status, error, duration, duplicate)
+
+    With ?progress=1 (or Accept: application/x-ndjson) the response is an
+    NDJSON stream of {"type": "received"} / {"type": "uploaded"} lines, one
+    per file event, ending with {"type": "complete", ...summary}.
     """
     user_id = get_jwt_identity()
 
-    if not request.files:
+    if not client:
+        return jsonify(error="Service configuration error"), 503
+
+    boundary = request.mimetype_params.get("boundary")
+    if request.mimetype != "multipart/form-data" or not boundary:
         return jsonify(error="No files found in request"), 400
 
-    # ── resolve target vector store ────────────────────────────
-    stores = client.vectors.list_my_vector_stores()
-    file_search_stores = [s for s in stores if s.name == "file_search"]
+    # ── resolve target vector store (cached per user) ──────────
+    if vector_stores.resolve(client.vectors, user_id) is None:
+        LOG.warning(f"No '{vector_stores.store_name}' vector store found.")
+        return (
+            jsonify(error=f"Vector store '{vector_stores.store_name}' not found"),
+            500,
+        )
 
-    if not file_search_stores:
-        LOG.warning("No 'file_search' vector store found.")
-        return jsonify(error="Vector store 'file_search' not found"), 500
+    def upload(part):
+        return _add_to_store(user_id, part.path, part.filename, part.sha256)
 
-    earliest_store = min(
-        file_search_stores, key=lambda s: getattr(s, "created_at", datetime.utcnow())
+    events = upload_pipeline.run(
+        upload_pipeline.parts(request.stream, boundary.encode()), upload
     )
-    vector_store_id = earliest_store.id
-    LOG.info(f"Earliest vector store for 'file_search': {vector_store_id}")
 
-    # ── handle each uploaded file ──────────────────────────────
-    uploaded_meta = []
+    if request.args.get("progress") or "application/x-ndjson" in (
+        request.headers.get("Accept") or ""
+    ):
+
+        def progress_lines():
+            results = []
+            for kind, item in events:
+                if kind == "received":
+                    line = {
+                        "type": "received",
+                        "index": item.index,
+                        "name": item.filename,
+                        "size": item.size,
+                    }
+                else:
+                    results.append(item)
+                    line = dict(item, type="uploaded")
+                yield json.dumps(line) + "\n"
+            yield json.dumps(dict(_upload_summary(results), type="complete")) + "\n"
+
+        return Response(
+            stream_with_context(progress_lines()), mimetype="application/x-ndjson"
+        )
+
+    results = [item for kind, item in events if kind == "uploaded"]
+    if not results:
+        return jsonify(error="No valid files processed"), 400
 
-    for storage in request.files.values():  # werkzeug FileStorage
-        filename = secure_filename(storage.filename)
-        if not filename:
-            continue
+    summary = _upload_summary(results)
+    if not summary["file_metadata"]:
+        return jsonify(error="All uploads failed", **summary), 500
+    return jsonify(summary), 200
+
+
+@bp_files.route("/api/files/upload/stats", methods=["GET"])
+@jwt_required()
+def upload_stats():
+    """Upload pool / spool, content deduplication and chunked session counters."""
+    return (
+        jsonify(
+            dict(
+                upload_pipeline.stats(),
+                dedup=content_index.stats(),
+                chunked=chunked_uploads.stats(),
+            )
+        ),
+        200,
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# Resumable chunked uploads (see ChunkedUploadStore)
+#   POST   /api/files/uploads                 {filename, size, sha256?, mime?}
+#   GET    /api/files/uploads/<id>            → current offset, to resume
+#   PUT    /api/files/uploads/<id>            raw chunk; Upload-Offset header,
+#                                             optional X-Chunk-SHA256
+#   POST   /api/files/uploads/<id>/complete   → ingests, same body as /upload
+#   DELETE /api/files/uploads/<id>
+# ──────────────────────────────────────────────────────────────
+def _session_view(upload):
+    return {
+        "upload_id": upload.upload_id,
+        "name": upload.filename,
+        "size": upload.size,
+        "offset": upload.offset,
+        "complete": upload.complete,
+        "chunk_size": chunked_uploads.chunk_size,
+    }
+
+
+@bp_files.route("/api/files/uploads", methods=["POST"])
+@jwt_required()
+def init_chunked_upload():
+    """
+    Starts a resumable upload. If the declared sha256 is already in the
+    user's store, nothing needs to be sent: the existing file is returned
+    with "duplicate": true.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
 
-        # keep original suffix so FileProcessor recognises it
-        ext = os.path.splitext(filename)[1]  # ".pdf", ".png", …
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            storage.save(tmp)  # stream to disk
-            tmp_path = tmp.name
+    if not client:
+        return jsonify(error="Service configuration error"), 503
 
+    sha256 = data.get("sha256")
+    if sha256 and content_index.enabled:
         try:
-            resp = client.vectors.add_file_to_vector_store(
-                vector_store_id=vector_store_id,
-                file_path=tmp_path,
-                user_metadata={
-                    "uploaded_by": user_id,
-                    "original_name": filename,
-                    "uploaded_at": datetime.utcnow().isoformat() + "Z",
-                },
+            existing = vector_stores.with_store(
+                client.vectors,
+                user_id,
+                lambda vector_store_id: content_index.lookup(
+                    client.vectors, vector_store_id, str(sha256).lower()
+                ),
             )
-            # Expect {"file_id": "..."}
-            uploaded_meta.append(
-                {
-                    "id": resp.id,
-                    "name": filename,
-                    "size": os.path.getsize(tmp_path),
-                    "mime": storage.mimetype,
-                }
+        except LookupError as e:
+            return jsonify(error=str(e)), 500
+        if existing is not None:
+            return (
+                jsonify(
+                    id=existing.id,
+                    name=data.get("filename"),
+                    size=data.get("size"),
+                    duplicate=True,
+                ),
+                200,
             )
-        finally:
-            os.unlink(tmp_path)  # always clean up
 
-    if not uploaded_meta:
-        return jsonify(error="No valid files processed"), 400
+    try:
+        upload = chunked_uploads.init(
+            user_id,
+            data.get("filename"),
+            data.get("size"),
+            sha256=str(sha256).lower() if sha256 else None,
+            mimetype=data.get("mime"),
+        )
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(_session_view(upload)), 201
+
+
+@bp_files.route("/api/files/uploads/<upload_id>", methods=["GET"])
+@jwt_required()
+def get_chunked_upload(upload_id):
+    try:
+        upload = chunked_uploads.get(upload_id, get_jwt_identity())
+    except UploadNotFound:
+        return jsonify(error="Upload not found"), 404
+    return jsonify(_session_view(upload)), 200
+
+
+@bp_files.route("/api/files/uploads/<upload_id>", methods=["PUT"])
+@jwt_required()
+def append_chunk(upload_id):
+    """
+    Appends the request body at Upload-Offset. A wrong offset gets 409 with
+    the offset to continue from; a chunk failing X-Chunk-SHA256 is dropped.
+    """
+    offset = request.headers.get("Upload-Offset", request.args.get("offset"))
+    try:
+        offset = int(offset)
+    except (TypeError, ValueError):
+        return jsonify(error="Upload-Offset header required"), 400
+
+    try:
+        upload = chunked_uploads.append(
+            upload_id,
+            get_jwt_identity(),
+            offset,
+            request.stream,
+            checksum=request.headers.get("X-Chunk-SHA256"),
+        )
+    except UploadNotFound:
+        return jsonify(error="Upload not found"), 404
+    except OffsetMismatch as e:
+        return jsonify(error=str(e), offset=e.offset), 409
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    response = jsonify(_session_view(upload))
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return response, 200
 
-    return jsonify(file_metadata=uploaded_meta), 200
+
+@bp_files.route("/api/files/uploads/<upload_id>/complete", methods=["POST"])
+@jwt_required()
+def complete_chunked_upload(upload_id):
+    """
+    Verifies the assembled file and adds it to the vector store. The
+    session is kept if ingestion fails, so completing can be retried
+    without re-sending the file.
+    """
+    user_id = get_jwt_identity()
+
+    if not client:
+        return jsonify(error="Service configuration error"), 503
+
+    try:
+        upload = chunked_uploads.get(upload_id, user_id)
+    except UploadNotFound:
+        return jsonify(error="Upload not found"), 404
+    try:
+        content_hash = chunked_uploads.verify(upload)
+    except ChecksumMismatch as e:
+        chunked_uploads.discard(upload_id)
+        return jsonify(error=str(e)), 400
+    except ValueError as e:
+        return jsonify(error=str(e), offset=upload.offset), 409
+
+    start_time = time.time()
+    result = {
+        "index": 0,
+        "name": upload.filename,
+        "size": upload.size,
+        "mime": upload.mimetype,
+    }
+    try:
+        result.update(
+            upload_pipeline.ingest(
+                _add_to_store,
+                user_id,
+                chunked_uploads.data_path(upload),
+                upload.filename,
+                content_hash,
+            )
+        )
+        result["status"] = "success"
+    except Exception as e:
+        LOG.error(f"Upload of '{upload.filename}' failed: {e}")
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["duration"] = round(time.time() - start_time, 3)
+
+    summary = _upload_summary([result])
+    if result["status"] != "success":
+        return jsonify(error="Upload failed", **summary), 500
+    chunked_uploads.discard(upload_id)
+    return jsonify(summary), 200
+
+
+@bp_files.route("/api/files/uploads/<upload_id>", methods=["DELETE"])
+@jwt_required()
+def abort_chunked_upload(upload_id):
+    try:
+        chunked_uploads.get(upload_id, get_jwt_identity())
+    except UploadNotFound:
+        return jsonify(error="Upload not found"), 404
+    chunked_uploads.discard(upload_id)
+    return "", 204
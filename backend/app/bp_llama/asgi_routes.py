@@ -0,0 +1,350 @@
+# backend/app/bp_llama/asgi_routes.py
+# ------------------------------------------------------------
+# ASGI streaming mode for POST /bp_llama/api/messages/process
+#
+# The WSGI route holds one worker plus one SDK thread for the whole life of
+# a stream. Served through asgi.py (uvicorn), this route instead runs the
+# SDK's async inference generator on the server's event loop and writes
+# NDJSON straight to the socket; every other route is still served by the
+# Flask app, mounted underneath.
+# ------------------------------------------------------------
+import asyncio
+import json
+
+from flask_jwt_extended import decode_token
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from backend.app.services.streaming_services.event_registry import \
+    StreamContext
+from backend.app.services.streaming_services.sse import (SSEEncoder,
+                                                         parse_last_event_id,
+                                                         wants_sse)
+from backend.app.services.streaming_services.stream_executor import (
+    HEARTBEAT, StreamCapacityError)
+from backend.app.services.streaming_services.token_coalescer import \
+    TokenCoalescer
+
+from . import routes
+from .async_stream import AsyncEventStream
+from .event_stream import TURN_END
+
+logging_utility = routes.logging_utility
+
+
+_DEADLINE = object()
+
+
+async def _ticking(events, timeout, marker):
+    """
+    Re-yields events, plus `marker` whenever timeout() seconds pass with
+    nothing from upstream (timeout() returning None means wait indefinitely).
+
+    The pending __anext__() is kept across timeouts rather than cancelled —
+    cancelling it would tear down the SDK's inference generator.
+    """
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+
+            done, _ = await asyncio.wait({pending}, timeout=timeout())
+            if not done:
+                yield marker
+                continue
+
+            task, pending = pending, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _with_deadlines(events, coalescer):
+    """Adds _DEADLINE whenever the coalescer's window closes while upstream is quiet."""
+    if coalescer is None:
+        return events
+    return _ticking(
+        events,
+        lambda: coalescer.time_left() if coalescer.pending else None,
+        _DEADLINE,
+    )
+
+
+def _with_heartbeats(lines, interval):
+    return _ticking(lines, lambda: interval, HEARTBEAT)
+
+
+def _authenticate(request):
+    """Same check as @jwt_required() on the WSGI route (Authorization header)."""
+    auth_header = request.headers.get("Authorization", "")
+    scheme, _, token = auth_header.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    flask_app = request.app.state.flask_app
+    try:
+        with flask_app.app_context():
+            return decode_token(token)
+    except Exception as e:
+        logging_utility.warning(f"Rejected stream request: {e}")
+        return None
+
+
+# Detached replay producers; held so they are not garbage-collected mid-run.
+_background_streams = set()
+
+
+def _detachable(lines, replay):
+    """
+    Runs `lines` to completion as its own task, recording every line in the
+    replay buffer, and returns a generator that relays them to the client.
+
+    Starlette cancels the response when the client disconnects; that now only
+    stops the relay, so the run keeps going and stays resumable.
+    """
+    relay = asyncio.Queue()
+    attached = [True]
+
+    async def produce():
+        try:
+            async for line in lines:
+                replay.append(line)
+                if attached[0]:
+                    relay.put_nowait(line)
+        finally:
+            replay.close()
+            relay.put_nowait(None)
+
+    task = asyncio.ensure_future(produce())
+    _background_streams.add(task)
+    task.add_done_callback(_background_streams.discard)
+
+    async def relay_lines():
+        try:
+            while True:
+                line = await relay.get()
+                if line is None:
+                    return
+                yield line
+        finally:
+            if not task.done():
+                attached[0] = False
+                logging_utility.info(
+                    f"[{replay.run_id}] Client detached; recording to replay buffer."
+                )
+
+    return relay_lines()
+
+
+async def process_messages_async(request):
+    token = _authenticate(request)
+    if token is None:
+        return JSONResponse({"msg": "Missing or invalid Authorization header"}, 401)
+
+    flask_config = request.app.state.flask_app.config
+    identity = token.get(flask_config.get("JWT_IDENTITY_CLAIM", "sub"))
+    sse = wants_sse(request.headers.get("accept"))
+
+    # SSE reconnect: resume the run named by Last-Event-ID instead of
+    # starting a new one.
+    last_event = parse_last_event_id(request.headers.get("last-event-id"))
+    if sse and last_event is not None:
+        run_id, seq = last_event
+        buffer = routes.replay_store.get(run_id)
+        if buffer is None or buffer.owner != identity:
+            return JSONResponse({"error": "No replay available for this run"}, 404)
+
+        logging_utility.info(f"[{run_id}] Resuming stream from offset {seq + 1}.")
+        sse_encoder = SSEEncoder.from_config(
+            flask_config, run_id, request.headers.get("accept-encoding")
+        )
+        items = routes.replay_items(
+            buffer, seq + 1, heartbeat=flask_config["STREAM_SSE_HEARTBEAT"]
+        )
+        return StreamingResponse(
+            sse_encoder.astream(iterate_in_threadpool(items)),
+            media_type="text/event-stream",
+            headers=sse_encoder.headers,
+        )
+
+    client = routes.client
+    if not client:
+        return JSONResponse(
+            {"error": "Internal server configuration error (client init failed)"},
+            500,
+        )
+
+    try:
+        data = await request.json()
+    except Exception:
+        return JSONResponse({"error": "Invalid JSON"}, 400)
+
+    try:
+        params = routes.extract_stream_params(data)
+    except ValueError as ve:
+        return JSONResponse({"error": str(ve)}, 400)
+
+    # Admission control, shared with the WSGI route: the event loop has no
+    # thread per stream to run out of, but the SDK and upstream still do.
+    stream_executor = routes.stream_executor
+    try:
+        stream_executor.reserve()
+    except StreamCapacityError as e:
+        logging_utility.warning("Stream capacity exhausted; rejecting request.")
+        return JSONResponse(
+            {"error": "Server busy, please retry shortly"},
+            503,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    try:
+        message, run_id = await run_in_threadpool(routes.start_run, params)
+
+        # Opt-in token coalescing, same settings as the WSGI route.
+        coalescer = TokenCoalescer.from_config(
+            flask_config, routes.event_encoder, run_id
+        )
+
+        tools = routes.tool_scheduler.batch(run_id)
+        ctx = StreamContext(run_id, coalescer=coalescer, tools=tools)
+
+        replay = routes.replay_store.create(run_id, owner=identity)
+    except ValueError as ve:
+        stream_executor.release()
+        return JSONResponse({"error": str(ve)}, 400)
+    except Exception as e:
+        stream_executor.release()
+        logging_utility.error(f"Unexpected error: {e}", exc_info=True)
+        return JSONResponse(
+            {"error": "An unexpected internal server error occurred"}, 500
+        )
+
+    def emit(item):
+        return coalescer.push(item) if coalescer is not None else [item]
+
+    async def generate_events_stream():
+        stream = AsyncEventStream(
+            client,
+            thread_id=params["thread_id"],
+            assistant_id=params["assistant_id"],
+            message_id=message.id,
+            run_id=run_id,
+            api_key=params["api_key"],
+        )
+
+        logging_utility.info(f"[{run_id}] Starting async event stream...")
+
+        try:
+            events = _with_deadlines(
+                stream.stream_events(model=params["model"]), coalescer
+            )
+            async for event in events:
+                if event is _DEADLINE:
+                    for line in coalescer.flush():
+                        yield line
+                    continue
+
+                if event is TURN_END:
+                    # The next turn needs every tool output submitted.
+                    async for outcome in tools.acompleted():
+                        for line in emit(routes.tool_call_result_line(outcome, run_id)):
+                            yield line
+                    continue
+
+                for item in routes.dispatch_event(event, ctx):
+                    if callable(item):
+                        # Blocking work deferred by a handler.
+                        item = await run_in_threadpool(item)
+                    for line in emit(item):
+                        yield line
+
+                if tools.pending:
+                    for result in routes.tool_result_lines(tools.ready(), run_id):
+                        for line in emit(result):
+                            yield line
+
+            for line in emit(routes.stream_complete_line(run_id)):
+                yield line
+
+        except Exception as e:
+            logging_utility.error(
+                f"[{run_id}] 🔥 Fatal Stream Error: {e}", exc_info=True
+            )
+            if coalescer is not None:
+                for line in coalescer.flush():
+                    yield line
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+        finally:
+            # The run has added the assistant / tool messages.
+            routes.listing_cache.invalidate("messages", params["thread_id"])
+
+    # The slot is held until the run's generator finishes (with replay, the
+    # detached producer task keeps it after the client leaves).
+    body = stream_executor.hold(generate_events_stream())
+    if replay is not None:
+        body = _detachable(body, replay)
+
+    if sse:
+        sse_encoder = SSEEncoder.from_config(
+            flask_config, run_id, request.headers.get("accept-encoding")
+        )
+        return StreamingResponse(
+            sse_encoder.astream(
+                _with_heartbeats(body, flask_config["STREAM_SSE_HEARTBEAT"])
+            ),
+            media_type="text/event-stream",
+            headers=sse_encoder.headers,
+        )
+
+    return StreamingResponse(
+        body,
+        media_type="application/x-ndjson",
+        headers={
+            "X-Conversation-Id": run_id,
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
+    )
+
+
+def create_asgi_app(flask_app):
+    """
+    Wraps the Flask app in an ASGI app that serves the inference stream natively.
+
+    Only the streaming route is async; it gets its own CORS middleware because
+    Flask-CORS only sees requests that reach the mounted WSGI app.
+    """
+    stream_app = Starlette(
+        routes=[Route("/process", process_messages_async, methods=["POST"])],
+        middleware=[
+            Middleware(
+                CORSMiddleware,
+                allow_origins=["*"],
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+                expose_headers=["X-Conversation-Id"],
+            )
+        ],
+    )
+
+    app = Starlette(
+        routes=[
+            Mount("/bp_llama/api/messages", app=stream_app),
+            Mount("/", app=WSGIMiddleware(flask_app)),
+        ]
+    )
+    app.state.flask_app = flask_app
+    stream_app.state.flask_app = flask_app
+    return app
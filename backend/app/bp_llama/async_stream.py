@@ -0,0 +1,93 @@
+# backend/app/bp_llama/async_stream.py
+import asyncio
+
+from projectdavid import ToolCallRequestEvent
+from projectdavid_common import UtilsInterface
+
+from .event_stream import TURN_END, BaseEventStream
+
+logging_utility = UtilsInterface.LoggingUtility()
+
+
+class AsyncEventStream(BaseEventStream):
+    """
+    Async counterpart of SyncEventStream.
+
+    The synchronous wrapper drives the SDK's async inference generator with
+    run_until_complete() on a private event loop, which is why the WSGI route
+    needs a dedicated thread per request. Here we iterate
+    client.inference.stream_inference_response() directly on the caller's
+    loop, so a single ASGI worker can carry many concurrent runs. The few
+    blocking SDK calls (tool schemas, rejecting invalid tool calls) go to the
+    loop's default executor.
+    """
+
+    async def _stream_chunks(self, model, timeout_per_chunk):
+        agen = self.client.inference.stream_inference_response(
+            model=model,
+            api_key=self.api_key,
+            thread_id=self.thread_id,
+            message_id=self.message_id,
+            run_id=self.run_id,
+            assistant_id=self.assistant_id,
+            timeout=timeout_per_chunk,
+        ).__aiter__()
+
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        agen.__anext__(), timeout=timeout_per_chunk
+                    )
+                except StopAsyncIteration:
+                    break
+
+                chunk["run_id"] = self.run_id
+                if chunk.get("type") == "call_arguments":
+                    continue
+                yield chunk
+        finally:
+            await agen.aclose()
+
+    async def stream_events(self, model, timeout_per_chunk=280.0, max_turns=10):
+        """
+        Yields SDK events for the run, and TURN_END after each turn.
+
+        The consumer is expected to finish the turn's tool calls when it sees
+        TURN_END; an executed tool call then triggers another inference turn
+        (same behaviour as the SDK).
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._load_tool_schemas)
+
+        turn_count = 0
+        while turn_count < max_turns:
+            turn_count += 1
+            last_tool_call = None
+
+            async for chunk in self._stream_chunks(model, timeout_per_chunk):
+                event = self._map(chunk)
+                if not event:
+                    continue
+
+                if isinstance(event, ToolCallRequestEvent) and (
+                    await loop.run_in_executor(
+                        None, self._reject_invalid_tool_call, event
+                    )
+                ):
+                    last_tool_call = event
+                    break
+
+                yield event
+                if isinstance(event, ToolCallRequestEvent):
+                    last_tool_call = event
+
+            yield TURN_END
+
+            if last_tool_call and last_tool_call.executed:
+                logging_utility.info(
+                    f"[{self.run_id}] Tool output submitted. Starting turn {turn_count + 1}"
+                )
+                continue
+
+            break
@@ -0,0 +1,137 @@
+# backend/app/bp_llama/event_stream.py
+from projectdavid import ToolCallRequestEvent
+from projectdavid.clients.synchronous_inference_wrapper import \
+    SynchronousInferenceStream
+from projectdavid_common import UtilsInterface
+
+logging_utility = UtilsInterface.LoggingUtility()
+
+# Yielded by stream_events() after the last event of every inference turn.
+# The consumer must finish the turn's tool calls before pulling again: the
+# next turn only starts if the last tool call of this one was executed.
+TURN_END = object()
+
+
+class BaseEventStream:
+    """
+    Per-request SDK stream state shared by the sync and async turn loops.
+
+    Chunk -> event mapping and tool-argument validation are delegated to a
+    fresh SynchronousInferenceStream, so the event types (and the tool-call
+    events' bound clients) match what the SDK's own stream_events() yields.
+    A fresh instance per request also avoids racing on setup() through the
+    shared client.synchronous_inference_stream.
+    """
+
+    def __init__(
+        self, client, thread_id, assistant_id, message_id, run_id, api_key=None
+    ):
+        self.client = client
+        self.thread_id = thread_id
+        self.assistant_id = assistant_id
+        self.message_id = message_id
+        self.run_id = run_id
+        self.api_key = api_key
+
+        self._sdk = SynchronousInferenceStream(client.inference)
+        self._sdk.bind_clients(
+            client.runs, client.actions, client.messages, client.assistants
+        )
+        self._sdk.setup(
+            thread_id=thread_id,
+            assistant_id=assistant_id,
+            message_id=message_id,
+            run_id=run_id,
+            api_key=api_key,
+        )
+
+    def _map(self, chunk):
+        return self._sdk._map_chunk_to_event(chunk)
+
+    def _load_tool_schemas(self):
+        """Blocking. Primes the SDK validator with the assistant's tool schemas."""
+        validator = getattr(self._sdk, "validator", None)
+        if validator is None or not self.assistant_id:
+            return
+        try:
+            assistant = self.client.assistants.retrieve_assistant(self.assistant_id)
+            tools = (
+                getattr(assistant, "tools", [])
+                if not isinstance(assistant, dict)
+                else assistant.get("tools", [])
+            )
+            validator.build_registry_from_assistant(tools)
+        except Exception as e:
+            logging_utility.warning(
+                f"[{self.run_id}] Failed to retrieve assistant tool schemas: {e}"
+            )
+
+    def _reject_invalid_tool_call(self, event):
+        """
+        Blocking. If the call's arguments fail validation, submits the error as
+        the tool output (so the model can self-correct on the next turn),
+        marks the call executed and returns True.
+        """
+        validator = getattr(self._sdk, "validator", None)
+        if validator is None or not isinstance(event, ToolCallRequestEvent):
+            return False
+
+        error_msg = validator.validate_args(event.tool_name, event.args)
+        if not error_msg:
+            return False
+
+        logging_utility.warning(
+            f"[{self.run_id}] Intercepted invalid tool call: {error_msg}"
+        )
+        self.client.messages.submit_tool_output(
+            thread_id=self.thread_id,
+            content=error_msg,
+            role="tool",
+            assistant_id=self.assistant_id,
+            tool_id=event.action_id,
+        )
+        event.executed = True
+        return True
+
+
+class SyncEventStream(BaseEventStream):
+    """
+    Blocking turn loop for the WSGI route (runs on a StreamExecutor worker).
+
+    Same turn semantics as the SDK's stream_events(), except that TURN_END is
+    yielded at the end of every turn so tool calls can run concurrently and
+    be joined only once the turn is over.
+    """
+
+    def stream_events(self, model, timeout_per_chunk=280.0, max_turns=10):
+        self._load_tool_schemas()
+
+        turn_count = 0
+        while turn_count < max_turns:
+            turn_count += 1
+            last_tool_call = None
+
+            for chunk in self._sdk.stream_chunks(
+                model=model, timeout_per_chunk=timeout_per_chunk, suppress_fc=True
+            ):
+                event = self._map(chunk)
+                if not event:
+                    continue
+
+                if self._reject_invalid_tool_call(event):
+                    last_tool_call = event
+                    break
+
+                yield event
+                if isinstance(event, ToolCallRequestEvent):
+                    last_tool_call = event
+
+            yield TURN_END
+
+            if last_tool_call and last_tool_call.executed:
+                logging_utility.info(
+                    f"[{self.run_id}] Tool output submitted. Starting turn {turn_count + 1}"
+                )
+                continue
+
+            break
@@ -1,129 +1,278 @@
 import json
 import logging
 import os
-import queue
-import threading
-import time
 
 import httpx
-from flask import Response, jsonify, request, stream_with_context
-from flask_jwt_extended import jwt_required
+from flask import Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt_identity, jwt_required
 # --- Event Classes ---
 from projectdavid import (CodeExecutionGeneratedFileEvent,
-                          CodeExecutionOutputEvent,
-                          ComputerExecutionOutputEvent, ContentEvent, Entity,
-                          HotCodeEvent, ReasoningEvent, ToolCallRequestEvent,
-                          WebStatusEvent)
-from projectdavid.events import (CodeStatusEvent, ResearchStatusEvent,
-                                 ScratchpadEvent)
+                          CodeExecutionOutputEvent, ContentEvent, HotCodeEvent,
+                          ReasoningEvent, ToolCallRequestEvent)
+from projectdavid.events import ResearchStatusEvent, ScratchpadEvent
 from projectdavid_common import UtilsInterface
 
+from backend.app.extensions import (entity_client, listing_cache, replay_store,
+                                    stream_executor, tool_backend,
+                                    tool_scheduler)
+from backend.app.services.api_service_external.resilience import get_resilience
+from backend.app.services.streaming_services.event_encoder import \
+    build_ndjson_encoder
+from backend.app.services.streaming_services.event_registry import (
+    EventHandlerRegistry, StreamContext)
+from backend.app.services.streaming_services.sse import (SSEEncoder,
+                                                         parse_last_event_id,
+                                                         wants_sse)
+from backend.app.services.streaming_services.stream_executor import \
+    StreamCapacityError
+from backend.app.services.streaming_services.token_coalescer import \
+    TokenCoalescer
+
 # Assuming this is part of a Blueprint
 from . import bp_llama
+from .event_stream import TURN_END, SyncEventStream
 
 # Setup Logger
 logging_utility = UtilsInterface.LoggingUtility()
 log = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------
-# 1. Initialize Client & Bind for Recursion
+# 1. Shared Client
 # ------------------------------------------------------------------
-try:
-    client = Entity(api_key=os.environ.get("ENTITIES_API_KEY"))
+# Created on first use by the entity_client extension and shared with the
+# other blueprints; falsy while the SDK client can't be initialised.
+client = entity_client.lazy()
 
-    # [CRITICAL] Bind internal clients to enable SDK-managed recursion.
-    if client and hasattr(client, "synchronous_inference_stream"):
-        client.synchronous_inference_stream.bind_clients(
-            client.runs, client.actions, client.messages, client.assistants
-        )
-except Exception as e:
-    logging_utility.error(
-        f"Failed to initialize ProjectDavid Entity client: {e}", exc_info=True
+
+# ------------------------------------------------------------------
+# DEBUG FLAG
+# Set to True to log every raw event object as it hits the stream loop.
+# Dumps the full attribute dict of every SDK event — extremely verbose
+# but invaluable for discovering new event types and debugging the pipeline.
+# HOW TO TURN OFF: set DEBUG_STREAM = False before deploying to production.
+# ------------------------------------------------------------------
+DEBUG_STREAM = False
+
+
+def extract_stream_params(data):
+    """
+    Pulls the run parameters out of a /api/messages/process payload.
+
+    Shared by the WSGI route below and the ASGI route in asgi_routes.py so
+    both transports accept exactly the same request body.
+    """
+    messages = data.get("messages", [])
+    thread_id = data.get("threadId") or data.get("thread_id")
+    assistant_id = data.get("assistantId", "asst_13HyDgBnZxVwh5XexYu74F")
+
+    if not thread_id or not assistant_id or not messages:
+        raise ValueError("Missing required fields (threadId, assistantId, or messages)")
+
+    return {
+        "user_id": data.get("userId") or data.get("user_id"),
+        "thread_id": thread_id,
+        "assistant_id": assistant_id,
+        "content": messages[-1].get("content", "").strip(),
+        "model": data.get("model") or "hyperbolic/deepseek-ai/DeepSeek-V3-0324",
+        "provider": data.get("provider") or "Hyperbolic",
+        "api_key": data.get("apiKey") or os.getenv("HYPERBOLIC_API_KEY"),
+    }
+
+
+def start_run(params):
+    """Creates the user message and the run. Returns (message, run_id)."""
+    logging_utility.info(f"Creating message for thread {params['thread_id']}...")
+    message = client.messages.create_message(
+        thread_id=params["thread_id"],
+        assistant_id=params["assistant_id"],
+        content=params["content"],
+        role="user",
+    )
+    listing_cache.invalidate("messages", params["thread_id"])
+
+    run = client.runs.create_run(
+        thread_id=params["thread_id"], assistant_id=params["assistant_id"]
+    )
+    logging_utility.info(f"Created Run: {run.id}")
+    return message, run.id
+
+
+# Encoder for the NDJSON wire format (per-event-type pre-serialized templates).
+event_encoder = build_ndjson_encoder()
+
+
+# Event type -> handler. See EventHandlerRegistry for what handlers return.
+event_handlers = EventHandlerRegistry()
+
+
+def _encoded(event, ctx):
+    line = event_encoder.encode(event, ctx.run_id)
+    return (line,) if line is not None else ()
+
+
+def _log_received(event, run_id):
+    logging_utility.info(f"[{run_id}] ⚡ Event Received: {type(event).__name__}")
+
+
+# A/B. Standard Content & Reasoning — the hot path, never logged per token.
+@event_handlers.register(ContentEvent, ReasoningEvent)
+def _handle_token(event, ctx):
+    if ctx.coalescer is not None:
+        return (event,)
+    return (event_encoder.encode(event, ctx.run_id),)
+
+
+# C. Hot Code
+@event_handlers.register(HotCodeEvent)
+def _handle_hot_code(event, ctx):
+    return (event_encoder.encode(event, ctx.run_id),)
+
+
+# D. Code Execution Output
+@event_handlers.register(CodeExecutionOutputEvent)
+def _handle_sandbox_output(event, ctx):
+    _log_received(event, ctx.run_id)
+    logging_utility.info(
+        f"[{ctx.run_id}] 📟 Sandbox Output: {event.content.strip()[:100]}"
     )
-    client = None
+    return _encoded(event, ctx)
 
 
-def faux_tool_handler(tool_name, arguments):
-    """Consumer's actual tool execution logic."""
+# F. Generated Files
+@event_handlers.register(CodeExecutionGeneratedFileEvent)
+def _handle_generated_file(event, ctx):
+    _log_received(event, ctx.run_id)
     logging_utility.info(
-        f"[ConsumerApp] Handling tool: {tool_name} | Args: {arguments}"
+        f"[{ctx.run_id}] 📎 FILE GENERATED EVENT DETECTED:\n"
+        f"   - Filename: {event.filename}\n"
+        f"   - File ID: {event.file_id}\n"
+        f"   - URL Present: {bool(event.url)}\n"
+        f"   - URL: {event.url}"
     )
+    return _encoded(event, ctx)
 
-    # Simulate work
-    time.sleep(1)
 
-    if tool_name == "get_flight_times":
-        departure = arguments.get("departure", "Unknown")
-        arrival = arguments.get("arrival", "Unknown")
-        return json.dumps(
-            {
-                "status": "success",
-                "info": f"Flight from {departure} to {arrival}",
-                "duration": "4h 30m",
-                "price": "$450",
-            }
+# G. Tool Execution — started right away on the ToolScheduler pool; the
+# transport streams each outcome as it finishes (see tool_result_lines).
+@event_handlers.register(ToolCallRequestEvent)
+def _handle_tool_call(event, ctx):
+    _log_received(event, ctx.run_id)
+    line = tool_call_start_line(event, ctx.run_id)
+    ctx.tools.submit(event, tool_backend)
+    return (line,)
+
+
+# G2. Scratchpad Event — dedicated SDK event type.
+# Forwarded to the frontend as type:'scratchpad_status'
+# so the ScratchpadStatus component can render operations and updates.
+@event_handlers.register(ScratchpadEvent)
+def _handle_scratchpad(event, ctx):
+    _log_received(event, ctx.run_id)
+    logging_utility.info(
+        f"[{ctx.run_id}] 📋 ScratchpadEvent: op={event.operation} | state={event.state} | activity={event.activity}"
+    )
+    return _encoded(event, ctx)
+
+
+# H. Activity — all other tool activity events.
+# Forwarded unchanged so WebSearchStatus and DeepResearchStatus
+# continue to work as before.
+@event_handlers.register(ResearchStatusEvent)
+def _handle_activity(event, ctx):
+    _log_received(event, ctx.run_id)
+    logging_utility.info(
+        f"[{ctx.run_id}] ℹ️ Activity: {event.activity} | Tool: {event.tool} ({event.state})"
+    )
+    return _encoded(event, ctx)
+
+
+# Everything else: code/web status, computer output, and any event type the
+# SDK adds later (encoded if the encoder has a template for it, else dropped).
+@event_handlers.register(object)
+def _handle_default(event, ctx):
+    _log_received(event, ctx.run_id)
+    return _encoded(event, ctx)
+
+
+def dispatch_event(event, ctx):
+    """Returns the stream items for one SDK event (see EventHandlerRegistry)."""
+    # ── DEBUG: dump full event attrs for every event ──────────
+    # Shows everything the SDK puts on each event object.
+    # Disable by setting DEBUG_STREAM = False above.
+    if DEBUG_STREAM:
+        event_type = type(event).__name__
+        try:
+            logging_utility.info(
+                f"[{ctx.run_id}] 🔬 RAW EVENT: type={event_type} | attrs={vars(event)}"
+            )
+        except Exception:
+            logging_utility.info(
+                f"[{ctx.run_id}] 🔬 RAW EVENT: type={event_type} | (no vars)"
+            )
+
+    return event_handlers.dispatch(event, ctx)
+
+
+# G. Tool Execution
+def tool_call_start_line(event, run_id):
+    logging_utility.info(
+        f"[{run_id}] 🛠️ Tool Request: {event.tool_name} | Args: {event.args}"
+    )
+    return event_encoder.encode_dict(
+        {
+            "type": "tool_call_start",
+            "tool": event.tool_name,
+            "args": event.args,
+        }
+    )
+
+
+def tool_call_result_line(outcome, run_id):
+    """NDJSON line for a finished tool call (a ToolOutcome)."""
+    event = outcome.event
+
+    if outcome.timed_out:
+        logging_utility.error(f"[{run_id}] ⏱️ {outcome.error}")
+        return event_encoder.encode_dict({"type": "error", "error": str(outcome.error)})
+
+    if outcome.error is not None:
+        logging_utility.error(
+            f"[{run_id}] 💥 Exception during tool execute: {outcome.error}"
+        )
+        return event_encoder.encode_dict({"type": "error", "error": str(outcome.error)})
+
+    if outcome.success:
+        logging_utility.info(
+            f"[{run_id}] ✅ Tool executed successfully in {outcome.duration:.2f}s."
         )
-    else:
-        return json.dumps(
+        return event_encoder.encode_dict(
             {
+                "type": "web_status",
                 "status": "success",
-                "message": f"Executed tool '{tool_name}' successfully.",
+                "run_id": run_id,
+                "tool": event.tool_name,
+                "message": f"Tool '{event.tool_name}' executed successfully in {outcome.duration:.2f}s.",
             }
         )
 
+    logging_utility.error(f"[{run_id}] ❌ Tool execution returned False.")
+    return event_encoder.encode_dict(
+        {
+            "type": "error",
+            "error": "Tool execution failed internally",
+        }
+    )
 
-def stream_with_thread_isolation(generator_func, *args, **kwargs):
-    """
-    Executes a generator function in a separate thread and yields the results
-    back to the main Flask thread via a Queue.
-
-    Why: The ProjectDavid SDK uses 'asyncio.run_until_complete' internally.
-    If Flask (or a debugger) has already started an event loop on the main thread,
-    calling the SDK directly causes a "RuntimeError: This event loop is already running".
-
-    Running the SDK in a fresh thread ensures it has a clean environment with
-    no active event loop, allowing it to create its own safely.
-    """
-    q = queue.Queue()
-
-    def worker():
-        try:
-            # Run the generator in this isolated thread
-            # The SDK will successfully create/use its own loop here.
-            for chunk in generator_func(*args, **kwargs):
-                q.put(chunk)
-            q.put(None)  # Sentinel: Stream finished successfully
-        except Exception as e:
-            # Pass exceptions back to main thread
-            q.put(e)
-
-    # Daemon=True ensures thread dies if main process dies
-    t = threading.Thread(target=worker, daemon=True)
-    t.start()
-
-    # Consume queue in the main Flask thread
-    while True:
-        try:
-            # Wait for data (blocks the request thread, not the server if threaded)
-            # Timeout ensures we don't hang forever if the worker dies silently
-            item = q.get(timeout=300)
 
-            if item is None:
-                break  # Clean exit
+def tool_result_lines(outcomes, run_id):
+    return [tool_call_result_line(outcome, run_id) for outcome in outcomes]
 
-            if isinstance(item, Exception):
-                # We can't change the HTTP status code once streaming starts,
-                # so we log the error and break the stream with a JSON error block.
-                error_msg = str(item)
-                log.error(f"Stream worker thread failed: {error_msg}")
-                yield json.dumps({"type": "error", "error": error_msg}) + "\n"
-                break
 
-            yield item
-        except queue.Empty:
-            log.warning("Stream timed out waiting for SDK thread.")
-            yield json.dumps({"type": "error", "error": "Stream timeout"}) + "\n"
-            break
+def stream_complete_line(run_id):
+    logging_utility.info(f"[{run_id}] 🏁 Stream complete.")
+    return event_encoder.encode_dict(
+        {"type": "status", "status": "complete", "run_id": run_id}
+    )
 
 
 @bp_llama.route("/api/messages/process", methods=["POST"])
@@ -137,6 +286,18 @@ def process_messages():
             500,
         )
 
+    sse = wants_sse(request.headers.get("Accept"))
+
+    # SSE reconnect: resume the run named by Last-Event-ID instead of
+    # starting a new one.
+    last_event = parse_last_event_id(request.headers.get("Last-Event-ID"))
+    if sse and last_event is not None:
+        run_id, seq = last_event
+        buffer = _owned_replay(run_id)
+        if buffer is None:
+            return jsonify({"error": "No replay available for this run"}), 404
+        return _replay_response(buffer, seq + 1)
+
     try:
         data = request.get_json(force=True)
     except Exception as e:
@@ -146,292 +307,104 @@ def process_messages():
         # ------------------------------------------------------------------
         # 2. Extract Parameters
         # ------------------------------------------------------------------
-        messages = data.get("messages", [])
-        user_id = data.get("userId") or data.get("user_id")
-        thread_id = data.get("threadId") or data.get("thread_id")
-        assistant_id = data.get("assistantId", "asst_13HyDgBnZxVwh5XexYu74F")
-
-        selected_model = data.get("model") or "hyperbolic/deepseek-ai/DeepSeek-V3-0324"
-        provider = data.get("provider") or "Hyperbolic"
-        hyperbolic_api_key = data.get("apiKey") or os.getenv("HYPERBOLIC_API_KEY")
-
-        if not thread_id or not assistant_id or not messages:
-            raise ValueError(
-                "Missing required fields (threadId, assistantId, or messages)"
-            )
-
-        user_message_content = messages[-1].get("content", "").strip()
+        params = extract_stream_params(data)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
 
-        # ------------------------------------------------------------------
-        # 3. Create Message & Run
-        # ------------------------------------------------------------------
-        logging_utility.info(f"Creating message for thread {thread_id}...")
-        message = client.messages.create_message(
-            thread_id=thread_id,
-            assistant_id=assistant_id,
-            content=user_message_content,
-            role="user",
+    # Admission control: reject before creating the message/run so a
+    # rejected request leaves nothing behind upstream.
+    try:
+        stream_executor.reserve()
+    except StreamCapacityError as e:
+        logging_utility.warning("Stream capacity exhausted; rejecting request.")
+        return (
+            jsonify({"error": "Server busy, please retry shortly"}),
+            503,
+            {"Retry-After": str(e.retry_after)},
         )
 
-        run = client.runs.create_run(thread_id=thread_id, assistant_id=assistant_id)
-        run_id = run.id
-        logging_utility.info(f"Created Run: {run_id}")
-
+    try:
         # ------------------------------------------------------------------
-        # DEBUG FLAG
-        # Set to True to log every raw event object as it hits the stream loop.
-        # Dumps the full attribute dict of every SDK event — extremely verbose
-        # but invaluable for discovering new event types and debugging the pipeline.
-        # HOW TO TURN OFF: set DEBUG_STREAM = False before deploying to production.
+        # 3. Create Message & Run
         # ------------------------------------------------------------------
-        DEBUG_STREAM = False
+        message, run_id = start_run(params)
 
         # ------------------------------------------------------------------
         # 4. Define the Generator (Unified Single Loop)
         # ------------------------------------------------------------------
-        def generate_events_stream():
-            sync_stream = client.synchronous_inference_stream
+        # Opt-in (STREAM_COALESCE_WINDOW_MS > 0): token events are handed to
+        # the consumer side unencoded and merged there.
+        coalescer = TokenCoalescer.from_config(
+            current_app.config, event_encoder, run_id
+        )
+
+        tools = tool_scheduler.batch(run_id)
+        ctx = StreamContext(run_id, coalescer=coalescer, tools=tools)
 
-            sync_stream.setup(
-                thread_id=thread_id,
-                assistant_id=assistant_id,
+        # Opt-in (STREAM_REPLAY_BACKEND): record the stream so a dropped
+        # client can resume it from GET /api/runs/<run_id>/events.
+        replay = replay_store.create(run_id, owner=get_jwt_identity())
+
+        def generate_events_stream():
+            stream = SyncEventStream(
+                client,
+                thread_id=params["thread_id"],
+                assistant_id=params["assistant_id"],
                 message_id=message.id,
                 run_id=run_id,
-                api_key=hyperbolic_api_key,
+                api_key=params["api_key"],
             )
 
             logging_utility.info(f"[{run_id}] Starting unified event stream...")
 
             try:
-                for event in sync_stream.stream_events(
-                    provider=provider, model=selected_model
-                ):
-                    event_type = type(event).__name__
-
-                    if event_type not in [
-                        "ContentEvent",
-                        "HotCodeEvent",
-                        "ReasoningEvent",
-                    ]:
-                        logging_utility.info(
-                            f"[{run_id}] ⚡ Event Received: {event_type}"
-                        )
-
-                    # ── DEBUG: dump full event attrs for every event ──────────
-                    # Shows everything the SDK puts on each event object.
-                    # Disable by setting DEBUG_STREAM = False above.
-                    if DEBUG_STREAM:
-                        try:
-                            logging_utility.info(
-                                f"[{run_id}] 🔬 RAW EVENT: type={event_type} | attrs={vars(event)}"
-                            )
-                        except Exception:
-                            logging_utility.info(
-                                f"[{run_id}] 🔬 RAW EVENT: type={event_type} | (no vars)"
-                            )
-
-                    # A. Standard Content
-                    if isinstance(event, ContentEvent):
-                        yield json.dumps(
-                            {
-                                "type": "content",
-                                "content": event.content,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # B. Reasoning
-                    elif isinstance(event, ReasoningEvent):
-                        yield json.dumps(
-                            {
-                                "type": "reasoning",
-                                "content": event.content,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    elif isinstance(event, CodeStatusEvent):
-                        yield json.dumps(
-                            {
-                                "type": "code_status",
-                                "activity": event.activity,
-                                "state": event.state,
-                                "tool": event.tool,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # C. Hot Code
-                    elif isinstance(event, HotCodeEvent):
-                        yield json.dumps(
-                            {
-                                "type": "hot_code",
-                                "content": event.content,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # D. Code Execution Output
-                    elif isinstance(event, CodeExecutionOutputEvent):
-                        logging_utility.info(
-                            f"[{run_id}] 📟 Sandbox Output: {event.content.strip()[:100]}"
-                        )
-                        yield json.dumps(
-                            {
-                                "type": "hot_code_output",
-                                "content": event.content,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # E. Computer/Shell Output
-                    elif isinstance(event, ComputerExecutionOutputEvent):
-                        yield json.dumps(
-                            {
-                                "type": "computer_output",
-                                "content": event.content,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # F. Generated Files
-                    elif isinstance(event, CodeExecutionGeneratedFileEvent):
-                        logging_utility.info(
-                            f"[{run_id}] 📎 FILE GENERATED EVENT DETECTED:\n"
-                            f"   - Filename: {event.filename}\n"
-                            f"   - File ID: {event.file_id}\n"
-                            f"   - URL Present: {bool(event.url)}\n"
-                            f"   - URL: {event.url}"
-                        )
-                        yield json.dumps(
-                            {
-                                "type": "code_interpreter_file",
-                                "filename": event.filename,
-                                "file_id": event.file_id,
-                                "mime_type": event.mime_type,
-                                "url": event.url,
-                                "base64": event.base64_data,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # G. Tool Execution
-                    elif isinstance(event, ToolCallRequestEvent):
-                        logging_utility.info(
-                            f"[{run_id}] 🛠️ Tool Request: {event.tool_name} | Args: {event.args}"
-                        )
-                        yield json.dumps(
-                            {
-                                "type": "tool_call_start",
-                                "tool": event.tool_name,
-                                "args": event.args,
-                            }
-                        ) + "\n"
-
-                        try:
-                            start_time = time.time()
-                            success = event.execute(faux_tool_handler)
-                            duration = time.time() - start_time
-
-                            if success:
-                                logging_utility.info(
-                                    f"[{run_id}] ✅ Tool executed successfully in {duration:.2f}s."
-                                )
-
-                                yield json.dumps(
-                                    {
-                                        "type": "web_status",
-                                        "status": "success",
-                                        "run_id": run_id,
-                                        "tool": event.tool_name,
-                                        "message": f"Tool '{event.tool_name}' executed successfully in {duration:.2f}s.",
-                                    }
-                                ) + "\n"
-
-                            else:
-                                logging_utility.error(
-                                    f"[{run_id}] ❌ Tool execution returned False."
-                                )
-                                yield json.dumps(
-                                    {
-                                        "type": "error",
-                                        "error": "Tool execution failed internally",
-                                    }
-                                ) + "\n"
-                        except Exception as exec_err:
-                            logging_utility.error(
-                                f"[{run_id}] 💥 Exception during tool execute: {exec_err}",
-                                exc_info=True,
-                            )
-                            yield json.dumps(
-                                {"type": "error", "error": str(exec_err)}
-                            ) + "\n"
-
-                    # G2. Scratchpad Event — dedicated SDK event type.
-                    # Forwarded to the frontend as type:'scratchpad_status'
-                    # so the ScratchpadStatus component can render operations and updates.
-                    elif isinstance(event, ScratchpadEvent):
-                        logging_utility.info(
-                            f"[{run_id}] 📋 ScratchpadEvent: op={event.operation} | state={event.state} | activity={event.activity}"
-                        )
-                        yield json.dumps(
-                            {
-                                "type": "scratchpad_status",
-                                "state": event.state,
-                                "operation": event.operation,
-                                "activity": event.activity,  # <--- Added
-                                "tool": event.tool,  # <--- Added
-                                "entry": event.entry or event.content or "",
-                                "run_id": getattr(event, "run_id", run_id),
-                            }
-                        ) + "\n"
-
-                    # H. Activity — all other tool activity events.
-                    # Forwarded unchanged so WebSearchStatus and DeepResearchStatus
-                    # continue to work as before.
-                    elif isinstance(event, ResearchStatusEvent):
-                        logging_utility.info(
-                            f"[{run_id}] ℹ️ Activity: {event.activity} | Tool: {event.tool} ({event.state})"
-                        )
-                        yield json.dumps(
-                            {
-                                "type": "research_status",
-                                "activity": event.activity,
-                                "tool": event.tool,
-                                "state": event.state,
-                                "run_id": event.run_id,
-                            }
-                        ) + "\n"
-
-                    # I. web
-                    elif isinstance(event, WebStatusEvent):
-                        yield json.dumps(
-                            {
-                                "type": "web_status",
-                                "status": event.status,
-                                "run_id": event.run_id,
-                                "tool": event.tool,
-                                "message": event.message,
-                            }
-                        ) + "\n"
+                for event in stream.stream_events(model=params["model"]):
+                    if event is TURN_END:
+                        # The next turn needs every tool output submitted.
+                        for outcome in tools.completed():
+                            yield tool_call_result_line(outcome, run_id)
+                        continue
 
-                # End of Stream
-                logging_utility.info(f"[{run_id}] 🏁 Stream complete.")
-                yield json.dumps(
-                    {"type": "status", "status": "complete", "run_id": run_id}
-                ) + "\n"
+                    for item in dispatch_event(event, ctx):
+                        yield item() if callable(item) else item
+
+                    if tools.pending:
+                        yield from tool_result_lines(tools.ready(), run_id)
 
-                if hasattr(sync_stream, "close"):
-                    sync_stream.close()
+                # End of Stream
+                yield stream_complete_line(run_id)
 
             except Exception as e:
                 logging_utility.error(
                     f"[{run_id}] 🔥 Fatal Stream Error: {e}", exc_info=True
                 )
                 yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+            finally:
+                # The run has added the assistant / tool messages.
+                listing_cache.invalidate("messages", params["thread_id"])
+
+        if sse:
+            sse_encoder = SSEEncoder.from_config(
+                current_app.config, run_id, request.headers.get("Accept-Encoding")
+            )
+            lines = stream_executor.stream(
+                generate_events_stream,
+                coalescer=coalescer,
+                replay=replay,
+                heartbeat=current_app.config["STREAM_SSE_HEARTBEAT"],
+            )
+            return Response(
+                stream_with_context(sse_encoder.stream(lines)),
+                content_type="text/event-stream",
+                headers=sse_encoder.headers,
+            )
 
         return Response(
-            stream_with_context(stream_with_thread_isolation(generate_events_stream)),
+            stream_with_context(
+                stream_executor.stream(
+                    generate_events_stream, coalescer=coalescer, replay=replay
+                )
+            ),
             content_type="application/x-ndjson",
             headers={
                 "X-Conversation-Id": run_id,
@@ -440,8 +413,109 @@ def process_messages():
             },
         )
 
-    except ValueError as ve:
-        return jsonify({"error": str(ve)}), 400
     except Exception as e:
+        stream_executor.release()
         logging_utility.error(f"Unexpected error: {e}", exc_info=True)
         return jsonify({"error": "An unexpected internal server error occurred"}), 500
+
+
+@bp_llama.route("/api/streams/stats", methods=["GET"])
+@jwt_required()
+def stream_stats():
+    """Active / queued stream gauges for monitoring."""
+    return jsonify(stream_executor.stats()), 200
+
+
+def _owned_replay(run_id):
+    """The run's replay buffer, if it exists and belongs to the caller."""
+    buffer = replay_store.get(run_id)
+    if buffer is None or buffer.owner != get_jwt_identity():
+        return None
+    return buffer
+
+
+def replay_items(buffer, offset, heartbeat=None):
+    """
+    (seq, line) pairs from the replay buffer, starting at offset.
+
+    If offset has already been evicted, an unnumbered replay_gap line says
+    where the replay actually starts.
+    """
+    first = True
+    for seq, line in buffer.read(
+        offset, timeout=stream_executor.item_timeout, heartbeat=heartbeat
+    ):
+        if first and seq is not None and seq > offset:
+            yield None, event_encoder.encode_dict(
+                {"type": "replay_gap", "requested": offset, "resumed_from": seq}
+            )
+        if seq is not None:
+            first = False
+        yield seq, line
+
+
+def _replay_response(buffer, offset):
+    logging_utility.info(f"[{buffer.run_id}] Resuming stream from offset {offset}.")
+
+    if wants_sse(request.headers.get("Accept")):
+        sse_encoder = SSEEncoder.from_config(
+            current_app.config, buffer.run_id, request.headers.get("Accept-Encoding")
+        )
+        items = replay_items(
+            buffer, offset, heartbeat=current_app.config["STREAM_SSE_HEARTBEAT"]
+        )
+        return Response(
+            stream_with_context(sse_encoder.stream(items)),
+            content_type="text/event-stream",
+            headers=sse_encoder.headers,
+        )
+
+    return Response(
+        stream_with_context(line for _, line in replay_items(buffer, offset)),
+        content_type="application/x-ndjson",
+        headers={
+            "X-Conversation-Id": buffer.run_id,
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
+    )
+
+
+@bp_llama.route("/api/runs/<run_id>/events", methods=["GET"])
+@jwt_required()
+def resume_run_events(run_id):
+    """
+    Replays a run's stream from ?offset=N (the number of lines the client
+    already has) and follows it live until the run completes.
+
+    Served as SSE for Accept: text/event-stream, where a Last-Event-ID
+    header (EventSource reconnects) takes precedence over ?offset.
+    """
+    buffer = _owned_replay(run_id)
+    if buffer is None:
+        return jsonify({"error": "No replay available for this run"}), 404
+
+    last_event = parse_last_event_id(request.headers.get("Last-Event-ID"))
+    if last_event is not None and last_event[0] == run_id:
+        return _replay_response(buffer, last_event[1] + 1)
+
+    try:
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        return jsonify({"error": "offset must be an integer"}), 400
+
+    return _replay_response(buffer, offset)
+
+
+@bp_llama.route("/api/tools/stats", methods=["GET"])
+@jwt_required()
+def tool_stats():
+    """Per-tool latency histograms and result-cache counters."""
+    return jsonify(tool_backend.stats()), 200
+
+
+@bp_llama.route("/api/tools/external/stats", methods=["GET"])
+@jwt_required()
+def external_call_stats():
+    """Retry policy and per-host circuit breaker counters for external APIs."""
+    return jsonify(get_resilience().stats()), 200
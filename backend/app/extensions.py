@@ -4,4 +4,35 @@ from flask import Flask
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 
+from backend.app.services.assistant_services.settings_batcher import \
+    AssistantSettingsBatcher
+from backend.app.services.cache_services.listing_cache import ListingCache
+from backend.app.services.entity_services.client_provider import \
+    EntityClientProvider
+from backend.app.services.function_call_service.tool_backend import ToolBackend
+from backend.app.services.streaming_services.replay_buffer import ReplayStore
+from backend.app.services.streaming_services.stream_executor import \
+    StreamExecutor
+from backend.app.services.streaming_services.tool_scheduler import \
+    ToolScheduler
+from backend.app.services.vector_store_services.chunked_uploads import \
+    ChunkedUploadStore
+from backend.app.services.vector_store_services.content_index import \
+    ContentIndex
+from backend.app.services.vector_store_services.store_resolver import \
+    VectorStoreResolver
+from backend.app.services.vector_store_services.upload_pipeline import \
+    UploadPipeline
+
 db = SQLAlchemy()
+stream_executor = StreamExecutor()
+replay_store = ReplayStore()
+tool_scheduler = ToolScheduler()
+tool_backend = ToolBackend()
+entity_client = EntityClientProvider()
+listing_cache = ListingCache()
+assistant_settings = AssistantSettingsBatcher()
+vector_stores = VectorStoreResolver()
+content_index = ContentIndex()
+upload_pipeline = UploadPipeline()
+chunked_uploads = ChunkedUploadStore()
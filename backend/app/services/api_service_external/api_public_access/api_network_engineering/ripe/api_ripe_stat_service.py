@@ -1,115 +1,80 @@
-import requests
+import httpx
+
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.ripe_stat_client import \
+    get_ripe_stat_client
+from backend.app.services.api_service_external.resilience import \
+    CircuitOpenError
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
 
 
 class RipeStatService:
-    def __init__(self):
-        self.base_url = "https://stat.ripe.net/data"
-        self.session = requests.Session()
+    """
+    RIPEstat Data API, one method per endpoint. Each returns the decoded
+    JSON response, or None if the call failed, timed out or was refused by
+    an open circuit breaker.
 
-    def get_abuse_contact(self, resource):
-        url = f"{self.base_url}/abuse-contact-finder/data.json"
-        params = {"resource": resource}
+    Requests go through a shared RipeStatClient (pooled connections,
+    per-call deadline, global concurrency cap). See AsyncRipeStatService for
+    the awaitable variant.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_ripe_stat_client()
+        self.base_url = self.client.base_url
+
+    def _fetch(self, path, params=None):
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            # Handle any errors that occurred during the request
-            print(f"Error: {e}")
+            return self.client.fetch(path, params)
+        except (httpx.HTTPError, ValueError, CircuitOpenError) as e:
+            logging_utility.warning(f"RIPEstat {path} request failed: {e}")
             return None
 
+    def get_abuse_contact(self, resource):
+        params = {"resource": resource}
+        return self._fetch("abuse-contact-finder", params)
+
     def get_address_space_hierarchy(self, resource):
-        url = f"{self.base_url}/address-space-hierarchy/data.json"
         params = {"resource": resource}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            # Handle any errors that occurred during the request
-            print(f"Error: {e}")
-            return None
+        return self._fetch("address-space-hierarchy", params)
 
     def get_address_space_usage(self, resource, all_level_more_specifics=True):
-        url = f"{self.base_url}/address-space-usage/data.json"
         params = {
             "resource": resource,
             "all_level_more_specifics": all_level_more_specifics,
         }
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            # Handle any errors that occurred during the request
-            print(f"Error: {e}")
-            return None
+        return self._fetch("address-space-usage", params)
 
     def get_allocation_history(self, resource, starttime, endtime=None):
-        url = f"{self.base_url}/allocation-history/data.json"
         params = {"resource": resource, "starttime": starttime}
         if endtime:
             params["endtime"] = endtime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("allocation-history", params)
 
     def get_announced_prefixes(
         self, resource, starttime=None, endtime=None, min_peers_seeing=10
     ):
-        url = f"{self.base_url}/announced-prefixes/data.json"
         params = {"resource": resource, "min_peers_seeing": min_peers_seeing}
         if starttime:
             params["starttime"] = starttime
         if endtime:
             params["endtime"] = endtime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("announced-prefixes", params)
 
     def get_asn_neighbours(self, resource, starttime=None):
-        url = f"{self.base_url}/asn-neighbours/data.json"
         params = {"resource": resource}
         if starttime:
             params["starttime"] = starttime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("asn-neighbours", params)
 
     def get_atlas_probes(self, resource):
-        url = f"{self.base_url}/atlas-probes/data.json"
         params = {"resource": resource}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("atlas-probes", params)
 
     def get_bgp_updates(
         self, resource, starttime=None, endtime=None, rrcs=None, unix_timestamps=False
     ):
-        url = f"{self.base_url}/bgp-updates/data.json"
         params = {"resource": resource, "unix_timestamps": unix_timestamps}
         if starttime:
             params["starttime"] = starttime
@@ -117,37 +82,21 @@ class RipeStatService:
             params["endtime"] = endtime
         if rrcs:
             params["rrcs"] = rrcs
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("bgp-updates", params)
 
     def get_asn_neighbours_history(
         self, resource, starttime=None, endtime=None, max_rows=1800
     ):
-        url = f"{self.base_url}/asn-neighbours-history/data.json"
         params = {"resource": resource, "max_rows": max_rows}
         if starttime:
             params["starttime"] = starttime
         if endtime:
             params["endtime"] = endtime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("asn-neighbours-history", params)
 
     def get_country_resource_stats(
         self, resource, starttime=None, endtime=None, resolution=None
     ):
-        url = f"{self.base_url}/country-resource-stats/data.json"
         params = {"resource": resource}
         if starttime:
             params["starttime"] = starttime
@@ -155,232 +104,119 @@ class RipeStatService:
             params["endtime"] = endtime
         if resolution:
             params["resolution"] = resolution
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("country-resource-stats", params)
 
     def get_country_resource_list(self, resource, time=None, v4_format=None):
-        url = f"{self.base_url}/country-resource-list/data.json"
         params = {"resource": resource}
         if time:
             params["time"] = time
         if v4_format:
             params["v4_format"] = v4_format
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("country-resource-list", params)
 
     def get_dns_chain(self, resource):
-        url = f"{self.base_url}/dns-chain/data.json"
         params = {"resource": resource}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("dns-chain", params)
 
     def get_example_resources(self):
-        url = f"{self.base_url}/example-resources/data.json"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("example-resources")
 
     def get_historical_whois(self, resource, version=None):
-        url = f"{self.base_url}/historical-whois/data.json"
         params = {"resource": resource}
         if version:
             params["version"] = version
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("historical-whois", params)
+
+    def get_whois(self, resource):
+        params = {"resource": resource}
+        return self._fetch("whois", params)
 
     def get_iana_registry_info(self, resource=None, best_match_only=False):
-        url = f"{self.base_url}/iana-registry-info/data.json"
         params = {}
         if resource:
             params["resource"] = resource
         if best_match_only:
             params["best_match_only"] = best_match_only
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("iana-registry-info", params)
 
     def get_routing_history(self, resource, starttime=None, endtime=None, min_peers=10):
-        url = f"{self.base_url}/routing-history/data.json"
         params = {"resource": resource, "min_peers": min_peers}
         if starttime:
             params["starttime"] = starttime
         if endtime:
             params["endtime"] = endtime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("routing-history", params)
 
     def get_routing_status(self, resource, timestamp=None, min_peers_seeing=10):
-        url = f"{self.base_url}/routing-status/data.json"
         params = {"resource": resource, "min_peers_seeing": min_peers_seeing}
         if timestamp:
             params["timestamp"] = timestamp
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("routing-status", params)
 
     def get_rrc_info(self):
-        url = f"{self.base_url}/rrc-info/data.json"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("rrc-info")
 
     def get_rpki_validation_status(self, resource, prefix):
-        url = f"{self.base_url}/rpki-validation/data.json"
         params = {"resource": resource, "prefix": prefix}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("rpki-validation", params)
 
     def get_rpki_history(self, resource, family=4, resolution=None, delegated=False):
-        url = f"{self.base_url}/rpki-history/data.json"
         params = {"resource": resource, "family": family}
         if resolution:
             params["resolution"] = resolution
         if delegated:
             params["delegated"] = delegated
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("rpki-history", params)
 
     def get_searchcomplete(self, resource, limit=6):
-        url = f"{self.base_url}/searchcomplete/data.json"
         params = {"resource": resource, "limit": limit}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("searchcomplete", params)
 
     def get_looking_glass(self, resource):
-        url = f"{self.base_url}/looking-glass/data.json"
         params = {"resource": resource}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("looking-glass", params)
 
     def get_whats_my_ip(self):
-        url = f"{self.base_url}/whats-my-ip/data.json"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("whats-my-ip")
 
     def get_zonemaster(self, resource, method=None):
-        url = f"{self.base_url}/zonemaster/data.json"
         params = {"resource": resource}
         if method:
             params["method"] = method
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("zonemaster", params)
 
     def get_mlab_bandwidth(self, resource, starttime=None, endtime=None):
-        url = f"{self.base_url}/mlab-bandwidth/data.json"
         params = {"resource": resource}
         if starttime:
             params["starttime"] = starttime
         if endtime:
             params["endtime"] = endtime
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return None
+        return self._fetch("mlab-bandwidth", params)
 
     def get_mlab_clients(self, resource, starttime=None, endtime=None):
-        url = f"{self.base_url}/mlab-clients/data.json"
         params = {"resource": resource}
         if starttime:
             params["starttime"] = starttime
         if endtime:
             params["endtime"] = endtime
+        return self._fetch("mlab-clients", params)
+
+
+class AsyncRipeStatService(RipeStatService):
+    """
+    RipeStatService whose endpoint methods return coroutines, for async
+    callers (e.g. the ASGI streaming path):
+
+        data = await AsyncRipeStatService().get_routing_status("AS3333")
+
+    Shares the connection pool and concurrency cap with RipeStatService.
+    """
+
+    async def _fetch(self, path, params=None):
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
+            return await self.client.afetch(path, params)
+        except (httpx.HTTPError, ValueError, CircuitOpenError) as e:
+            logging_utility.warning(f"RIPEstat {path} request failed: {e}")
             return None
 
 
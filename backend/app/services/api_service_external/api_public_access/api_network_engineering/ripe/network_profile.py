@@ -0,0 +1,127 @@
+import asyncio
+import re
+import time
+
+_ASN = re.compile(r"^(?:AS)?(\d+)$", re.IGNORECASE)
+
+# Whois attributes worth surfacing in a profile, in display order.
+WHOIS_KEYS = (
+    "aut-num",
+    "as-name",
+    "inetnum",
+    "inet6num",
+    "netname",
+    "descr",
+    "org",
+    "country",
+    "status",
+    "source",
+)
+
+
+def normalize_resource(resource):
+    """("AS3333", True) for ASNs given as "3333" / "as3333", else (resource, False)."""
+    resource = (resource or "").strip()
+    match = _ASN.match(resource)
+    if match:
+        return f"AS{match.group(1)}", True
+    return resource, False
+
+
+def _data(response):
+    return (response or {}).get("data") or {}
+
+
+def _whois_summary(response):
+    summary = {}
+    for record in _data(response).get("records") or []:
+        for item in record:
+            key = str(item.get("key", "")).lower()
+            if key in WHOIS_KEYS and key not in summary:
+                summary[key] = item.get("value")
+    return {key: summary[key] for key in WHOIS_KEYS if key in summary}
+
+
+async def build_network_profile(
+    service, resource, max_prefixes=20, max_neighbours=10, rpki_sample=5
+):
+    """
+    Collects a profile of an ASN or prefix from RIPEstat.
+
+    `service` is an AsyncRipeStatService. Routing status, abuse contact and
+    whois (plus announced prefixes and neighbours for an ASN) are fetched
+    concurrently; RPKI validation needs their answer (the ASN's prefixes, or
+    the prefix's origins) and runs as a second concurrent round over at
+    most `rpki_sample` origin/prefix pairs. So the profile takes about two
+    RIPEstat round-trips, whatever the number of calls. Calls that fail are
+    listed under "unavailable" rather than failing the profile.
+    """
+    start_time = time.perf_counter()
+    resource, is_asn = normalize_resource(resource)
+
+    calls = {
+        "routing_status": service.get_routing_status(resource),
+        "abuse_contact": service.get_abuse_contact(resource),
+        "whois": service.get_whois(resource),
+    }
+    if is_asn:
+        calls["announced_prefixes"] = service.get_announced_prefixes(resource)
+        calls["neighbours"] = service.get_asn_neighbours(resource)
+    results = dict(zip(calls, await asyncio.gather(*calls.values())))
+
+    routing = _data(results["routing_status"])
+    prefixes = [
+        p.get("prefix")
+        for p in _data(results.get("announced_prefixes")).get("prefixes") or []
+    ]
+    if is_asn:
+        pairs = [(resource, prefix) for prefix in prefixes[:rpki_sample]]
+    else:
+        origins = [o.get("origin") for o in routing.get("origins") or []]
+        pairs = [(f"AS{origin}", resource) for origin in origins[:rpki_sample]]
+    rpki_results = await asyncio.gather(
+        *(service.get_rpki_validation_status(asn, prefix) for asn, prefix in pairs)
+    )
+
+    profile = {
+        "resource": resource,
+        "type": "asn" if is_asn else "prefix",
+        "routing": {
+            "first_seen": routing.get("first_seen"),
+            "last_seen": routing.get("last_seen"),
+            "visibility": routing.get("visibility"),
+            "announced_space": routing.get("announced_space"),
+            "origins": [o.get("origin") for o in routing.get("origins") or []],
+        },
+        "abuse_contacts": _data(results["abuse_contact"]).get("abuse_contacts") or [],
+        "whois": _whois_summary(results["whois"]),
+        "rpki": [
+            {
+                "origin": asn,
+                "prefix": prefix,
+                "status": _data(response).get("status") if response else None,
+            }
+            for (asn, prefix), response in zip(pairs, rpki_results)
+        ],
+    }
+    if is_asn:
+        neighbours = _data(results["neighbours"])
+        profile["announced_prefixes"] = {
+            "count": len(prefixes),
+            "prefixes": prefixes[:max_prefixes],
+        }
+        profile["neighbours"] = {
+            "counts": neighbours.get("neighbour_counts") or {},
+            "top": sorted(
+                neighbours.get("neighbours") or [],
+                key=lambda n: n.get("power") or 0,
+                reverse=True,
+            )[:max_neighbours],
+        }
+
+    unavailable = [name for name, response in results.items() if response is None]
+    if any(response is None for response in rpki_results):
+        unavailable.append("rpki_validation")
+    profile["unavailable"] = unavailable
+    profile["duration"] = round(time.perf_counter() - start_time, 3)
+    return profile
@@ -0,0 +1,255 @@
+import calendar
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Seconds a response stays fresh, per data call. 0: never cached.
+# This is the only cache in front of RIPEstat: the tool layer
+# (ToolBackend) does not cache RipeStatHandler's reports on top of it.
+TTL_POLICY = {
+    # Live routing state.
+    "looking-glass": 30,
+    "routing-status": MINUTE,
+    "bgp-updates": MINUTE,
+    "rpki-validation": 5 * MINUTE,
+    "whats-my-ip": 0,
+    # Changes over hours.
+    "announced-prefixes": HOUR,
+    "asn-neighbours": HOUR,
+    "routing-history": HOUR,
+    "asn-neighbours-history": HOUR,
+    "rpki-history": HOUR,
+    "dns-chain": HOUR,
+    "zonemaster": HOUR,
+    "atlas-probes": HOUR,
+    "searchcomplete": HOUR,
+    "address-space-usage": 6 * HOUR,
+    "address-space-hierarchy": 6 * HOUR,
+    "country-resource-list": 6 * HOUR,
+    "country-resource-stats": 6 * HOUR,
+    "mlab-bandwidth": 6 * HOUR,
+    "mlab-clients": 6 * HOUR,
+    # Registry data that almost never changes.
+    "abuse-contact-finder": DAY,
+    "historical-whois": DAY,
+    "whois": DAY,
+    "allocation-history": DAY,
+    "rrc-info": DAY,
+    "example-resources": DAY,
+    "iana-registry-info": 7 * DAY,
+}
+DEFAULT_TTL = HOUR
+
+# A query whose window ended this long ago (or that pins a whois version)
+# asks about the past, which RIPEstat will keep answering the same way.
+HISTORICAL_MARGIN = DAY
+HISTORICAL_TTL = 30 * DAY
+
+_ASN = re.compile(r"^as\d+$", re.IGNORECASE)
+
+
+def _epoch(value):
+    """Unix seconds for a RIPEstat time (epoch or ISO-8601 UTC), else None."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if text.isdigit():
+        return float(text)
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return float(calendar.timegm(time.strptime(text[:19], fmt)))
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_params(params):
+    """Params as a canonical, sorted tuple: None dropped, booleans lower-cased, ASNs upper-cased."""
+    items = []
+    for name, value in (params or {}).items():
+        if value is None or name == "sourceapp":
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        else:
+            value = str(value).strip()
+            if name == "resource" and _ASN.match(value):
+                value = value.upper()
+        items.append((name, value))
+    return tuple(sorted(items))
+
+
+def cache_key(path, params):
+    return path + "?" + "&".join(f"{k}={v}" for k, v in normalize_params(params))
+
+
+def ttl_for(path, params, now=None):
+    """Freshness lifetime in seconds of `path` queried with `params`."""
+    ttl = TTL_POLICY.get(path, DEFAULT_TTL)
+    if ttl <= 0:
+        return 0
+    now = time.time() if now is None else now
+    params = params or {}
+    if path == "historical-whois" and params.get("version"):
+        return HISTORICAL_TTL
+    for name in ("endtime", "timestamp", "time"):
+        ended = _epoch(params.get(name))
+        if ended is not None and ended < now - HISTORICAL_MARGIN:
+            return HISTORICAL_TTL
+    return ttl
+
+
+class RipeStatCache:
+    """
+    Two-tier cache of RIPEstat responses: an in-memory LRU in front of a
+    SQLite file that survives restarts and is shared by every process on
+    the host.
+
+    Keys are the data call plus its normalised parameters, so
+    get_routing_status("as3333") and get_routing_status("AS3333") share an
+    entry. Lifetimes come from TTL_POLICY (historical windows get
+    HISTORICAL_TTL); this cache owns the freshness of RIPEstat data for
+    every caller, tools included. Only responses with status "ok" are
+    stored, and a response RIPEstat itself served from cache ("cached":
+    true) is aged from its "query_time", not from when we received it.
+
+    Environment:
+        RIPESTAT_CACHE_PATH         SQLite file (default <tmp>/ripestat-cache.sqlite3);
+                                    "" keeps the memory tier only
+        RIPESTAT_CACHE_MEMORY_SIZE  responses kept in memory (default 512)
+    """
+
+    _PRUNE_EVERY = 200  # writes between deletions of expired rows
+
+    def __init__(self, path=None, memory_size=None):
+        if path is None:
+            path = os.environ.get(
+                "RIPESTAT_CACHE_PATH",
+                os.path.join(tempfile.gettempdir(), "ripestat-cache.sqlite3"),
+            )
+        self.path = path or None
+        size = int(memory_size or os.environ.get("RIPESTAT_CACHE_MEMORY_SIZE", 512))
+        self.memory = TTLCache(maxsize=size, ttl=DEFAULT_TTL)
+        self._db = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        if self.path:
+            try:
+                self._db = self._connect(self.path)
+            except sqlite3.Error as e:
+                logging_utility.warning(
+                    f"RIPEstat disk cache unavailable ({self.path}): {e}"
+                )
+
+    @staticmethod
+    def _connect(path):
+        db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, body TEXT NOT NULL)"
+        )
+        return db
+
+    def get(self, path, params):
+        """The fresh cached response, or None."""
+        key = cache_key(path, params)
+        data = self.memory.get(key)
+        if data is not None:
+            return data
+        if self._db is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT expires_at, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[0] <= now:
+                    self.misses += 1
+                    return None
+                self.disk_hits += 1
+        except sqlite3.Error as e:
+            logging_utility.warning(f"RIPEstat disk cache read failed: {e}")
+            return None
+        data = json.loads(row[1])
+        self.memory.set(key, data, ttl=row[0] - now)
+        return data
+
+    def set(self, path, params, data):
+        """Stores a response if the policy allows it; returns the TTL used."""
+        if not isinstance(data, dict) or data.get("status") != "ok":
+            return 0
+        now = time.time()
+        ttl = ttl_for(path, params, now)
+        if data.get("cached"):
+            queried = _epoch(data.get("query_time"))
+            if queried is not None and queried < now:
+                ttl -= now - queried
+        if ttl <= 0:
+            return 0
+
+        key = cache_key(path, params)
+        self.memory.set(key, data, ttl=ttl)
+        with self._lock:
+            self.stores += 1
+            if self._db is None:
+                return ttl
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, now + ttl, json.dumps(data)),
+                )
+                self._writes += 1
+                if self._writes % self._PRUNE_EVERY == 0:
+                    self._db.execute(
+                        "DELETE FROM responses WHERE expires_at <= ?", (now,)
+                    )
+            except sqlite3.Error as e:
+                logging_utility.warning(f"RIPEstat disk cache write failed: {e}")
+        return ttl
+
+    def clear(self):
+        self.memory.clear()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            rows = (
+                self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if self._db is not None
+                else None
+            )
+            return {
+                "path": self.path,
+                "memory": self.memory.stats(),
+                "disk_rows": rows,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+            }
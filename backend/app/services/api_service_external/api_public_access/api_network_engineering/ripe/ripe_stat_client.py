@@ -0,0 +1,243 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+
+import httpx
+
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.ripe_stat_cache import \
+    RipeStatCache
+from backend.app.services.api_service_external.resilience import get_resilience
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+
+def _http2_available():
+    """httpx only speaks HTTP/2 with its optional h2 dependency installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class RipeStatClient:
+    """
+    Shared connection pool for the RIPEstat Data API.
+
+    One httpx.AsyncClient runs on a private event-loop thread, so every
+    caller (blocking tool handlers on worker threads, or coroutines on the
+    ASGI server's loop) shares the same keep-alive connections, the same
+    HTTP/2 connection when h2 is installed, and one semaphore capping the
+    requests in flight against stat.ripe.net. fetch() blocks; afetch() can
+    be awaited from any event loop. Both answer from `cache` (a
+    RipeStatCache) when it holds a fresh response.
+
+    Every call has a deadline (RIPESTAT_TIMEOUT seconds by default, waiting
+    for a semaphore slot included); a slow endpoint raises
+    httpx.TimeoutException instead of holding the caller indefinitely.
+    Within that deadline, 429/5xx answers and connection errors are
+    retried with backoff, and a failing stat.ripe.net trips its circuit
+    breaker, through the shared Resilience (`resilience`).
+
+    Environment:
+        RIPESTAT_BASE_URL         default https://stat.ripe.net/data
+        RIPESTAT_TIMEOUT          seconds per call (default 10)
+        RIPESTAT_CONNECT_TIMEOUT  seconds to connect (default 5)
+        RIPESTAT_MAX_CONCURRENCY  requests in flight, all callers (default 8)
+        RIPESTAT_MAX_CONNECTIONS  pooled connections (default 20)
+        RIPESTAT_HTTP2            "auto" (if h2 is installed), "1" or "0"
+        RIPESTAT_SOURCEAPP        sourceapp parameter RIPE asks clients to send
+        RIPESTAT_CACHE            "0" disables the shared client's response cache
+    """
+
+    def __init__(
+        self,
+        base_url=None,
+        timeout=None,
+        connect_timeout=None,
+        max_concurrency=None,
+        max_connections=None,
+        http2=None,
+        sourceapp=None,
+        cache=None,
+        resilience=None,
+    ):
+        env = os.environ.get
+        self.base_url = (
+            base_url or env("RIPESTAT_BASE_URL", "https://stat.ripe.net/data")
+        ).rstrip("/")
+        self.timeout = float(timeout or env("RIPESTAT_TIMEOUT", 10))
+        self.connect_timeout = float(
+            connect_timeout or env("RIPESTAT_CONNECT_TIMEOUT", 5)
+        )
+        self.max_concurrency = int(
+            max_concurrency or env("RIPESTAT_MAX_CONCURRENCY", 8)
+        )
+        self.max_connections = int(
+            max_connections or env("RIPESTAT_MAX_CONNECTIONS", 20)
+        )
+        if http2 is None:
+            http2 = env("RIPESTAT_HTTP2", "auto")
+        if http2 == "auto":
+            http2 = _http2_available()
+        self.http2 = str(http2).lower() in ("true", "1", "t")
+        self.sourceapp = sourceapp or env("RIPESTAT_SOURCEAPP")
+        self.cache = cache
+        self.resilience = resilience or get_resilience()
+
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    # ── event loop ───────────────────────────────────────────
+    def _ensure_started(self):
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="ripestat-client", daemon=True
+                )
+                thread.start()
+                # The client and semaphore must be created on their loop.
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _setup(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=self.http2,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    # ── requests ─────────────────────────────────────────────
+    async def _send(self, path, params):
+        # One attempt; backoff between attempts happens outside the semaphore.
+        async with self._semaphore:
+            with self._stats_lock:
+                self.in_flight += 1
+            try:
+                return await self._client.get(f"/{path}/data.json", params=params)
+            finally:
+                with self._stats_lock:
+                    self.in_flight -= 1
+
+    async def _get(self, path, params, deadline):
+        response = await self.resilience.acall(
+            self.base_url,
+            lambda: self._send(path, params),
+            transient=(httpx.TransportError,),
+            deadline=deadline,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _call(self, path, params, timeout):
+        params = dict(params or {})
+        if self.sourceapp:
+            params.setdefault("sourceapp", self.sourceapp)
+        with self._stats_lock:
+            self.requests += 1
+        try:
+            return await asyncio.wait_for(
+                self._get(path, params, time.monotonic() + timeout), timeout
+            )
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            with self._stats_lock:
+                self.timeouts += 1
+            raise httpx.TimeoutException(
+                f"RIPEstat {path} did not answer within {timeout}s"
+            )
+        except Exception:
+            with self._stats_lock:
+                self.errors += 1
+            raise
+
+    def submit(self, path, params=None, timeout=None):
+        """Schedules GET /<path>/data.json; returns a concurrent.futures.Future."""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(
+            self._call(path, params, timeout or self.timeout), loop
+        )
+
+    def fetch(self, path, params=None, timeout=None):
+        """Decoded JSON body of GET /<path>/data.json (blocking)."""
+        if self.cache is not None:
+            data = self.cache.get(path, params)
+            if data is not None:
+                return data
+        data = self.submit(path, params, timeout).result()
+        if self.cache is not None:
+            self.cache.set(path, params, data)
+        return data
+
+    async def afetch(self, path, params=None, timeout=None):
+        """Awaitable fetch(), usable from any event loop."""
+        if self.cache is not None:
+            data = self.cache.get(path, params)
+            if data is not None:
+                return data
+        data = await asyncio.wrap_future(self.submit(path, params, timeout))
+        if self.cache is not None:
+            self.cache.set(path, params, data)
+        return data
+
+    def run(self, coro):
+        """
+        Runs a coroutine (e.g. several AsyncRipeStatService calls gathered)
+        on the client's loop and blocks until it finishes. Not for use from
+        that loop itself.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started()).result()
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "http2": self.http2,
+                "max_concurrency": self.max_concurrency,
+                "max_connections": self.max_connections,
+                "timeout": self.timeout,
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "cache": self.cache.stats() if self.cache is not None else None,
+                "breaker": self.resilience.breaker(self.base_url).stats(),
+            }
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_ripe_stat_client():
+    """The process-wide RipeStatClient, created on first use."""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                cache = None
+                if os.environ.get("RIPESTAT_CACHE", "1").lower() in ("true", "1", "t"):
+                    cache = RipeStatCache()
+                _default_client = RipeStatClient(cache=cache)
+    return _default_client
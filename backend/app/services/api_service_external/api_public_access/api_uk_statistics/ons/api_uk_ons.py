@@ -1,13 +1,37 @@
 import io
+import os
 import time
 
 import pandas as pd
 import requests
 
+from backend.app.services.api_service_external.resilience import (
+    CircuitOpenError, get_resilience)
+
 
 class OnsApiService:
-    def __init__(self):
+    """
+    ONS beta API. Requests go through the shared Resilience: 429/5xx
+    answers and connection errors are retried with backoff, and a failing
+    host trips its circuit breaker (CircuitOpenError is handled like any
+    other failed request). ONS_TIMEOUT sets the per-request timeout in
+    seconds (default 30).
+    """
+
+    def __init__(self, resilience=None):
         self.metadata_cache = {}
+        self.resilience = resilience or get_resilience()
+        self.timeout = float(os.environ.get("ONS_TIMEOUT", 30))
+
+    def _get(self, url):
+        return self.resilience.call(
+            url,
+            lambda: requests.get(url, timeout=self.timeout),
+            transient=(
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ),
+        )
 
     def get_data_and_metadata(self, metadata_url):
         """
@@ -18,41 +42,42 @@ class OnsApiService:
             metadata = self.metadata_cache[metadata_url]
         else:
             try:
-                response = requests.get(metadata_url)
+                response = self._get(metadata_url)
                 response.raise_for_status()
                 metadata = response.json()
                 self.metadata_cache[metadata_url] = metadata
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
                 print(f"An error occurred while making the API request: {e}")
                 return None, None
 
         try:
             csv_url = metadata["downloads"]["csv"]["href"]
-            csv_data = requests.get(csv_url).content
-            data_df = pd.read_csv(io.StringIO(csv_data.decode("utf-8")))
+            response = self._get(csv_url)
+            response.raise_for_status()
+            data_df = pd.read_csv(io.StringIO(response.content.decode("utf-8")))
             return metadata, data_df
-        except (KeyError, requests.exceptions.RequestException) as e:
+        except (KeyError, requests.exceptions.RequestException, CircuitOpenError) as e:
             print(f"An error occurred while retrieving the data file: {e}")
             return metadata, None
 
     def get_dataset_data(self, limit=20, offset=0):
         url = f"https://api.beta.ons.gov.uk/v1/datasets?limit={limit}&offset={offset}"
         try:
-            response = requests.get(url)
+            response = self._get(url)
             response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
             data = response.json()
             return data
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
             print("An error occurred while making the API request:", e)
             return None
 
     def get_dataset_by_endpoint(self, endpoint):
         try:
-            response = requests.get(endpoint)
+            response = self._get(endpoint)
             response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
             data = response.json()
             return data
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
             print("An error occurred while making the API request:", e)
             return None
 
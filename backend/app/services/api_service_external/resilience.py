@@ -0,0 +1,333 @@
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from datetime import timezone
+from urllib.parse import urlsplit
+
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+# Responses worth retrying: rate limiting and transient server trouble.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open."""
+
+    def __init__(self, host, retry_in):
+        super().__init__(f"Circuit open for {host}; next attempt in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def retry_after(headers, now=None):
+    """Seconds a Retry-After header (delta-seconds or HTTP date) asks for, else None."""
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: the n-th retry waits a random
+    time up to min(max_delay, base_delay * 2**(n-1)), unless the response
+    carries a Retry-After, which is honoured as long as it is no longer
+    than max_retry_after (a longer one gives up straight away).
+    """
+
+    def __init__(
+        self,
+        attempts=3,
+        base_delay=0.5,
+        max_delay=8.0,
+        max_retry_after=30.0,
+        statuses=RETRY_STATUSES,
+    ):
+        self.attempts = max(1, int(attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.max_retry_after = float(max_retry_after)
+        self.statuses = frozenset(statuses)
+
+    def backoff(self, attempt):
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait after failed attempt number `attempt`, or None to give up."""
+        if attempt >= self.attempts:
+            return None
+        wait = retry_after(response.headers) if response is not None else None
+        if wait is None:
+            return self.backoff(attempt)
+        return wait if wait <= self.max_retry_after else None
+
+    def to_dict(self):
+        return {
+            "attempts": self.attempts,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "max_retry_after": self.max_retry_after,
+            "statuses": sorted(self.statuses),
+        }
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After `failure_threshold` consecutive failed
+    attempts the circuit opens and calls fail fast with CircuitOpenError.
+    Once `reset_timeout` seconds have passed it is half-open: up to
+    `half_open_probes` calls go through, and the first result closes the
+    circuit again (success) or reopens it for another `reset_timeout`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, host, failure_threshold=5, reset_timeout=30.0, half_open_probes=1
+    ):
+        self.host = host
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.half_open_probes = max(1, int(half_open_probes))
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuits = 0
+        self.opens = 0
+
+    def allow(self):
+        """Admits one attempt, or raises CircuitOpenError."""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.short_circuits += 1
+                    raise CircuitOpenError(self.host, remaining)
+                self.state = self.HALF_OPEN
+                self._probes = 0
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.short_circuits += 1
+                    raise CircuitOpenError(self.host, 0.0)
+                self._probes += 1
+            self.calls += 1
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self.state != self.CLOSED:
+                logging_utility.info(f"Circuit for {self.host} closed")
+                self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.state == self.OPEN:
+                return
+            if (
+                self.state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                logging_utility.warning(
+                    f"Circuit for {self.host} opened after "
+                    f"{self.consecutive_failures} consecutive failures"
+                )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.opens += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "short_circuits": self.short_circuits,
+                "opens": self.opens,
+            }
+
+
+class Resilience:
+    """
+    Retry and circuit breaking for calls to external HTTP APIs (RIPEstat,
+    ONS), shared by every service so one host's breaker sees all its
+    traffic.
+
+    call() and acall() take the URL (its host picks the breaker) and a
+    function that makes one attempt and returns a response with
+    `status_code` and `headers` (requests and httpx both fit). Attempts
+    that raise one of `transient` or answer with a RETRY_STATUSES code are
+    retried per the RetryPolicy; the last response is returned (or the last
+    exception raised) once retries run out, so callers keep their own
+    raise_for_status() handling. With a `deadline` (time.monotonic()
+    value), no retry is scheduled that would end after it.
+
+    Environment:
+        EXTERNAL_RETRY_ATTEMPTS       attempts per call, first included (default 3)
+        EXTERNAL_RETRY_BASE_DELAY     seconds, doubled per retry (default 0.5)
+        EXTERNAL_RETRY_MAX_DELAY      cap on the backoff in seconds (default 8)
+        EXTERNAL_RETRY_AFTER_MAX      longest Retry-After honoured (default 30)
+        EXTERNAL_BREAKER_THRESHOLD    consecutive failures that open a circuit (default 5)
+        EXTERNAL_BREAKER_RESET        seconds a circuit stays open (default 30)
+        EXTERNAL_BREAKER_PROBES       calls let through while half-open (default 1)
+    """
+
+    def __init__(
+        self,
+        policy=None,
+        failure_threshold=None,
+        reset_timeout=None,
+        half_open_probes=None,
+    ):
+        env = os.environ.get
+        self.policy = policy or RetryPolicy(
+            attempts=env("EXTERNAL_RETRY_ATTEMPTS", 3),
+            base_delay=env("EXTERNAL_RETRY_BASE_DELAY", 0.5),
+            max_delay=env("EXTERNAL_RETRY_MAX_DELAY", 8),
+            max_retry_after=env("EXTERNAL_RETRY_AFTER_MAX", 30),
+        )
+        self.failure_threshold = int(
+            failure_threshold or env("EXTERNAL_BREAKER_THRESHOLD", 5)
+        )
+        self.reset_timeout = float(reset_timeout or env("EXTERNAL_BREAKER_RESET", 30))
+        self.half_open_probes = int(
+            half_open_probes or env("EXTERNAL_BREAKER_PROBES", 1)
+        )
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                    half_open_probes=self.half_open_probes,
+                )
+            return breaker
+
+    def _next(self, breaker, attempt, response=None, deadline=None):
+        """
+        Records the outcome of an attempt (response None: it raised) and
+        returns the seconds to wait before the next one, or None if done.
+        """
+        if response is not None and response.status_code not in self.policy.statuses:
+            breaker.record_success()
+            return None
+        breaker.record_failure()
+        wait = self.policy.delay(attempt, response)
+        if wait is None or (
+            deadline is not None and time.monotonic() + wait >= deadline
+        ):
+            return None
+        breaker.record_retry()
+        return wait
+
+    def call(self, url, send, transient=(), deadline=None):
+        breaker = self.breaker(url)
+        attempt = 0
+        while True:
+            breaker.allow()
+            attempt += 1
+            try:
+                response = send()
+            except transient:
+                wait = self._next(breaker, attempt, deadline=deadline)
+                if wait is None:
+                    raise
+            except BaseException:
+                # Not retried, but still an outcome: a half-open probe
+                # must not stay checked out.
+                breaker.record_failure()
+                raise
+            else:
+                wait = self._next(breaker, attempt, response, deadline)
+                if wait is None:
+                    return response
+            time.sleep(wait)
+
+    async def acall(self, url, send, transient=(), deadline=None):
+        """call() for a `send` that returns an awaitable."""
+        breaker = self.breaker(url)
+        attempt = 0
+        while True:
+            breaker.allow()
+            attempt += 1
+            try:
+                response = await send()
+            except transient:
+                wait = self._next(breaker, attempt, deadline=deadline)
+                if wait is None:
+                    raise
+            except BaseException:
+                # Not retried, but still an outcome (including cancellation
+                # by the caller's deadline): a half-open probe must not stay
+                # checked out.
+                breaker.record_failure()
+                raise
+            else:
+                wait = self._next(breaker, attempt, response, deadline)
+                if wait is None:
+                    return response
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            "policy": self.policy.to_dict(),
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "hosts": {host: breaker.stats() for host, breaker in breakers.items()},
+        }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_resilience():
+    """The process-wide Resilience, created on first use."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = Resilience()
+    return _default
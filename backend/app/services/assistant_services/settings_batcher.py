@@ -0,0 +1,168 @@
+# backend/app/services/assistant_services/settings_batcher.py
+import threading
+import time
+from concurrent.futures import Future
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+_MISSING = object()
+
+
+class UnknownSettingError(ValueError):
+    pass
+
+
+class _PendingUpdate:
+    """Flag changes for one assistant waiting to be sent upstream together."""
+
+    def __init__(self, assistants, now):
+        self.assistants = assistants
+        self.changes = {}
+        self.first_at = now
+        self.last_at = now
+        self.future = Future()
+
+
+class AssistantSettingsBatcher:
+    """
+    Coalesces assistant feature-flag changes into single upstream updates.
+
+    update() merges its changes into the assistant's pending batch and waits
+    for it. The batch is sent once no change has arrived for
+    ASSISTANT_SETTINGS_DEBOUNCE seconds (or ASSISTANT_SETTINGS_MAX_WAIT after
+    its first change), as one client.assistants.update_assistant() call. A
+    flag toggled several times inside the window only sends its last value.
+    Every batch is sent, even if it matches the cached assistant: that copy
+    may predate changes made by another worker or client.
+
+    The assistant returned by each update (or retrieve) is cached for
+    ASSISTANT_SETTINGS_CACHE_TTL seconds and served by get().
+
+    Config keys:
+        ASSISTANT_SETTINGS_FLAGS      comma-separated boolean flags accepted
+                                      (default "deep_research,web_access")
+        ASSISTANT_SETTINGS_DEBOUNCE   seconds of quiet before sending (default 0.2)
+        ASSISTANT_SETTINGS_MAX_WAIT   longest a change waits (default 1.0)
+        ASSISTANT_SETTINGS_CACHE_TTL  seconds; 0 disables the cache (default 300)
+    """
+
+    def __init__(self, app=None):
+        self.flags = ("deep_research", "web_access")
+        self.debounce = 0.2
+        self.max_wait = 1.0
+        self.cache = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Batches are sent one at a time so a later one can't overtake an
+        # earlier one upstream.
+        self._send_lock = threading.Lock()
+
+        self.requested = 0
+        self.upstream_updates = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        flags = app.config.get("ASSISTANT_SETTINGS_FLAGS") or ""
+        self.flags = tuple(f.strip() for f in flags.split(",") if f.strip()) or (
+            self.flags
+        )
+        self.debounce = float(app.config.get("ASSISTANT_SETTINGS_DEBOUNCE", 0.2))
+        self.max_wait = float(app.config.get("ASSISTANT_SETTINGS_MAX_WAIT", 1.0))
+        ttl = float(app.config.get("ASSISTANT_SETTINGS_CACHE_TTL", 300))
+        self.cache = TTLCache(maxsize=256, ttl=ttl) if ttl > 0 else None
+        app.extensions["assistant_settings"] = self
+
+    def validate(self, changes):
+        """Returns the flag changes in `changes`; raises on unknown or non-bool ones."""
+        unknown = sorted(set(changes) - set(self.flags))
+        if unknown:
+            raise UnknownSettingError(
+                f"Unknown setting(s): {', '.join(unknown)}. "
+                f"Allowed: {', '.join(self.flags)}"
+            )
+        for name, value in changes.items():
+            if not isinstance(value, bool):
+                raise ValueError(f"'{name}' must be a boolean")
+        return dict(changes)
+
+    def get(self, assistants, assistant_id):
+        """The assistant, from cache if possible."""
+        if self.cache is not None:
+            assistant = self.cache.get(assistant_id, _MISSING)
+            if assistant is not _MISSING:
+                return assistant
+        assistant = assistants.retrieve_assistant(assistant_id)
+        if self.cache is not None:
+            self.cache.set(assistant_id, assistant)
+        return assistant
+
+    def update(self, assistants, assistant_id, changes):
+        """
+        Queues `changes` for the assistant and blocks until the batch they
+        joined has been sent. Returns the updated assistant; re-raises the
+        upstream error if the update failed.
+        """
+        changes = self.validate(changes)
+        now = time.monotonic()
+        with self._lock:
+            self.requested += 1
+            pending = self._pending.get(assistant_id)
+            if pending is None:
+                pending = self._pending[assistant_id] = _PendingUpdate(assistants, now)
+                threading.Thread(
+                    target=self._flush_when_quiet,
+                    args=(assistant_id, pending),
+                    name="assistant-settings",
+                    daemon=True,
+                ).start()
+            pending.changes.update(changes)
+            pending.last_at = now
+        return pending.future.result()
+
+    def _flush_when_quiet(self, assistant_id, pending):
+        while True:
+            with self._lock:
+                send_at = min(
+                    pending.last_at + self.debounce, pending.first_at + self.max_wait
+                )
+                wait = send_at - time.monotonic()
+                if wait <= 0:
+                    # Later changes start a new batch.
+                    del self._pending[assistant_id]
+                    changes = dict(pending.changes)
+                    break
+            time.sleep(wait)
+
+        try:
+            with self._send_lock:
+                assistant = self._send(pending.assistants, assistant_id, changes)
+            pending.future.set_result(assistant)
+        except Exception as e:
+            if self.cache is not None:
+                self.cache.invalidate(assistant_id)
+            pending.future.set_exception(e)
+
+    def _send(self, assistants, assistant_id, changes):
+        logging_utility.info(f"Updating assistant {assistant_id} settings: {changes}")
+        assistant = assistants.update_assistant(assistant_id=assistant_id, **changes)
+        with self._lock:
+            self.upstream_updates += 1
+        if self.cache is not None:
+            self.cache.set(assistant_id, assistant)
+        return assistant
+
+    def settings_of(self, assistant):
+        return {name: getattr(assistant, name, None) for name in self.flags}
+
+    def stats(self):
+        return {
+            "flags": list(self.flags),
+            "requested": self.requested,
+            "upstream_updates": self.upstream_updates,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
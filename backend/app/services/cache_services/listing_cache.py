@@ -0,0 +1,196 @@
+# backend/app/services/cache_services/listing_cache.py
+import math
+import pickle
+import threading
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.logging_service.logger import LoggingUtility
+
+try:
+    import redis
+except ImportError:  # optional: only needed for the shared tier
+    redis = None
+
+logging_utility = LoggingUtility()
+
+_MISSING = object()
+
+
+class ListingCache:
+    """
+    Read-through cache for the thread / message listings the sidebar polls.
+
+    Entries are keyed by (namespace, key), e.g. ("threads", user_id) or
+    ("messages", thread_id), and dropped by invalidate() on every write that
+    changes the listing, or after LISTING_CACHE_TTL seconds at the latest.
+    invalidate_all() drops a whole namespace, for writes that can't tell
+    which keys they affect.
+
+    Two tiers:
+    - an in-process LRU (TTLCache), always on when the cache is enabled;
+    - an optional shared Redis tier (LISTING_CACHE_REDIS_URL), so workers
+      share loads and invalidations. Other workers' in-process copies can't
+      be invalidated, so with a shared tier they only live for
+      LISTING_CACHE_LOCAL_TTL seconds. Values are pickled: the Redis
+      instance must be trusted. Redis errors fall back to the loader.
+
+    A load that overlaps an invalidate() is returned but not cached.
+
+    Config keys:
+        LISTING_CACHE_TTL        seconds; 0 disables caching (default 30)
+        LISTING_CACHE_SIZE       in-process entries (default 1024)
+        LISTING_CACHE_REDIS_URL  shared tier, e.g. redis://cache:6379/0
+        LISTING_CACHE_LOCAL_TTL  in-process TTL with a shared tier (default 5)
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 30.0
+        self.prefix = "listing:"
+        self.local = None
+        self.shared = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.loads = 0
+        self.invalidations = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = float(app.config.get("LISTING_CACHE_TTL", 30))
+        size = int(app.config.get("LISTING_CACHE_SIZE", 1024))
+        local_ttl = self.ttl
+
+        redis_url = app.config.get("LISTING_CACHE_REDIS_URL")
+        if redis_url and self.ttl > 0:
+            if redis is None:
+                logging_utility.warning(
+                    "LISTING_CACHE_REDIS_URL is set but redis is not installed; "
+                    "listing cache is in-process only."
+                )
+            else:
+                self.shared = redis.Redis.from_url(
+                    redis_url, socket_timeout=0.25, socket_connect_timeout=0.25
+                )
+                local_ttl = min(
+                    self.ttl, float(app.config.get("LISTING_CACHE_LOCAL_TTL", 5))
+                )
+
+        self.local = TTLCache(maxsize=size, ttl=local_ttl) if self.ttl > 0 else None
+        app.extensions["listing_cache"] = self
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}{namespace}:{key}"
+
+    def get_or_load(self, namespace, key, loader):
+        """Returns the cached listing, or loader() (cached on the way out)."""
+        if self.local is None:
+            return loader()
+
+        cache_key = self._key(namespace, key)
+        value = self.local.get(cache_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        generation = self._generation
+        value = self._shared_get(cache_key)
+        from_shared = value is not _MISSING
+        if not from_shared:
+            value = loader()
+            with self._lock:
+                self.loads += 1
+
+        if generation == self._generation:
+            if not from_shared:
+                self._shared_set(cache_key, value)
+            self.local.set(cache_key, value)
+        return value
+
+    def invalidate(self, namespace, key):
+        if self.local is None or key is None:
+            return
+        cache_key = self._key(namespace, key)
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+        self.local.invalidate(cache_key)
+        if self.shared is not None:
+            try:
+                self.shared.delete(cache_key)
+            except redis.RedisError as e:
+                self._shared_error("delete", e)
+
+    def invalidate_all(self, namespace):
+        if self.local is None:
+            return
+        prefix = self._key(namespace, "")
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+        self.local.invalidate_prefix(prefix)
+        if self.shared is not None:
+            try:
+                keys = list(self.shared.scan_iter(match=prefix + "*", count=500))
+                if keys:
+                    self.shared.delete(*keys)
+            except redis.RedisError as e:
+                self._shared_error("delete", e)
+
+    # ─────────────────────────────────────────────────────────────
+    # Shared tier
+    # ─────────────────────────────────────────────────────────────
+    def _shared_get(self, cache_key):
+        if self.shared is None:
+            return _MISSING
+        try:
+            raw = self.shared.get(cache_key)
+        except redis.RedisError as e:
+            self._shared_error("get", e)
+            return _MISSING
+        with self._lock:
+            if raw is None:
+                self.shared_misses += 1
+                return _MISSING
+            self.shared_hits += 1
+        return pickle.loads(raw)
+
+    def _shared_set(self, cache_key, value):
+        if self.shared is None:
+            return
+        try:
+            self.shared.setex(cache_key, math.ceil(self.ttl), pickle.dumps(value))
+        except (redis.RedisError, pickle.PicklingError, TypeError) as e:
+            self._shared_error("set", e)
+
+    def _shared_error(self, op, error):
+        with self._lock:
+            self.shared_errors += 1
+        logging_utility.warning(f"Listing cache: shared tier {op} failed: {error}")
+
+    def stats(self):
+        if self.local is None:
+            return {"enabled": False}
+        local = self.local.stats()
+        lookups = local["hits"] + local["misses"]
+        hits = local["hits"] + self.shared_hits
+        return {
+            "enabled": True,
+            "ttl": self.ttl,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "local": local,
+            "shared": (
+                {
+                    "hits": self.shared_hits,
+                    "misses": self.shared_misses,
+                    "errors": self.shared_errors,
+                }
+                if self.shared is not None
+                else None
+            ),
+        }
@@ -0,0 +1,344 @@
+# backend/app/services/entity_services/client_provider.py
+import os
+import threading
+import time
+
+import httpx
+from projectdavid import Entity
+
+from backend.app.services.entity_services.single_flight import (
+    SingleFlight, coalesce_client)
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+# Entity's lazily-built sub-clients that get moved onto the shared transport.
+_POOLED_CLIENTS = (
+    "users",
+    "assistants",
+    "threads",
+    "messages",
+    "mcp",
+    "runs",
+    "scratchpads",
+    "actions",
+    "tools",
+    "computer",
+    "inference",
+    "files",
+    "vectors",
+)
+
+
+class ClientUnavailableError(Exception):
+    """The Entity client could not be created (and the retry backoff hasn't elapsed)."""
+
+
+def _rewire(sub_client, transport):
+    """
+    Rebuilds every httpx.Client held by an SDK sub-client on `transport`.
+
+    Client-level settings (base URL, headers, timeout, auth, params,
+    cookies, redirects, event hooks, trust_env) carry over. Connection
+    settings (verify, cert, http2, proxy, limits) belong to the transport,
+    so the shared one's apply instead.
+    """
+    for attr, value in list(vars(sub_client).items()):
+        if isinstance(value, httpx.Client):
+            setattr(
+                sub_client,
+                attr,
+                httpx.Client(
+                    base_url=value.base_url,
+                    headers=value.headers,
+                    timeout=value.timeout,
+                    auth=value.auth,
+                    params=value.params,
+                    cookies=value.cookies,
+                    follow_redirects=value.follow_redirects,
+                    max_redirects=value.max_redirects,
+                    event_hooks=value.event_hooks,
+                    trust_env=value.trust_env,
+                    transport=transport,
+                ),
+            )
+            value.close()
+
+
+class _PooledEntity(Entity):
+    """
+    Entity whose sub-clients all share one HTTP connection pool, with the
+    read methods in `coalesced` ({"threads": {"list_threads"}, ...}) going
+    through `flight`.
+    """
+
+    def __init__(self, transport, flight=None, coalesced=None, **kwargs):
+        super().__init__(**kwargs)
+        self._transport = transport
+        self._flight = flight
+        self._coalesced = coalesced or {}
+        self._rewire_lock = threading.RLock()
+
+
+def _shared_pool(name):
+    lazy = getattr(Entity, name)
+
+    def getter(self):
+        with self._rewire_lock:
+            sub_client = lazy.fget(self)
+            if not getattr(sub_client, "_on_shared_pool", False):
+                _rewire(sub_client, self._transport)
+                if self._flight is not None and name in self._coalesced:
+                    coalesce_client(
+                        sub_client, name, self._coalesced[name], self._flight
+                    )
+                sub_client._on_shared_pool = True
+        return sub_client
+
+    return property(getter, doc=lazy.__doc__)
+
+
+for _name in _POOLED_CLIENTS:
+    if isinstance(getattr(Entity, _name, None), property):
+        setattr(_PooledEntity, _name, _shared_pool(_name))
+
+
+class LazyEntity:
+    """
+    Module-level stand-in for an Entity client.
+
+    Attribute access resolves through the provider, so importing a blueprint
+    never builds the SDK client, and a client that failed to initialise is
+    retried on a later request instead of staying None. Truthiness reports
+    whether a client is available, so `if not client:` guards keep working.
+    """
+
+    def __init__(self, provider):
+        self._provider = provider
+
+    def __bool__(self):
+        try:
+            self._provider.get()
+            return True
+        except ClientUnavailableError:
+            return False
+
+    def __getattr__(self, name):
+        return getattr(self._provider.get(), name)
+
+
+class EntityClientProvider:
+    """
+    One shared ProjectDavid Entity client for every blueprint.
+
+    - Lazy: the client is built on first use, not at import time.
+    - Pooled: every SDK sub-client (threads, messages, runs, vectors, ...)
+      talks to the API through one httpx transport, so keep-alive
+      connections are reused across routes instead of one pool per
+      sub-client per blueprint.
+    - Coalesced: identical concurrent calls to the read methods listed in
+      ENTITIES_SINGLE_FLIGHT share one upstream request (see SingleFlight).
+    - Self-healing: a failed init is retried after ENTITIES_REINIT_BACKOFF
+      seconds; a background health check (a cheap GET on the API base URL)
+      runs every ENTITIES_HEALTH_INTERVAL seconds, and after
+      ENTITIES_HEALTH_FAILURES consecutive failures the client is rebuilt on
+      a fresh pool.
+
+    Config keys:
+        ENTITIES_BASE_URL             API base URL (SDK default if unset)
+        ENTITIES_POOL_MAX_CONNECTIONS open connections to the API (default 100)
+        ENTITIES_POOL_MAX_KEEPALIVE   idle keep-alive connections kept (default 20)
+        ENTITIES_KEEPALIVE_EXPIRY     seconds an idle connection is kept (default 30)
+        ENTITIES_REINIT_BACKOFF       seconds between init attempts (default 10)
+        ENTITIES_HEALTH_INTERVAL      seconds between health checks; 0 disables (default 30)
+        ENTITIES_HEALTH_PATH          path probed by the health check (default "/")
+        ENTITIES_HEALTH_FAILURES      failed checks before re-init (default 3)
+        ENTITIES_SINGLE_FLIGHT        comma-separated "client.method" reads to
+                                      coalesce; empty disables
+    """
+
+    def __init__(self, app=None):
+        self.base_url = None
+        self.max_connections = 100
+        self.max_keepalive = 20
+        self.keepalive_expiry = 30.0
+        self.reinit_backoff = 10.0
+        self.health_interval = 30.0
+        self.health_path = "/"
+        self.health_failures = 3
+        self.coalesced = {}
+        self.single_flight = SingleFlight()
+
+        self._entity = None
+        self._health_client = None
+        self._lazy = LazyEntity(self)
+        self._lock = threading.Lock()
+        self._last_failure_at = None
+        self._last_error = None
+        self._last_check_at = time.monotonic()
+        self._checking = False
+        self._healthy = None
+        self._consecutive_failures = 0
+
+        self._inits = 0
+        self._init_failures = 0
+        self._reinits = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.base_url = app.config.get("ENTITIES_BASE_URL") or None
+        self.max_connections = int(app.config.get("ENTITIES_POOL_MAX_CONNECTIONS", 100))
+        self.max_keepalive = int(app.config.get("ENTITIES_POOL_MAX_KEEPALIVE", 20))
+        self.keepalive_expiry = float(app.config.get("ENTITIES_KEEPALIVE_EXPIRY", 30))
+        self.reinit_backoff = float(app.config.get("ENTITIES_REINIT_BACKOFF", 10))
+        self.health_interval = float(app.config.get("ENTITIES_HEALTH_INTERVAL", 30))
+        self.health_path = app.config.get("ENTITIES_HEALTH_PATH", "/")
+        self.health_failures = int(app.config.get("ENTITIES_HEALTH_FAILURES", 3))
+        self.coalesced = {}
+        for spec in (app.config.get("ENTITIES_SINGLE_FLIGHT") or "").split(","):
+            if "." in spec:
+                sub_client, method = spec.strip().split(".", 1)
+                self.coalesced.setdefault(sub_client, set()).add(method)
+        app.extensions["entity_client"] = self
+
+    def lazy(self):
+        """The shared LazyEntity to assign to a blueprint's module-level `client`."""
+        return self._lazy
+
+    def get(self):
+        """Returns the Entity client, creating it if needed; raises ClientUnavailableError."""
+        entity = self._entity
+        if entity is None:
+            entity = self._create()
+        self._maybe_check_health()
+        return entity
+
+    def _create(self):
+        with self._lock:
+            if self._entity is not None:
+                return self._entity
+
+            now = time.monotonic()
+            if (
+                self._last_failure_at is not None
+                and now - self._last_failure_at < self.reinit_backoff
+            ):
+                raise ClientUnavailableError(self._last_error)
+
+            try:
+                transport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                        keepalive_expiry=self.keepalive_expiry,
+                    )
+                )
+                entity = _PooledEntity(
+                    transport,
+                    flight=self.single_flight,
+                    coalesced=self.coalesced,
+                    api_key=os.environ.get("ENTITIES_API_KEY"),
+                    base_url=self.base_url,
+                )
+            except Exception as e:
+                self._init_failures += 1
+                self._last_failure_at = now
+                self._last_error = (
+                    f"Failed to initialize ProjectDavid Entity client: {e}"
+                )
+                logging_utility.error(self._last_error)
+                raise ClientUnavailableError(self._last_error)
+
+            self._health_client = httpx.Client(
+                base_url=entity.base_url, transport=transport, timeout=5.0
+            )
+            self._inits += 1
+            self._last_failure_at = None
+            self._last_error = None
+            self._entity = entity
+            return entity
+
+    def reset(self):
+        """
+        Drops the current client so the next get() builds a fresh one, then
+        closes the old pool. Requests still in flight on it fail and may be
+        retried; after a failed health check they are unlikely to succeed.
+        """
+        with self._lock:
+            old = self._entity
+            if old is not None:
+                self._reinits += 1
+            self._entity = None
+            self._health_client = None
+            self._consecutive_failures = 0
+        if old is not None:
+            try:
+                old._transport.close()
+            except Exception as e:
+                logging_utility.warning(f"Closing the old Entity pool failed: {e}")
+
+    # ─────────────────────────────────────────────────────────────
+    # Health checks
+    # ─────────────────────────────────────────────────────────────
+    def _maybe_check_health(self):
+        if self.health_interval <= 0 or self._checking:
+            return
+        if time.monotonic() - self._last_check_at < self.health_interval:
+            return
+        with self._lock:
+            if self._checking:
+                return
+            self._checking = True
+        threading.Thread(
+            target=self.check_health, name="entity-health", daemon=True
+        ).start()
+
+    def check_health(self):
+        """
+        Probes the API through the shared pool. Any HTTP response counts as
+        healthy; connection errors and timeouts don't.
+        """
+        try:
+            health_client = self._health_client
+            if health_client is None:
+                return None
+            try:
+                health_client.get(self.health_path)
+                healthy = True
+            except httpx.TransportError as e:
+                healthy = False
+                self._last_error = f"Health check failed: {e}"
+                logging_utility.warning(self._last_error)
+
+            self._healthy = healthy
+            self._consecutive_failures = (
+                0 if healthy else self._consecutive_failures + 1
+            )
+            if self._consecutive_failures >= self.health_failures:
+                logging_utility.warning(
+                    "Entity API unhealthy; re-initialising the shared client."
+                )
+                self.reset()
+            return healthy
+        finally:
+            self._last_check_at = time.monotonic()
+            self._checking = False
+
+    def stats(self):
+        return {
+            "initialized": self._entity is not None,
+            "healthy": self._healthy,
+            "consecutive_health_failures": self._consecutive_failures,
+            "inits": self._inits,
+            "init_failures": self._init_failures,
+            "reinits": self._reinits,
+            "last_error": self._last_error,
+            "single_flight": self.single_flight.stats(),
+            "pool": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive,
+                "keepalive_expiry": self.keepalive_expiry,
+            },
+        }
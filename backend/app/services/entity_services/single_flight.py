@@ -0,0 +1,102 @@
+# backend/app/services/entity_services/single_flight.py
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and get the same result (or exception).
+    Nothing is kept once the call returns, so this deduplicates in-flight
+    work only; it is not a cache. Callers share the result object and must
+    not mutate it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+            }
+
+
+def coalesce_client(sub_client, name, methods, flight):
+    """
+    Routes `methods` of an SDK sub-client through `flight`, keyed by
+    (name, method, arguments). Any other public method counts as a write:
+    calling it starts a new generation, so reads issued after a write never
+    join a flight that started before it.
+    """
+    generation = [0]
+
+    def read(method_name, method):
+        @functools.wraps(method)
+        def coalesced(*args, **kwargs):
+            try:
+                key = (
+                    name,
+                    method_name,
+                    generation[0],
+                    args,
+                    frozenset(kwargs.items()),
+                )
+                hash(key)
+            except TypeError:  # unhashable arguments: just call through
+                return method(*args, **kwargs)
+            return flight.do(key, method, *args, **kwargs)
+
+        return coalesced
+
+    def write(method):
+        @functools.wraps(method)
+        def bumping(*args, **kwargs):
+            generation[0] += 1
+            return method(*args, **kwargs)
+
+        return bumping
+
+    for attr in dir(type(sub_client)):
+        if attr.startswith("_"):
+            continue
+        method = getattr(sub_client, attr, None)
+        if not inspect.ismethod(method):
+            continue
+        if attr in methods:
+            setattr(sub_client, attr, read(attr, method))
+        else:
+            setattr(sub_client, attr, write(method))
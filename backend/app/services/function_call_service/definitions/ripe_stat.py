@@ -535,4 +535,21 @@ ripe_stats_functions = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "getNetworkProfile",
+            "description": "Retrieves a combined profile of an AS number or prefix in one call: whois, routing status and visibility, announced prefixes and neighbours (for an ASN), RPKI validation and abuse contacts. Prefer this over several separate calls when asked to describe a network",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "resource": {
+                        "type": "string",
+                        "description": "The AS number (e.g., 'AS3333') or IP prefix (e.g., '193.0.0.0/21')",
+                    }
+                },
+                "required": ["resource"],
+            },
+        },
+    },
 ]
@@ -72,6 +72,7 @@ class FunctionCallService:
             "getWhatsMyIp": self.ripe_stat_handler.handle_get_whats_my_ip,
             "getZonemasterOverview": self.ripe_stat_handler.handle_get_zonemaster_overview,
             "getZonemasterDetails": self.ripe_stat_handler.handle_get_zonemaster_details,
+            "getNetworkProfile": self.ripe_stat_handler.handle_get_network_profile,
             "get_flight_times": self.handle_get_get_flight_times,
             # User Services
             # "getUserDetailsByFauxIdentity": self.user_details_handler.handle_get_user_details_by_faux_identity,
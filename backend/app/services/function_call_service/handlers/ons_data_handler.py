@@ -2,9 +2,24 @@ import requests
 
 from backend.app.services.api_service_external.api_public_access.api_uk_statistics.ons.api_uk_ons import \
     OnsApiService
+from backend.app.services.function_call_service.handlers.text_report import \
+    TextReport
 from backend.app.services.logging_service.logger import LoggingUtility
 
 
+def _record_lines(record):
+    for key, value in record.items():
+        yield f"{key}: {value}"
+    yield "---"
+
+
+def _records_report(title, records):
+    """ONS records as "key: value" blocks, each closed by "---"."""
+    report = TextReport(title)
+    report.rows(records, _record_lines, noun="records")
+    return report.render(end=None)
+
+
 class OnsDataHandler:
     def __init__(self):
         self.ons_api_service = OnsApiService()
@@ -17,13 +32,19 @@ class OnsDataHandler:
         dataset_data = self.ons_api_service.get_dataset_data(limit, offset)
         if dataset_data:
             dataset_items = dataset_data.get("items", [])
-            response = "Available ONS Datasets:\n\n"
-            for item in dataset_items:
-                response += f"Dataset ID: {item.get('id')}\n"
-                response += f"Dataset Title: {item.get('title')}\n"
-                response += f"Dataset Description: {item.get('description')}\n"
-                response += f"Dataset URL: {item.get('links', {}).get('latest_version', {}).get('href')}\n"
-                response += "---\n"
+            report = TextReport("Available ONS Datasets")
+            report.rows(
+                dataset_items,
+                lambda item: [
+                    f"Dataset ID: {item.get('id')}",
+                    f"Dataset Title: {item.get('title')}",
+                    f"Dataset Description: {item.get('description')}",
+                    f"Dataset URL: {item.get('links', {}).get('latest_version', {}).get('href')}",
+                    "---",
+                ],
+                noun="datasets",
+            )
+            response = report.render(end=None)
         else:
             self.logging_utility.warning("Failed to retrieve ONS dataset data")
             response = "Failed to retrieve dataset data."
@@ -57,11 +78,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         uk_business_data = self.ons_api_service.get_uk_business_data(dimensions)
         if uk_business_data:
-            response = "UK Business Data:\n\n"
-            for item in uk_business_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("UK Business Data", uk_business_data)
         else:
             self.logging_utility.warning("Failed to retrieve UK business data")
             response = "Failed to retrieve UK business data."
@@ -72,11 +89,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         wellbeing_data = self.ons_api_service.get_wellbeing_quarterly_data(dimensions)
         if wellbeing_data:
-            response = "Wellbeing Quarterly Data:\n\n"
-            for item in wellbeing_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Wellbeing Quarterly Data", wellbeing_data)
         else:
             self.logging_utility.warning("Failed to retrieve wellbeing quarterly data")
             response = "Failed to retrieve wellbeing quarterly data."
@@ -89,11 +102,9 @@ class OnsDataHandler:
             dimensions
         )
         if wellbeing_data:
-            response = "Wellbeing by Local Authority Data:\n\n"
-            for item in wellbeing_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report(
+                "Wellbeing by Local Authority Data", wellbeing_data
+            )
         else:
             self.logging_utility.warning(
                 "Failed to retrieve wellbeing by local authority data"
@@ -106,11 +117,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         deaths_data = self.ons_api_service.get_weekly_deaths_age_sex_data(dimensions)
         if deaths_data:
-            response = "Weekly Deaths by Age and Sex Data:\n\n"
-            for item in deaths_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Weekly Deaths by Age and Sex Data", deaths_data)
         else:
             self.logging_utility.warning(
                 "Failed to retrieve weekly deaths by age and sex data"
@@ -125,11 +132,9 @@ class OnsDataHandler:
             self.ons_api_service.get_sexual_orientation_by_age_and_sex_data(dimensions)
         )
         if orientation_data:
-            response = "Sexual Orientation by Age and Sex Data:\n\n"
-            for item in orientation_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report(
+                "Sexual Orientation by Age and Sex Data", orientation_data
+            )
         else:
             self.logging_utility.warning(
                 "Failed to retrieve sexual orientation by age and sex data"
@@ -142,11 +147,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         spending_data = self.ons_api_service.get_uk_spending_on_cards_data(dimensions)
         if spending_data:
-            response = "UK Spending on Cards Data:\n\n"
-            for item in spending_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("UK Spending on Cards Data", spending_data)
         else:
             self.logging_utility.warning("Failed to retrieve UK spending on cards data")
             response = "Failed to retrieve UK spending on cards data."
@@ -157,11 +158,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         trade_data = self.ons_api_service.get_trade_data(dimensions)
         if trade_data:
-            response = "Trade Data:\n\n"
-            for item in trade_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Trade Data", trade_data)
         else:
             self.logging_utility.warning("Failed to retrieve trade data")
             response = "Failed to retrieve trade data."
@@ -174,11 +171,9 @@ class OnsDataHandler:
             dimensions
         )
         if tax_benefits_data:
-            response = "Tax Benefits Statistics Data:\n\n"
-            for item in tax_benefits_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report(
+                "Tax Benefits Statistics Data", tax_benefits_data
+            )
         else:
             self.logging_utility.warning(
                 "Failed to retrieve tax benefits statistics data"
@@ -191,11 +186,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         deaths_data = self.ons_api_service.get_weekly_deaths_region_data(dimensions)
         if deaths_data:
-            response = "Weekly Deaths by Region Data:\n\n"
-            for item in deaths_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Weekly Deaths by Region Data", deaths_data)
         else:
             self.logging_utility.warning(
                 "Failed to retrieve weekly deaths by region data"
@@ -210,11 +201,7 @@ class OnsDataHandler:
             dimensions
         )
         if sales_data:
-            response = "Retail Sales All Businesses Data:\n\n"
-            for item in sales_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Retail Sales All Businesses Data", sales_data)
         else:
             self.logging_utility.warning(
                 "Failed to retrieve retail sales all businesses data"
@@ -227,11 +214,7 @@ class OnsDataHandler:
         dimensions = arguments.get("dimensions", None)
         gdp_data = self.ons_api_service.get_regional_gdp_by_year_data(dimensions)
         if gdp_data:
-            response = "Regional GDP by Year Data:\n\n"
-            for item in gdp_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report("Regional GDP by Year Data", gdp_data)
         else:
             self.logging_utility.warning("Failed to retrieve regional GDP by year data")
             response = "Failed to retrieve regional GDP by year data."
@@ -244,11 +227,9 @@ class OnsDataHandler:
             dimensions
         )
         if deaths_data:
-            response = "Weekly Deaths by Local Authority Data:\n\n"
-            for item in deaths_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report(
+                "Weekly Deaths by Local Authority Data", deaths_data
+            )
         else:
             self.logging_utility.warning(
                 "Failed to retrieve weekly deaths by local authority data"
@@ -265,11 +246,9 @@ class OnsDataHandler:
             )
         )
         if sex_ratios_data:
-            response = "Projections Older People Sex Ratios Data:\n\n"
-            for item in sex_ratios_data:
-                for key, value in item.items():
-                    response += f"{key}: {value}\n"
-                response += "---\n"
+            response = _records_report(
+                "Projections Older People Sex Ratios Data", sex_ratios_data
+            )
         else:
             self.logging_utility.warning(
                 "Failed to retrieve projections older people sex ratios data"
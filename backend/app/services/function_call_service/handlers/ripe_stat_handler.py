@@ -1,9 +1,29 @@
-from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.api_ripe_stat_service import \
-    RipeStatService
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.api_ripe_stat_service import (
+    AsyncRipeStatService, RipeStatService)
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.network_profile import \
+    build_network_profile
+from backend.app.services.function_call_service.handlers.text_report import (
+    TextReport, limited)
 from backend.app.services.logging_service.logger import LoggingUtility
 
 
+def _timeline(indent):
+    def render(timeline):
+        return f"{indent}Start: {timeline.get('starttime', '')}, End: {timeline.get('endtime', '')}"
+
+    return render
+
+
+def _item(value):
+    return f"- {value}"
+
+
 class RipeStatHandler:
+    # RipeStatCache already caches each data call for as long as
+    # ripe_stat_cache.TTL_POLICY allows (30 s for looking-glass); ToolBackend
+    # must not keep the rendered reports any longer.
+    cache_results = False
+
     def __init__(self):
         self.ripe_stat_service = RipeStatService()
         self.logging_utility = LoggingUtility()
@@ -13,13 +33,14 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         abuse_contacts_data = self.ripe_stat_service.get_abuse_contact(resource)
         if abuse_contacts_data:
-            response = "Abuse Contacts:\n\n"
+            report = TextReport("Abuse Contacts")
             abuse_contacts = abuse_contacts_data.get("data", {}).get(
                 "abuse_contacts", []
             )
-            for contact in abuse_contacts:
-                response += f"Contact: {contact}\n"
-            response += "---\n"
+            report.rows(
+                abuse_contacts, lambda contact: f"Contact: {contact}", noun="contacts"
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve abuse contacts")
             response = "Failed to retrieve abuse contacts."
@@ -30,20 +51,22 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         hierarchy_data = self.ripe_stat_service.get_address_space_hierarchy(resource)
         if hierarchy_data:
-            response = "Address Space Hierarchy:\n\n"
+            report = TextReport("Address Space Hierarchy")
             exact_matches = hierarchy_data.get("data", {}).get("exact", [])
             less_specific = hierarchy_data.get("data", {}).get("less_specific", [])
             more_specific = hierarchy_data.get("data", {}).get("more_specific", [])
-            response += "Exact Matches:\n"
-            for match in exact_matches:
-                response += f"- {match.get('inetnum')}\n"
-            response += "\nLess Specific:\n"
-            for match in less_specific:
-                response += f"- {match.get('inetnum')}\n"
-            response += "\nMore Specific:\n"
-            for match in more_specific:
-                response += f"- {match.get('inetnum')}\n"
-            response += "---\n"
+            for heading, matches in (
+                ("Exact Matches", exact_matches),
+                ("Less Specific", less_specific),
+                ("More Specific", more_specific),
+            ):
+                if heading != "Exact Matches":
+                    report.line()
+                report.line(f"{heading}:")
+                report.rows(
+                    matches, lambda match: f"- {match.get('inetnum')}", noun="ranges"
+                )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve address space hierarchy")
             response = "Failed to retrieve address space hierarchy."
@@ -57,20 +80,29 @@ class RipeStatHandler:
             resource, all_level_more_specifics
         )
         if usage_data:
-            response = "Address Space Usage:\n\n"
+            report = TextReport("Address Space Usage")
             allocations = usage_data.get("data", {}).get("allocations", [])
             assignments = usage_data.get("data", {}).get("assignments", [])
             ip_stats = usage_data.get("data", {}).get("ip_stats", [])
-            response += "Allocations:\n"
-            for allocation in allocations:
-                response += f"- {allocation.get('allocation')}: {allocation.get('asn_name')} (Status: {allocation.get('status')}, Assignments: {allocation.get('assignments')})\n"
-            response += "\nAssignments:\n"
-            for assignment in assignments:
-                response += f"- {assignment.get('address_range')}: {assignment.get('asn_name')} (Status: {assignment.get('status')}, Parent Allocation: {assignment.get('parent_allocation')})\n"
-            response += "\nIP Stats:\n"
-            for stat in ip_stats:
-                response += f"- {stat.get('status')}: {stat.get('ips')} IPs\n"
-            response += "---\n"
+            report.line("Allocations:")
+            report.rows(
+                allocations,
+                lambda allocation: f"- {allocation.get('allocation')}: {allocation.get('asn_name')} (Status: {allocation.get('status')}, Assignments: {allocation.get('assignments')})",
+                noun="allocations",
+            )
+            report.lines(["", "Assignments:"])
+            report.rows(
+                assignments,
+                lambda assignment: f"- {assignment.get('address_range')}: {assignment.get('asn_name')} (Status: {assignment.get('status')}, Parent Allocation: {assignment.get('parent_allocation')})",
+                noun="assignments",
+            )
+            report.lines(["", "IP Stats:"])
+            report.rows(
+                ip_stats,
+                lambda stat: f"- {stat.get('status')}: {stat.get('ips')} IPs",
+                noun="stats",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve address space usage")
             response = "Failed to retrieve address space usage."
@@ -86,19 +118,20 @@ class RipeStatHandler:
             resource, starttime, endtime, min_peers_seeing
         )
         if prefixes_data:
-            response = "Announced Prefixes:\n\n"
+            report = TextReport("Announced Prefixes")
             prefixes = prefixes_data.get("data", {}).get("prefixes", [])
-            for prefix_data in prefixes:
-                prefix = prefix_data.get("prefix", "")
-                timelines = prefix_data.get("timelines", [])
-                response += f"Prefix: {prefix}\n"
-                response += "Timelines:\n"
-                for timeline in timelines:
-                    starttime = timeline.get("starttime", "")
-                    endtime = timeline.get("endtime", "")
-                    response += f"- Start: {starttime}, End: {endtime}\n"
-                response += "\n"
-            response += "---\n"
+            timeline = _timeline("- ")
+
+            def prefix_lines(prefix_data):
+                yield f"Prefix: {prefix_data.get('prefix', '')}"
+                yield "Timelines:"
+                yield from limited(
+                    prefix_data.get("timelines", []), timeline, noun="timelines"
+                )
+                yield ""
+
+            report.rows(prefixes, prefix_lines, noun="prefixes")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve announced prefixes")
             response = "Failed to retrieve announced prefixes."
@@ -113,23 +146,26 @@ class RipeStatHandler:
             resource, starttime, endtime
         )
         if allocation_data:
-            response = "Allocation History:\n\n"
+            report = TextReport("Allocation History")
             results = allocation_data.get("data", {}).get("results", {})
+            timeline = _timeline("  - ")
+
+            def allocation_lines(allocation):
+                yield f"- Resource: {allocation.get('resource', '')}"
+                yield f"  Status: {allocation.get('status', '')}"
+                yield "  Timelines:"
+                yield from limited(
+                    allocation.get("timelines", []),
+                    timeline,
+                    noun="timelines",
+                    indent="  ",
+                )
+
             for rir, allocations in results.items():
-                response += f"{rir}:\n"
-                for allocation in allocations:
-                    resource = allocation.get("resource", "")
-                    status = allocation.get("status", "")
-                    timelines = allocation.get("timelines", [])
-                    response += (
-                        f"- Resource: {resource}\n  Status: {status}\n  Timelines:\n"
-                    )
-                    for timeline in timelines:
-                        starttime = timeline.get("starttime", "")
-                        endtime = timeline.get("endtime", "")
-                        response += f"  - Start: {starttime}, End: {endtime}\n"
-                response += "\n"
-            response += "---\n"
+                report.line(f"{rir}:")
+                report.rows(allocations, allocation_lines, noun="allocations")
+                report.line()
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve allocation history")
             response = "Failed to retrieve allocation history."
@@ -141,20 +177,21 @@ class RipeStatHandler:
         starttime = arguments.get("starttime", None)
         neighbours_data = self.ripe_stat_service.get_asn_neighbours(resource, starttime)
         if neighbours_data:
-            response = "ASN Neighbours:\n\n"
+            report = TextReport("ASN Neighbours")
             neighbour_counts = neighbours_data.get("data", {}).get(
                 "neighbour_counts", {}
             )
             neighbours = neighbours_data.get("data", {}).get("neighbours", [])
-            response += f"Neighbour Counts: Left: {neighbour_counts.get('left', 0)}, Right: {neighbour_counts.get('right', 0)}, Uncertain: {neighbour_counts.get('uncertain', 0)}, Unique: {neighbour_counts.get('unique', 0)}\n\n"
-            for neighbour in neighbours:
-                asn = neighbour.get("asn", "")
-                neighbour_type = neighbour.get("type", "")
-                power = neighbour.get("power", "")
-                v4_peers = neighbour.get("v4_peers", "")
-                v6_peers = neighbour.get("v6_peers", "")
-                response += f"ASN: {asn}, Type: {neighbour_type}, Power: {power}, IPv4 Peers: {v4_peers}, IPv6 Peers: {v6_peers}\n"
-            response += "---\n"
+            report.line(
+                f"Neighbour Counts: Left: {neighbour_counts.get('left', 0)}, Right: {neighbour_counts.get('right', 0)}, Uncertain: {neighbour_counts.get('uncertain', 0)}, Unique: {neighbour_counts.get('unique', 0)}"
+            )
+            report.line()
+            report.rows(
+                neighbours,
+                lambda neighbour: f"ASN: {neighbour.get('asn', '')}, Type: {neighbour.get('type', '')}, Power: {neighbour.get('power', '')}, IPv4 Peers: {neighbour.get('v4_peers', '')}, IPv6 Peers: {neighbour.get('v6_peers', '')}",
+                noun="neighbours",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve ASN neighbours")
             response = "Failed to retrieve ASN neighbours."
@@ -165,18 +202,14 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         probes_data = self.ripe_stat_service.get_atlas_probes(resource)
         if probes_data:
-            response = "Atlas Probes:\n\n"
+            report = TextReport("Atlas Probes")
             probes = probes_data.get("data", {}).get("probes", [])
-            for probe in probes:
-                probe_id = probe.get("id", "")
-                status = probe.get("status_name", "")
-                address_v4 = probe.get("address_v4", "")
-                address_v6 = probe.get("address_v6", "")
-                asn_v4 = probe.get("asn_v4", "")
-                asn_v6 = probe.get("asn_v6", "")
-                country_code = probe.get("country_code", "")
-                response += f"Probe ID: {probe_id}, Status: {status}, IPv4: {address_v4}, IPv6: {address_v6}, ASN v4: {asn_v4}, ASN v6: {asn_v6}, Country: {country_code}\n"
-            response += "---\n"
+            report.rows(
+                probes,
+                lambda probe: f"Probe ID: {probe.get('id', '')}, Status: {probe.get('status_name', '')}, IPv4: {probe.get('address_v4', '')}, IPv6: {probe.get('address_v6', '')}, ASN v4: {probe.get('asn_v4', '')}, ASN v6: {probe.get('asn_v6', '')}, Country: {probe.get('country_code', '')}",
+                noun="probes",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve Atlas probes")
             response = "Failed to retrieve Atlas probes."
@@ -193,17 +226,15 @@ class RipeStatHandler:
             resource, starttime, endtime, rrcs, unix_timestamps
         )
         if updates_data:
-            response = "BGP Updates:\n\n"
+            report = TextReport("BGP Updates")
             updates = updates_data.get("data", {}).get("updates", [])
-            for update in updates:
-                update_type = update.get("type", "")
-                timestamp = update.get("timestamp", "")
-                target_prefix = update.get("attrs", {}).get("target_prefix", "")
-                path = update.get("attrs", {}).get("path", [])
-                community = update.get("attrs", {}).get("community", [])
-                source_id = update.get("attrs", {}).get("source_id", "")
-                response += f"Type: {update_type}, Timestamp: {timestamp}, Prefix: {target_prefix}, Path: {path}, Community: {community}, Source ID: {source_id}\n"
-            response += "---\n"
+
+            def update_line(update):
+                attrs = update.get("attrs", {})
+                return f"Type: {update.get('type', '')}, Timestamp: {update.get('timestamp', '')}, Prefix: {attrs.get('target_prefix', '')}, Path: {attrs.get('path', [])}, Community: {attrs.get('community', [])}, Source ID: {attrs.get('source_id', '')}"
+
+            report.rows(updates, update_line, noun="updates")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve BGP updates")
             response = "Failed to retrieve BGP updates."
@@ -219,18 +250,22 @@ class RipeStatHandler:
             resource, starttime, endtime, max_rows
         )
         if history_data:
-            response = "ASN Neighbours History:\n\n"
+            report = TextReport("ASN Neighbours History")
             neighbours = history_data.get("data", {}).get("neighbours", [])
-            for neighbour in neighbours:
-                asn = neighbour.get("neighbour", "")
-                timelines = neighbour.get("timelines", [])
-                response += f"ASN: {asn}\n"
-                for timeline in timelines:
-                    starttime = timeline.get("starttime", "")
-                    endtime = timeline.get("endtime", "")
-                    response += f"  Start: {starttime}, End: {endtime}\n"
-                response += "\n"
-            response += "---\n"
+            timeline = _timeline("  ")
+
+            def neighbour_lines(neighbour):
+                yield f"ASN: {neighbour.get('neighbour', '')}"
+                yield from limited(
+                    neighbour.get("timelines", []),
+                    timeline,
+                    noun="timelines",
+                    indent="  ",
+                )
+                yield ""
+
+            report.rows(neighbours, neighbour_lines, noun="neighbours")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve ASN neighbours history")
             response = "Failed to retrieve ASN neighbours history."
@@ -246,26 +281,22 @@ class RipeStatHandler:
             resource, starttime, endtime, resolution
         )
         if stats_data:
-            response = "Country Resource Stats:\n\n"
+            report = TextReport("Country Resource Stats")
             stats = stats_data.get("data", {}).get("stats", [])
-            for stat in stats:
-                asns_ris = stat.get("asns_ris", 0)
-                asns_stats = stat.get("asns_stats", 0)
-                v4_prefixes_ris = stat.get("v4_prefixes_ris", 0)
-                v4_prefixes_stats = stat.get("v4_prefixes_stats", 0)
-                v6_prefixes_ris = stat.get("v6_prefixes_ris", 0)
-                v6_prefixes_stats = stat.get("v6_prefixes_stats", 0)
-                timeline = stat.get("timeline", [])
-                response += f"ASNs RIS: {asns_ris}, ASNs Stats: {asns_stats}\n"
-                response += f"IPv4 Prefixes RIS: {v4_prefixes_ris}, IPv4 Prefixes Stats: {v4_prefixes_stats}\n"
-                response += f"IPv6 Prefixes RIS: {v6_prefixes_ris}, IPv6 Prefixes Stats: {v6_prefixes_stats}\n"
-                response += "Timeline:\n"
-                for item in timeline:
-                    starttime = item.get("starttime", "")
-                    endtime = item.get("endtime", "")
-                    response += f"  Start: {starttime}, End: {endtime}\n"
-                response += "\n"
-            response += "---\n"
+            timeline = _timeline("  ")
+
+            def stat_lines(stat):
+                yield f"ASNs RIS: {stat.get('asns_ris', 0)}, ASNs Stats: {stat.get('asns_stats', 0)}"
+                yield f"IPv4 Prefixes RIS: {stat.get('v4_prefixes_ris', 0)}, IPv4 Prefixes Stats: {stat.get('v4_prefixes_stats', 0)}"
+                yield f"IPv6 Prefixes RIS: {stat.get('v6_prefixes_ris', 0)}, IPv6 Prefixes Stats: {stat.get('v6_prefixes_stats', 0)}"
+                yield "Timeline:"
+                yield from limited(
+                    stat.get("timeline", []), timeline, noun="timelines", indent="  "
+                )
+                yield ""
+
+            report.rows(stats, stat_lines, noun="stats")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve country resource stats")
             response = "Failed to retrieve country resource stats."
@@ -283,26 +314,22 @@ class RipeStatHandler:
         )
 
         if resource_data:
-            response = "Country Resource List:\n\n"
+            report = TextReport("Country Resource List")
             resources = resource_data.get("data", {}).get("resources", {})
 
             asn_list = resources.get("asn", [])
             ipv4_list = resources.get("ipv4", [])
             ipv6_list = resources.get("ipv6", [])
+            report.line("ASNs:")
+            report.rows(asn_list, _item, noun="ASNs")
 
-            response += "ASNs:\n"
-            for asn in asn_list:
-                response += f"- {asn}\n"
-
-            response += "\nIPv4:\n"
-            for ipv4 in ipv4_list:
-                response += f"- {ipv4}\n"
+            report.lines(["", "IPv4:"])
+            report.rows(ipv4_list, _item, noun="IPv4 resources")
 
-            response += "\nIPv6:\n"
-            for ipv6 in ipv6_list:
-                response += f"- {ipv6}\n"
+            report.lines(["", "IPv6:"])
+            report.rows(ipv6_list, _item, noun="IPv6 resources")
 
-            response += "---\n"
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve country resource list")
             response = "Failed to retrieve country resource list."
@@ -314,26 +341,27 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         dns_data = self.ripe_stat_service.get_dns_chain(resource)
         if dns_data:
-            response = "DNS Chain:\n\n"
+            report = TextReport("DNS Chain")
             forward_nodes = dns_data.get("data", {}).get("forward_nodes", {})
             reverse_nodes = dns_data.get("data", {}).get("reverse_nodes", {})
             nameservers = dns_data.get("data", {}).get("nameservers", [])
             authoritative_nameservers = dns_data.get("data", {}).get(
                 "authoritative_nameservers", []
             )
-            response += "Forward Nodes:\n"
-            for hostname, ips in forward_nodes.items():
-                response += f"{hostname} -> {', '.join(ips)}\n"
-            response += "\nReverse Nodes:\n"
-            for ip, hostnames in reverse_nodes.items():
-                response += f"{ip} -> {', '.join(hostnames)}\n"
-            response += "\nNameservers:\n"
-            for nameserver in nameservers:
-                response += f"- {nameserver}\n"
-            response += "\nAuthoritative Nameservers:\n"
-            for auth_nameserver in authoritative_nameservers:
-                response += f"- {auth_nameserver}\n"
-            response += "---\n"
+
+            def node_line(node):
+                name, targets = node
+                return f"{name} -> {', '.join(targets)}"
+
+            report.line("Forward Nodes:")
+            report.rows(forward_nodes.items(), node_line, noun="hostnames")
+            report.lines(["", "Reverse Nodes:"])
+            report.rows(reverse_nodes.items(), node_line, noun="addresses")
+            report.lines(["", "Nameservers:"])
+            report.rows(nameservers, _item, noun="nameservers")
+            report.lines(["", "Authoritative Nameservers:"])
+            report.rows(authoritative_nameservers, _item, noun="nameservers")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve DNS chain")
             response = "Failed to retrieve DNS chain."
@@ -343,16 +371,17 @@ class RipeStatHandler:
         self.logging_utility.info("Retrieving example resources")
         example_data = self.ripe_stat_service.get_example_resources()
         if example_data:
-            response = "Example Resources:\n\n"
-            asn = example_data.get("data", {}).get("asn", "")
-            ipv4 = example_data.get("data", {}).get("ipv4", "")
-            ipv6 = example_data.get("data", {}).get("ipv6", "")
-            range4 = example_data.get("data", {}).get("range4", "")
-            response += f"ASN: {asn}\n"
-            response += f"IPv4: {ipv4}\n"
-            response += f"IPv6: {ipv6}\n"
-            response += f"IPv4 Range: {range4}\n"
-            response += "---\n"
+            report = TextReport("Example Resources")
+            data = example_data.get("data", {})
+            report.lines(
+                [
+                    f"ASN: {data.get('asn', '')}",
+                    f"IPv4: {data.get('ipv4', '')}",
+                    f"IPv6: {data.get('ipv6', '')}",
+                    f"IPv4 Range: {data.get('range4', '')}",
+                ]
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve example resources")
             response = "Failed to retrieve example resources."
@@ -364,18 +393,23 @@ class RipeStatHandler:
         version = arguments.get("version", None)
         whois_data = self.ripe_stat_service.get_historical_whois(resource, version)
         if whois_data:
-            response = "Historical Whois:\n\n"
+            report = TextReport("Historical Whois")
             objects = whois_data.get("data", {}).get("objects", [])
-            for obj in objects:
-                response += f"Object Type: {obj.get('type', '')}\n"
-                response += f"Object Key: {obj.get('key', '')}\n"
-                response += "Attributes:\n"
-                for attr in obj.get("attributes", []):
-                    response += (
-                        f"  {attr.get('attribute', '')}: {attr.get('value', '')}\n"
-                    )
-                response += "\n"
-            response += "---\n"
+
+            def object_lines(obj):
+                yield f"Object Type: {obj.get('type', '')}"
+                yield f"Object Key: {obj.get('key', '')}"
+                yield "Attributes:"
+                yield from limited(
+                    obj.get("attributes", []),
+                    lambda attr: f"  {attr.get('attribute', '')}: {attr.get('value', '')}",
+                    noun="attributes",
+                    indent="  ",
+                )
+                yield ""
+
+            report.rows(objects, object_lines, noun="objects")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve historical whois")
             response = "Failed to retrieve historical whois."
@@ -389,23 +423,21 @@ class RipeStatHandler:
             resource, best_match_only
         )
         if registry_data:
-            response = "IANA Registry Info:\n\n"
+            report = TextReport("IANA Registry Info")
             resources = registry_data.get("data", {}).get("resources", [])
-            for res in resources:
-                resource = res.get("resource", "")
-                description = res.get("description", "")
-                source_url = res.get("source_url", "")
-                source = res.get("source", "")
-                details = res.get("details", {})
-                response += f"Resource: {resource}\n"
-                response += f"Description: {description}\n"
-                response += f"Source URL: {source_url}\n"
-                response += f"Source: {source}\n"
-                response += "Details:\n"
-                for key, value in details.items():
-                    response += f"  {key}: {value}\n"
-                response += "\n"
-            response += "---\n"
+
+            def resource_lines(res):
+                yield f"Resource: {res.get('resource', '')}"
+                yield f"Description: {res.get('description', '')}"
+                yield f"Source URL: {res.get('source_url', '')}"
+                yield f"Source: {res.get('source', '')}"
+                yield "Details:"
+                for key, value in res.get("details", {}).items():
+                    yield f"  {key}: {value}"
+                yield ""
+
+            report.rows(resources, resource_lines, noun="resources")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve IANA registry info")
             response = "Failed to retrieve IANA registry info."
@@ -421,22 +453,31 @@ class RipeStatHandler:
             resource, starttime, endtime, min_peers
         )
         if history_data:
-            response = "Routing History:\n\n"
+            report = TextReport("Routing History")
             by_origin = history_data.get("data", {}).get("by_origin", [])
+            timeline = _timeline("  ")
+
+            def prefix_lines(prefix_data):
+                yield f"Prefix: {prefix_data.get('prefix', '')}"
+                yield from limited(
+                    prefix_data.get("timelines", []),
+                    timeline,
+                    noun="timelines",
+                    indent="  ",
+                )
+                yield ""
+
+            # The row budget is shared by every origin's prefixes.
+            remaining = report.max_rows
             for origin_data in by_origin:
-                origin = origin_data.get("origin", "")
-                prefixes = origin_data.get("prefixes", [])
-                response += f"Origin: {origin}\n"
-                for prefix_data in prefixes:
-                    prefix = prefix_data.get("prefix", "")
-                    timelines = prefix_data.get("timelines", [])
-                    response += f"Prefix: {prefix}\n"
-                    for timeline in timelines:
-                        starttime = timeline.get("starttime", "")
-                        endtime = timeline.get("endtime", "")
-                        response += f"  Start: {starttime}, End: {endtime}\n"
-                    response += "\n"
-            response += "---\n"
+                report.line(f"Origin: {origin_data.get('origin', '')}")
+                remaining -= report.rows(
+                    origin_data.get("prefixes", []),
+                    prefix_lines,
+                    limit=max(remaining, 0),
+                    noun="prefixes",
+                )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve routing history")
             response = "Failed to retrieve routing history."
@@ -451,36 +492,37 @@ class RipeStatHandler:
             resource, timestamp, min_peers_seeing
         )
         if status_data:
-            response = "Routing Status:\n\n"
+            report = TextReport("Routing Status")
             first_seen = status_data.get("data", {}).get("first_seen", {})
             last_seen = status_data.get("data", {}).get("last_seen", {})
             visibility = status_data.get("data", {}).get("visibility", {})
             announced_space = status_data.get("data", {}).get("announced_space", {})
-            response += "First Seen:\n"
-            response += f"  Time: {first_seen.get('time', '')}\n"
-            response += f"  Origin: {first_seen.get('origin', '')}\n"
-            response += f"  Prefix: {first_seen.get('prefix', '')}\n"
-            response += "\nLast Seen:\n"
-            response += f"  Time: {last_seen.get('time', '')}\n"
-            response += f"  Origin: {last_seen.get('origin', '')}\n"
-            response += f"  Prefix: {last_seen.get('prefix', '')}\n"
-            response += "\nVisibility:\n"
-            response += f"  IPv4 Peers Seeing: {visibility.get('v4', {}).get('ris_peers_seeing', 0)}\n"
-            response += f"  Total IPv4 Peers: {visibility.get('v4', {}).get('total_ris_peers', 0)}\n"
-            response += f"  IPv6 Peers Seeing: {visibility.get('v6', {}).get('ris_peers_seeing', 0)}\n"
-            response += f"  Total IPv6 Peers: {visibility.get('v6', {}).get('total_ris_peers', 0)}\n"
-            response += "\nAnnounced Space:\n"
-            response += (
-                f"  IPv4 Prefixes: {announced_space.get('v4', {}).get('prefixes', 0)}\n"
-            )
-            response += f"  IPv4 IPs: {announced_space.get('v4', {}).get('ips', 0)}\n"
-            response += (
-                f"  IPv6 Prefixes: {announced_space.get('v6', {}).get('prefixes', 0)}\n"
+            report.lines(
+                [
+                    "First Seen:",
+                    f"  Time: {first_seen.get('time', '')}",
+                    f"  Origin: {first_seen.get('origin', '')}",
+                    f"  Prefix: {first_seen.get('prefix', '')}",
+                    "",
+                    "Last Seen:",
+                    f"  Time: {last_seen.get('time', '')}",
+                    f"  Origin: {last_seen.get('origin', '')}",
+                    f"  Prefix: {last_seen.get('prefix', '')}",
+                    "",
+                    "Visibility:",
+                    f"  IPv4 Peers Seeing: {visibility.get('v4', {}).get('ris_peers_seeing', 0)}",
+                    f"  Total IPv4 Peers: {visibility.get('v4', {}).get('total_ris_peers', 0)}",
+                    f"  IPv6 Peers Seeing: {visibility.get('v6', {}).get('ris_peers_seeing', 0)}",
+                    f"  Total IPv6 Peers: {visibility.get('v6', {}).get('total_ris_peers', 0)}",
+                    "",
+                    "Announced Space:",
+                    f"  IPv4 Prefixes: {announced_space.get('v4', {}).get('prefixes', 0)}",
+                    f"  IPv4 IPs: {announced_space.get('v4', {}).get('ips', 0)}",
+                    f"  IPv6 Prefixes: {announced_space.get('v6', {}).get('prefixes', 0)}",
+                    f"  IPv6 /48s: {announced_space.get('v6', {}).get('slash_48s', 0)}",
+                ]
             )
-            response += (
-                f"  IPv6 /48s: {announced_space.get('v6', {}).get('slash_48s', 0)}\n"
-            )
-            response += "---\n"
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve routing status")
             response = "Failed to retrieve routing status."
@@ -490,27 +532,29 @@ class RipeStatHandler:
         self.logging_utility.info("Retrieving RRC info")
         rrc_data = self.ripe_stat_service.get_rrc_info()
         if rrc_data:
-            response = "RRC Info:\n\n"
+            report = TextReport("RRC Info")
             rrcs = rrc_data.get("data", {}).get("rrcs", [])
-            for rrc in rrcs:
-                rrc_id = rrc.get("id", "")
-                rrc_name = rrc.get("name", "")
-                location = rrc.get("location", "")
-                response += f"RRC: {rrc_id}\n"
-                response += f"  Name: {rrc_name}\n"
-                response += f"  Location: {location}\n"
-                response += "  Peers:\n"
-                for peer in rrc.get("peers", []):
-                    response += f"    ASN: {peer.get('asn', '')}\n"
-                    response += f"    IP: {peer.get('ip', '')}\n"
-                    response += (
-                        f"    IPv4 Prefix Count: {peer.get('v4_prefix_count', 0)}\n"
-                    )
-                    response += (
-                        f"    IPv6 Prefix Count: {peer.get('v6_prefix_count', 0)}\n"
-                    )
-                response += "\n"
-            response += "---\n"
+
+            def peer_lines(peer):
+                return [
+                    f"    ASN: {peer.get('asn', '')}",
+                    f"    IP: {peer.get('ip', '')}",
+                    f"    IPv4 Prefix Count: {peer.get('v4_prefix_count', 0)}",
+                    f"    IPv6 Prefix Count: {peer.get('v6_prefix_count', 0)}",
+                ]
+
+            def rrc_lines(rrc):
+                yield f"RRC: {rrc.get('id', '')}"
+                yield f"  Name: {rrc.get('name', '')}"
+                yield f"  Location: {rrc.get('location', '')}"
+                yield "  Peers:"
+                yield from limited(
+                    rrc.get("peers", []), peer_lines, noun="peers", indent="    "
+                )
+                yield ""
+
+            report.rows(rrcs, rrc_lines, noun="RRCs")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve RRC info")
             response = "Failed to retrieve RRC info."
@@ -524,22 +568,32 @@ class RipeStatHandler:
             resource, prefix
         )
         if validation_data:
-            response = "RPKI Validation Status:\n\n"
+            report = TextReport("RPKI Validation Status")
             status = validation_data.get("data", {}).get("status", "")
             validating_roas = validation_data.get("data", {}).get("validating_roas", [])
             prefix = validation_data.get("data", {}).get("prefix", "")
             resource = validation_data.get("data", {}).get("resource", "")
-            response += f"Status: {status}\n"
-            response += f"Prefix: {prefix}\n"
-            response += f"Resource: {resource}\n"
-            response += "Validating ROAs:\n"
-            for roa in validating_roas:
-                response += f"  Origin: {roa.get('origin', '')}\n"
-                response += f"  Prefix: {roa.get('prefix', '')}\n"
-                response += f"  Max Length: {roa.get('max_length', '')}\n"
-                response += f"  Validity: {roa.get('validity', '')}\n"
-                response += "\n"
-            response += "---\n"
+            report.lines(
+                [
+                    f"Status: {status}",
+                    f"Prefix: {prefix}",
+                    f"Resource: {resource}",
+                    "Validating ROAs:",
+                ]
+            )
+            report.rows(
+                validating_roas,
+                lambda roa: [
+                    f"  Origin: {roa.get('origin', '')}",
+                    f"  Prefix: {roa.get('prefix', '')}",
+                    f"  Max Length: {roa.get('max_length', '')}",
+                    f"  Validity: {roa.get('validity', '')}",
+                    "",
+                ],
+                noun="ROAs",
+                indent="  ",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve RPKI validation status")
             response = "Failed to retrieve RPKI validation status."
@@ -555,45 +609,33 @@ class RipeStatHandler:
             resource, family, resolution, delegated
         )
         if history_data:
-            response = "RPKI History:\n\n"
+            report = TextReport("RPKI History")
             timeseries = history_data.get("data", {}).get("timeseries", [])
-            for data_point in timeseries:
+
+            def data_point_lines(data_point):
                 resource = (
                     data_point.get("prefix", "")
                     or data_point.get("asn", "")
                     or data_point.get("cc", "")
                     or data_point.get("trust_anchor", "")
                 )
-                family = data_point.get("family", "")
-                vrp_count = data_point.get("rpki", {}).get("vrp_count", 0)
-                time = data_point.get("time", "")
-                response += f"Resource: {resource}\n"
-                response += f"Family: {family}\n"
-                response += f"VRP Count: {vrp_count}\n"
-                response += f"Time: {time}\n"
+                yield f"Resource: {resource}"
+                yield f"Family: {data_point.get('family', '')}"
+                yield f"VRP Count: {data_point.get('rpki', {}).get('vrp_count', 0)}"
+                yield f"Time: {data_point.get('time', '')}"
                 if delegated:
                     delegated_data = data_point.get("delegated", {})
-                    prefixes_count = delegated_data.get("prefixes", {}).get("count", 0)
-                    prefixes_covered_by_rpki = (
-                        delegated_data.get("prefixes", {})
-                        .get("covered_by_rpki", {})
-                        .get("count", 0)
-                    )
-                    space_count = delegated_data.get("space", {}).get("count", 0)
-                    space_covered_by_rpki = (
-                        delegated_data.get("space", {})
-                        .get("covered_by_rpki", {})
-                        .get("count", 0)
-                    )
-                    response += "Delegated Data:\n"
-                    response += f"  Prefixes Count: {prefixes_count}\n"
-                    response += (
-                        f"  Prefixes Covered by RPKI: {prefixes_covered_by_rpki}\n"
-                    )
-                    response += f"  Space Count: {space_count}\n"
-                    response += f"  Space Covered by RPKI: {space_covered_by_rpki}\n"
-                response += "\n"
-            response += "---\n"
+                    prefixes = delegated_data.get("prefixes", {})
+                    space = delegated_data.get("space", {})
+                    yield "Delegated Data:"
+                    yield f"  Prefixes Count: {prefixes.get('count', 0)}"
+                    yield f"  Prefixes Covered by RPKI: {prefixes.get('covered_by_rpki', {}).get('count', 0)}"
+                    yield f"  Space Count: {space.get('count', 0)}"
+                    yield f"  Space Covered by RPKI: {space.get('covered_by_rpki', {}).get('count', 0)}"
+                yield ""
+
+            report.rows(timeseries, data_point_lines, noun="data points")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve RPKI history")
             response = "Failed to retrieve RPKI history."
@@ -608,21 +650,18 @@ class RipeStatHandler:
         searchcomplete_data = ripe_stat_service.get_searchcomplete(resource, limit)
 
         if searchcomplete_data:
-            response = "Searchcomplete:\n\n"
+            report = TextReport("Searchcomplete")
             categories = searchcomplete_data.get("data", {}).get("categories", [])
 
-            for category in categories:
-                category_name = category.get("category", "")
-                suggestions = category.get("suggestions", [])
-                response += f"{category_name}:\n"
-                for suggestion in suggestions:
-                    label = suggestion.get("label", "")
-                    value = suggestion.get("value", "")
-                    response += f"  Label: {label}\n"
-                    response += f"  Value: {value}\n"
-                response += "\n"
-
-            response += "---\n"
+            def category_lines(category):
+                yield f"{category.get('category', '')}:"
+                for suggestion in category.get("suggestions", []):
+                    yield f"  Label: {suggestion.get('label', '')}"
+                    yield f"  Value: {suggestion.get('value', '')}"
+                yield ""
+
+            report.rows(categories, category_lines, noun="categories")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve searchcomplete")
             response = "Failed to retrieve searchcomplete."
@@ -634,20 +673,29 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         looking_glass_data = self.ripe_stat_service.get_looking_glass(resource)
         if looking_glass_data:
-            response = "Looking Glass Data:\n\n"
+            report = TextReport("Looking Glass Data")
             rrcs = looking_glass_data.get("data", {}).get("rrcs", [])
-            for rrc in rrcs:
-                response += f"RRC: {rrc.get('rrc', '')}\n"
-                response += f"Location: {rrc.get('location', '')}\n"
-                response += "Peers:\n"
-                for peer in rrc.get("peers", []):
-                    response += f"  - ASN: {peer.get('asn', '')}\n"
-                    response += f"    IP: {peer.get('ip', '')}\n"
-                    response += f"    Origin: {peer.get('origin', '')}\n"
-                    response += f"    Prefix: {peer.get('prefix', '')}\n"
-                    response += f"    Next Hop: {peer.get('next_hop', '')}\n"
-                    response += "\n"
-            response += "---\n"
+
+            def peer_lines(peer):
+                return [
+                    f"  - ASN: {peer.get('asn', '')}",
+                    f"    IP: {peer.get('ip', '')}",
+                    f"    Origin: {peer.get('origin', '')}",
+                    f"    Prefix: {peer.get('prefix', '')}",
+                    f"    Next Hop: {peer.get('next_hop', '')}",
+                    "",
+                ]
+
+            def rrc_lines(rrc):
+                yield f"RRC: {rrc.get('rrc', '')}"
+                yield f"Location: {rrc.get('location', '')}"
+                yield "Peers:"
+                yield from limited(
+                    rrc.get("peers", []), peer_lines, noun="peers", indent="  "
+                )
+
+            report.rows(rrcs, rrc_lines, noun="RRCs")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve Looking Glass data")
             response = "Failed to retrieve Looking Glass data."
@@ -657,10 +705,9 @@ class RipeStatHandler:
         self.logging_utility.info("Retrieving What's My IP information")
         whats_my_ip_data = self.ripe_stat_service.get_whats_my_ip()
         if whats_my_ip_data:
-            response = "What's My IP Data:\n\n"
-            ip = whats_my_ip_data.get("data", {}).get("ip", "")
-            response += f"IP Address: {ip}\n"
-            response += "---\n"
+            report = TextReport("What's My IP Data")
+            report.line(f"IP Address: {whats_my_ip_data.get('data', {}).get('ip', '')}")
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve What's My IP data")
             response = "Failed to retrieve What's My IP data."
@@ -671,14 +718,19 @@ class RipeStatHandler:
         resource = arguments.get("resource", None)
         zonemaster_overview_data = self.ripe_stat_service.get_zonemaster(resource)
         if zonemaster_overview_data:
-            response = "Zonemaster Overview Data:\n\n"
+            report = TextReport("Zonemaster Overview Data")
             result = zonemaster_overview_data.get("data", {}).get("result", [])
-            for item in result:
-                response += f"ID: {item.get('id', '')}\n"
-                response += f"Creation Time: {item.get('creation_time', '')}\n"
-                response += f"Overall Result: {item.get('overall_result', '')}\n"
-                response += "\n"
-            response += "---\n"
+            report.rows(
+                result,
+                lambda item: [
+                    f"ID: {item.get('id', '')}",
+                    f"Creation Time: {item.get('creation_time', '')}",
+                    f"Overall Result: {item.get('overall_result', '')}",
+                    "",
+                ],
+                noun="tests",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve Zonemaster overview data")
             response = "Failed to retrieve Zonemaster overview data."
@@ -692,17 +744,27 @@ class RipeStatHandler:
             resource, method
         )
         if zonemaster_details_data:
-            response = "Zonemaster Details Data:\n\n"
+            report = TextReport("Zonemaster Details Data")
             result = zonemaster_details_data.get("data", {}).get("result", {})
-            response += f"ID: {result.get('id', '')}\n"
-            response += f"Creation Time: {result.get('creation_time', '')}\n"
-            response += "Results:\n"
-            for item in result.get("results", []):
-                response += f"  - Module: {item.get('module', '')}\n"
-                response += f"    Level: {item.get('level', '')}\n"
-                response += f"    Message: {item.get('message', '')}\n"
-                response += "\n"
-            response += "---\n"
+            report.lines(
+                [
+                    f"ID: {result.get('id', '')}",
+                    f"Creation Time: {result.get('creation_time', '')}",
+                    "Results:",
+                ]
+            )
+            report.rows(
+                result.get("results", []),
+                lambda item: [
+                    f"  - Module: {item.get('module', '')}",
+                    f"    Level: {item.get('level', '')}",
+                    f"    Message: {item.get('message', '')}",
+                    "",
+                ],
+                noun="results",
+                indent="  ",
+            )
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve Zonemaster details data")
             response = "Failed to retrieve Zonemaster details data."
@@ -717,17 +779,23 @@ class RipeStatHandler:
             resource, starttime, endtime
         )
         if bandwidth_data:
-            response = "M-Lab Bandwidth Measurements:\n\n"
-            bandwidths = bandwidth_data.get("data", {}).get("bandwidths", [])
-            response += f"Bandwidths (Mbps):\n"
-            for bandwidth in bandwidths:
-                response += f"- {bandwidth}\n"
-            response += f"\nQuery Start Time: {bandwidth_data.get('data', {}).get('query_starttime', '')}\n"
-            response += f"Query End Time: {bandwidth_data.get('data', {}).get('query_endtime', '')}\n"
-            response += (
-                f"Resource: {bandwidth_data.get('data', {}).get('resource', '')}\n"
+            report = TextReport("M-Lab Bandwidth Measurements")
+            data = bandwidth_data.get("data", {})
+            report.line("Bandwidths (Mbps):")
+            report.rows(
+                data.get("bandwidths", []),
+                lambda bandwidth: f"- {bandwidth}",
+                noun="measurements",
             )
-            response += "---\n"
+            report.lines(
+                [
+                    "",
+                    f"Query Start Time: {data.get('query_starttime', '')}",
+                    f"Query End Time: {data.get('query_endtime', '')}",
+                    f"Resource: {data.get('resource', '')}",
+                ]
+            )
+            response = report.render()
         else:
             self.logging_utility.warning(
                 "Failed to retrieve M-Lab bandwidth measurements"
@@ -744,25 +812,117 @@ class RipeStatHandler:
             resource, starttime, endtime
         )
         if clients_data:
-            response = "M-Lab Client Information:\n\n"
-            clients = clients_data.get("data", {}).get("clients", {})
-            for ip, client_info in clients.items():
-                response += f"IP Address: {ip}\n"
-                response += f"  Number of Tests: {client_info.get('num_tests', 0)}\n"
-                response += f"  Country: {client_info.get('country', '')}\n"
-                response += f"  City: {client_info.get('city', '')}\n"
-                response += f"  Latitude: {client_info.get('latitude', 0)}\n"
-                response += f"  Longitude: {client_info.get('longitude', 0)}\n"
-                response += "\n"
-            response += f"Number of Clients: {clients_data.get('data', {}).get('nr_clients', 0)}\n"
-            response += f"Percentage Coverage: {clients_data.get('data', {}).get('perc_coverage', 0)}\n"
-            response += f"Query Start Time: {clients_data.get('data', {}).get('query_starttime', '')}\n"
-            response += f"Query End Time: {clients_data.get('data', {}).get('query_endtime', '')}\n"
-            response += (
-                f"Resource: {clients_data.get('data', {}).get('resource', '')}\n"
+            report = TextReport("M-Lab Client Information")
+            data = clients_data.get("data", {})
+
+            def client_lines(client):
+                ip, client_info = client
+                return [
+                    f"IP Address: {ip}",
+                    f"  Number of Tests: {client_info.get('num_tests', 0)}",
+                    f"  Country: {client_info.get('country', '')}",
+                    f"  City: {client_info.get('city', '')}",
+                    f"  Latitude: {client_info.get('latitude', 0)}",
+                    f"  Longitude: {client_info.get('longitude', 0)}",
+                    "",
+                ]
+
+            report.rows(data.get("clients", {}).items(), client_lines, noun="clients")
+            report.lines(
+                [
+                    f"Number of Clients: {data.get('nr_clients', 0)}",
+                    f"Percentage Coverage: {data.get('perc_coverage', 0)}",
+                    f"Query Start Time: {data.get('query_starttime', '')}",
+                    f"Query End Time: {data.get('query_endtime', '')}",
+                    f"Resource: {data.get('resource', '')}",
+                ]
             )
-            response += "---\n"
+            response = report.render()
         else:
             self.logging_utility.warning("Failed to retrieve M-Lab client information")
             response = "Failed to retrieve M-Lab client information."
         return response
+
+    def handle_get_network_profile(self, arguments):
+        self.logging_utility.info("Building network profile")
+        resource = arguments.get("resource", None)
+        if not resource:
+            return "Failed to build network profile: a resource is required."
+        client = self.ripe_stat_service.client
+        profile = client.run(
+            build_network_profile(AsyncRipeStatService(client), resource)
+        )
+        if profile["unavailable"] and not (
+            profile["whois"] or profile["routing"]["visibility"]
+        ):
+            self.logging_utility.warning("Failed to build network profile")
+            return "Failed to build network profile."
+
+        routing = profile["routing"]
+        visibility = routing["visibility"] or {}
+        announced_space = routing["announced_space"] or {}
+        report = TextReport()
+        report.lines([f"Network Profile: {profile['resource']}", ""])
+        if profile["whois"]:
+            report.line("Whois:")
+            report.lines(f"  {key}: {value}" for key, value in profile["whois"].items())
+            report.line()
+        report.line("Routing Status:")
+        for label, seen in (
+            ("First Seen", routing["first_seen"]),
+            ("Last Seen", routing["last_seen"]),
+        ):
+            seen = seen or {}
+            report.line(
+                f"  {label}: {seen.get('time', '')} (Origin: {seen.get('origin', '')}, Prefix: {seen.get('prefix', '')})"
+            )
+        for family in ("v4", "v6"):
+            seeing = visibility.get(family, {})
+            report.line(
+                f"  IP{family} Visibility: {seeing.get('ris_peers_seeing', 0)} of {seeing.get('total_ris_peers', 0)} RIS peers"
+            )
+        if announced_space:
+            report.line(
+                f"  Announced Space: {announced_space.get('v4', {}).get('prefixes', 0)} IPv4 prefixes"
+                f" ({announced_space.get('v4', {}).get('ips', 0)} IPs),"
+                f" {announced_space.get('v6', {}).get('prefixes', 0)} IPv6 prefixes"
+            )
+        if routing["origins"]:
+            report.line(
+                "  Origins: "
+                + ", ".join(f"AS{origin}" for origin in routing["origins"])
+            )
+        report.line()
+        if "announced_prefixes" in profile:
+            announced = profile["announced_prefixes"]
+            report.line(f"Announced Prefixes ({announced['count']}):")
+            report.lines(f"  - {prefix}" for prefix in announced["prefixes"])
+            if announced["count"] > len(announced["prefixes"]):
+                report.line(
+                    f"  ... and {announced['count'] - len(announced['prefixes'])} more"
+                )
+            report.line()
+        if "neighbours" in profile:
+            counts = profile["neighbours"]["counts"]
+            report.line(
+                f"Neighbours: Left: {counts.get('left', 0)}, Right: {counts.get('right', 0)},"
+                f" Uncertain: {counts.get('uncertain', 0)}, Unique: {counts.get('unique', 0)}"
+            )
+            report.lines(
+                f"  AS{n.get('asn', '')} ({n.get('type', '')}, Power: {n.get('power', '')})"
+                for n in profile["neighbours"]["top"]
+            )
+            report.line()
+        if profile["rpki"]:
+            report.line("RPKI Validation:")
+            report.lines(
+                f"  {r['prefix']} from {r['origin']}: {r['status'] or 'unavailable'}"
+                for r in profile["rpki"]
+            )
+            report.line()
+        report.line(
+            "Abuse Contacts: " + (", ".join(profile["abuse_contacts"]) or "none found")
+        )
+        if profile["unavailable"]:
+            report.line("Unavailable: " + ", ".join(profile["unavailable"]))
+        return report.render()
@@ -0,0 +1,99 @@
+import os
+
+# Caps on what one tool call hands back to the model. RIPEstat and ONS can
+# answer with tens of thousands of prefixes, updates or CSV rows.
+MAX_ROWS = int(os.environ.get("TOOL_REPORT_MAX_ROWS", 500))
+MAX_CHARS = int(os.environ.get("TOOL_REPORT_MAX_CHARS", 100_000))
+# Cap on a list nested inside one row (e.g. a prefix's timelines).
+MAX_NESTED_ROWS = int(os.environ.get("TOOL_REPORT_MAX_NESTED_ROWS", 50))
+
+
+def _more(remaining, noun, indent=""):
+    return f"{indent}... {remaining} more {noun} not shown"
+
+
+def limited(items, render, limit=None, noun="items", indent=""):
+    """
+    The line(s) render(item) returns for the first `limit` items (default
+    MAX_NESTED_ROWS), then one line counting the rest. For nested
+    lists inside a report row (a prefix's timelines, an RRC's peers).
+    """
+    limit = MAX_NESTED_ROWS if limit is None else limit
+    lines = []
+    iterator = iter(items)
+    for shown, item in enumerate(iterator):
+        if shown >= limit:
+            lines.append(_more(1 + sum(1 for _ in iterator), noun, indent))
+            break
+        out = render(item)
+        if isinstance(out, str):
+            lines.append(out)
+        else:
+            lines.extend(out)
+    return lines
+
+
+class TextReport:
+    """
+    Line-oriented builder for tool responses.
+
+    Lines are collected in a list and joined once in render(), so building
+    a report stays linear in its size without relying on CPython's
+    in-place `response += ...` optimisation (which any other reference to
+    the string defeats). rows() renders a (possibly lazy) sequence of
+    records, one or more lines each, and stops at a row limit or once the
+    report reaches `max_chars`; the records left out are summarised in a
+    single "... N more <noun> not shown" line, and `truncated` is set.
+
+    With a title, the report starts with "<title>:" and a blank line;
+    render() ends it with "---", the layout every handler already used.
+    """
+
+    def __init__(self, title=None, max_rows=None, max_chars=None):
+        self.max_rows = MAX_ROWS if max_rows is None else max_rows
+        self.max_chars = MAX_CHARS if max_chars is None else max_chars
+        self.truncated = False
+        self._lines = []
+        self._chars = 0
+        if title is not None:
+            self.line(f"{title}:")
+            self.line()
+
+    def line(self, text=""):
+        self._lines.append(text)
+        self._chars += len(text) + 1
+
+    def lines(self, texts):
+        for text in texts:
+            self.line(text)
+
+    def rows(self, items, render, limit=None, noun="rows", indent=""):
+        """
+        Appends render(item) (a line, or an iterable of lines) for each
+        item until `limit` (default max_rows) rows or the character budget
+        is reached. Returns the number of rows shown.
+        """
+        limit = self.max_rows if limit is None else min(limit, self.max_rows)
+        lines = self._lines
+        iterator = iter(items)
+        shown = 0
+        for item in iterator:
+            if shown >= limit or self._chars >= self.max_chars:
+                self.line(_more(1 + sum(1 for _ in iterator), noun, indent))
+                self.truncated = True
+                break
+            out = render(item)
+            if isinstance(out, str):
+                lines.append(out)
+                self._chars += len(out) + 1
+            else:
+                start = len(lines)
+                lines.extend(out)
+                self._chars += sum(map(len, lines[start:])) + len(lines) - start
+            shown += 1
+        return shown
+
+    def render(self, end="---"):
+        if end is not None:
+            self.line(end)
+        return "\n".join(self._lines) + "\n"
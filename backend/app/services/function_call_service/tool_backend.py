@@ -0,0 +1,170 @@
+# backend/app/services/function_call_service/tool_backend.py
+import bisect
+import json
+import threading
+import time
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.function_call_service.function_call_service import \
+    FunctionCallService
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+_MISSING = object()
+
+# The RIPE / ONS handlers report failures as plain strings rather than raising.
+_FAILURE_PREFIXES = ("Failed to", "Error")
+
+
+class UnsupportedToolError(Exception):
+    pass
+
+
+def _caches_results(handler):
+    owner = getattr(handler, "__self__", handler)
+    return getattr(owner, "cache_results", True)
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (milliseconds), Prometheus style."""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # last: +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.errors = 0
+
+    def observe(self, duration_ms, error=False):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        if error:
+            self.errors += 1
+
+    def snapshot(self):
+        buckets, running = {}, 0
+        for bound, n in zip(self.BUCKETS_MS, self.counts):
+            running += n
+            buckets[str(bound)] = running
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_ms": round(self.sum_ms, 3),
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "buckets_ms": buckets,
+        }
+
+
+class ToolBackend:
+    """
+    Registry-based tool executor for the streaming route.
+
+    Callable with the SDK's tool_executor signature (tool_name, arguments),
+    so it can be handed straight to ToolCallRequestEvent.execute(). Tool
+    names resolve through FunctionCallService.function_handlers (or any
+    name -> handler(arguments) mapping passed to init_app / register()).
+
+    - Per-tool latency histograms (cache hits included, so the numbers are
+      what the model actually waited); see stats().
+    - Results of successful calls (not the handlers' "Failed to ..." /
+      "Error ..." strings) are cached by (tool_name, arguments) for
+      TOOL_RESULT_CACHE_TTL seconds. The tools are read-only lookups; list
+      any that must always run in TOOL_RESULT_CACHE_EXCLUDE. Handlers
+      whose owner sets `cache_results = False` (RipeStatHandler, whose
+      responses RipeStatCache keeps fresh per data call) are never cached
+      here.
+    - Unknown tools raise UnsupportedToolError, which the SDK submits as the
+      tool output so the model can recover.
+
+    Config keys:
+        TOOL_RESULT_CACHE_TTL      seconds; 0 disables caching (default 300)
+        TOOL_RESULT_CACHE_SIZE     cached results, all tools (default 512)
+        TOOL_RESULT_CACHE_EXCLUDE  comma-separated tool names never cached
+    """
+
+    def __init__(self, app=None, handlers=None):
+        self.handlers = {}
+        self.cache = None
+        self.exclude = set()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app, handlers)
+
+    def init_app(self, app, handlers=None):
+        if handlers is None:
+            handlers = FunctionCallService().function_handlers
+        # Anything register()ed before init_app wins over the defaults.
+        self.handlers = dict(handlers, **self.handlers)
+
+        ttl = float(app.config.get("TOOL_RESULT_CACHE_TTL", 300))
+        size = int(app.config.get("TOOL_RESULT_CACHE_SIZE", 512))
+        self.cache = TTLCache(maxsize=size, ttl=ttl) if ttl > 0 else None
+        self.exclude = {
+            name.strip()
+            for name in (app.config.get("TOOL_RESULT_CACHE_EXCLUDE") or "").split(",")
+            if name.strip()
+        }
+        app.extensions["tool_backend"] = self
+
+    def register(self, tool_name, handler):
+        self.handlers[tool_name] = handler
+
+    def __call__(self, tool_name, arguments):
+        handler = self.handlers.get(tool_name)
+        if handler is None:
+            self._observe(tool_name, 0.0, error=True)
+            raise UnsupportedToolError(f"Unsupported function: {tool_name}")
+
+        start_time = time.perf_counter()
+        cache_key = None
+        if (
+            self.cache is not None
+            and tool_name not in self.exclude
+            and _caches_results(handler)
+        ):
+            cache_key = (tool_name, json.dumps(arguments or {}, sort_keys=True))
+            result = self.cache.get(cache_key, _MISSING)
+            if result is not _MISSING:
+                self._observe(tool_name, (time.perf_counter() - start_time) * 1000)
+                return result
+
+        try:
+            result = handler(arguments or {})
+        except Exception:
+            self._observe(
+                tool_name, (time.perf_counter() - start_time) * 1000, error=True
+            )
+            raise
+
+        self._observe(tool_name, (time.perf_counter() - start_time) * 1000)
+        if cache_key is not None and self._cacheable(result):
+            self.cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _cacheable(result):
+        if result is None:
+            return False
+        return not (isinstance(result, str) and result.startswith(_FAILURE_PREFIXES))
+
+    def _observe(self, tool_name, duration_ms, error=False):
+        with self._lock:
+            histogram = self._histograms.get(tool_name)
+            if histogram is None:
+                histogram = self._histograms[tool_name] = LatencyHistogram()
+            histogram.observe(duration_ms, error)
+
+    def stats(self):
+        with self._lock:
+            tools = {name: h.snapshot() for name, h in self._histograms.items()}
+        return {
+            "registered_tools": len(self.handlers),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "tools": tools,
+        }
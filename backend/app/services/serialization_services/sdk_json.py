@@ -0,0 +1,178 @@
+# backend/app/services/serialization_services/sdk_json.py
+import dataclasses
+import datetime
+import decimal
+import enum
+import json
+import threading
+import uuid
+
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+
+_NATIVE = (str, int, float, bool, type(None))
+
+# Left to Flask's DefaultJSONProvider (along with dataclasses), so the wire
+# format it gives them is unchanged: dates go out as RFC 822 strings.
+_PROVIDER_TYPES = (datetime.date, decimal.Decimal, uuid.UUID)
+
+# Attributes SDK list wrappers keep their items under, in probe order.
+_LIST_ATTRS = ("data", "items", "messages", "results")
+
+_MISSING = object()
+
+
+def _dump_model(model):
+    if hasattr(model, "model_dump"):  # pydantic 2
+        return model.model_dump(mode="json")
+    return json.loads(model.json())  # pydantic 1
+
+
+def _provider_type(obj):
+    return isinstance(obj, _PROVIDER_TYPES) or (
+        dataclasses.is_dataclass(obj) and not isinstance(obj, type)
+    )
+
+
+class SerializerRegistry:
+    """
+    Type -> converter map for turning SDK objects into JSON-ready data.
+
+    Converters are resolved along the MRO once per concrete class and
+    remembered, so the per-object cost is a dict lookup plus the conversion
+    itself. Likewise, which attribute a list wrapper (e.g. MessagesList)
+    keeps its items under is worked out once per class.
+    """
+
+    def __init__(self):
+        self._converters = {}
+        self._resolved = {}
+        self._list_attrs = {}
+        self._lock = threading.Lock()
+
+    def register(self, cls, converter):
+        """converter(obj) must return JSON-native data (dict/list/str/...)."""
+        with self._lock:
+            self._converters[cls] = converter
+            self._resolved.clear()
+
+    def register_list(self, cls, attr):
+        """Declares that instances of `cls` wrap a list under `attr`."""
+        with self._lock:
+            self._list_attrs[cls] = attr
+
+    def converter_for(self, cls):
+        converter = self._resolved.get(cls, _MISSING)
+        if converter is _MISSING:
+            converter = next(
+                (self._converters[k] for k in cls.__mro__ if k in self._converters),
+                None,
+            )
+            self._resolved[cls] = converter
+        return converter
+
+    def to_plain(self, obj):
+        """
+        Converts obj (and anything nested in lists / dicts) to JSON-native
+        data. Types the app's JSON provider handles itself (dates, Decimal,
+        UUID, dataclasses) are passed through for it to encode.
+        """
+        cls = obj.__class__
+        if cls in _NATIVE:
+            return obj
+        if cls is list or cls is tuple:
+            return [self.to_plain(v) for v in obj]
+        if cls is dict:
+            return {k: self.to_plain(v) for k, v in obj.items()}
+        converter = self.converter_for(cls)
+        if converter is None:
+            if _provider_type(obj):
+                return obj
+            raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+        return converter(obj)
+
+    def can_serialize(self, obj):
+        cls = obj.__class__
+        return (
+            cls in _NATIVE
+            or cls in (list, tuple, dict)
+            or self.converter_for(cls) is not None
+            or _provider_type(obj)
+        )
+
+    def _list_attr(self, obj):
+        cls = obj.__class__
+        attr = self._list_attrs.get(cls, _MISSING)
+        if attr is not _MISSING:
+            return attr
+        fields = getattr(cls, "model_fields", None)
+        if fields is None:
+            # Not a pydantic model: the attribute may vary per instance.
+            for name in _LIST_ATTRS:
+                if isinstance(getattr(obj, name, None), (list, tuple)):
+                    return name
+            return None
+        attr = next((name for name in _LIST_ATTRS if name in fields), None)
+        self._list_attrs[cls] = attr
+        return attr
+
+    def list_items(self, obj):
+        """The items of a list or SDK list wrapper, or None if obj isn't one."""
+        cls = obj.__class__
+        if cls is list or cls is tuple:
+            return obj
+        if cls in _NATIVE or cls is dict:
+            return None
+        attr = self._list_attr(obj)
+        if attr is None:
+            return None
+        seq = getattr(obj, attr, None)
+        return seq if isinstance(seq, (list, tuple)) else None
+
+    def count(self, obj):
+        """len() of a list / list wrapper / sized object, without iterating it."""
+        items = self.list_items(obj)
+        if items is not None:
+            return len(items)
+        try:
+            return len(obj)
+        except TypeError:
+            return None
+
+
+sdk_serializers = SerializerRegistry()
+sdk_serializers.register(BaseModel, _dump_model)
+sdk_serializers.register(enum.Enum, lambda e: e.value)
+sdk_serializers.register(set, list)
+sdk_serializers.register(frozenset, list)
+
+
+class SDKJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes SDK types through sdk_serializers,
+    so jsonify() can take Pydantic models (and lists of them) directly.
+    Everything else, stdlib dates included, gets the default encoding.
+    """
+
+    registry = sdk_serializers
+
+    def default(self, o):
+        converter = self.registry.converter_for(o.__class__)
+        if converter is not None:
+            return converter(o)
+        return DefaultJSONProvider.default(o)
+
+
+def stream_json_list(key, items, dumps, extra=None, chunk_size=100):
+    """
+    Yields `{"<key>": [...], **extra}` in pieces of `chunk_size` items, so a
+    large list is never rendered into one string.
+    """
+    yield "{" + json.dumps(key) + ": ["
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start : start + chunk_size]
+        yield ("," if start else "") + dumps(chunk)[1:-1]
+    yield "]"
+    for name, value in (extra or {}).items():
+        yield ", " + json.dumps(name) + ": " + dumps(value)
+    yield "}\n"
@@ -0,0 +1,207 @@
+# backend/app/services/streaming_services/event_encoder.py
+import json
+import os
+from json.encoder import encode_basestring_ascii
+
+from projectdavid import (CodeExecutionGeneratedFileEvent,
+                          CodeExecutionOutputEvent,
+                          ComputerExecutionOutputEvent, ContentEvent,
+                          HotCodeEvent, ReasoningEvent, WebStatusEvent)
+from projectdavid.events import (CodeStatusEvent, ResearchStatusEvent,
+                                 ScratchpadEvent)
+
+try:
+    import orjson
+except ImportError:  # optional backend
+    orjson = None
+
+
+def _json_value(value):
+    # Byte-identical to what json.dumps() emits for the same value.
+    if value.__class__ is str:
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+
+def _orjson_value(value):
+    return orjson.dumps(value).decode("utf-8")
+
+
+class EventTemplate:
+    """
+    Pre-serialized NDJSON line for one event type.
+
+    Everything that does not change between events (braces, keys, the "type"
+    discriminator) is rendered once; per event only the variable field values
+    are escaped and joined in between.
+
+    fields: list of (key, source) where source is either an attribute name
+    or a callable (event, run_id) -> value.
+    """
+
+    __slots__ = ("type_name", "_fields", "_tail")
+
+    def __init__(self, type_name, fields):
+        self.type_name = type_name
+        compiled = []
+
+        prefix = '{"type": ' + encode_basestring_ascii(type_name)
+        for key, source in fields:
+            part = prefix + ", " + encode_basestring_ascii(key) + ": "
+            if callable(source):
+                compiled.append((part, None, source))
+            else:
+                compiled.append((part, source, None))
+            prefix = ""
+
+        self._fields = tuple(compiled)
+        self._tail = prefix + "}\n"
+
+    def render(self, event, run_id, escape):
+        line = ""
+        for part, attr, getter in self._fields:
+            value = getattr(event, attr) if getter is None else getter(event, run_id)
+            line += part + escape(value)
+        return line + self._tail
+
+
+class EventEncoder:
+    """
+    Encodes SDK stream events into NDJSON lines via per-type templates.
+
+    Lookup is by exact event class first; subclasses of a registered class
+    resolve to the nearest registered base and are cached.
+
+    backend:
+        "json"   — stdlib escaping; output is byte-identical to
+                   json.dumps({...}) + "\\n" (the previous wire format).
+        "orjson" — orjson escaping (UTF-8, no \\u escapes). Falls back to
+                   "json" if orjson is not installed.
+    """
+
+    def __init__(self, backend="json"):
+        if backend == "orjson" and orjson is not None:
+            self.backend = "orjson"
+            self._escape = _orjson_value
+        else:
+            self.backend = "json"
+            self._escape = _json_value
+        self._templates = {}
+        self._resolved = {}
+
+    def register(self, event_cls, type_name, fields):
+        self._templates[event_cls] = EventTemplate(type_name, fields)
+        self._resolved.clear()
+        return self
+
+    def template_for(self, event_cls):
+        try:
+            return self._resolved[event_cls]
+        except KeyError:
+            pass
+
+        template = None
+        for base in event_cls.__mro__:
+            template = self._templates.get(base)
+            if template is not None:
+                break
+        # Misses are cached too, so unregistered event types cost one dict lookup.
+        self._resolved[event_cls] = template
+        return template
+
+    def encode(self, event, run_id=None):
+        """Returns the NDJSON line for event, or None if its type is not registered."""
+        template = self.template_for(type(event))
+        if template is None:
+            return None
+        return template.render(event, run_id, self._escape)
+
+    def encode_dict(self, payload):
+        """Ad-hoc lines (status, errors, tool results) through the same backend."""
+        if self.backend == "orjson":
+            return orjson.dumps(payload).decode("utf-8") + "\n"
+        return json.dumps(payload) + "\n"
+
+
+def build_ndjson_encoder(backend=None):
+    """
+    The /bp_llama/api/messages/process wire format.
+
+    backend defaults to the STREAM_JSON_BACKEND environment variable ("json").
+    """
+    encoder = EventEncoder(backend or os.getenv("STREAM_JSON_BACKEND", "json"))
+
+    encoder.register(
+        ContentEvent, "content", [("content", "content"), ("run_id", "run_id")]
+    )
+    encoder.register(
+        ReasoningEvent, "reasoning", [("content", "content"), ("run_id", "run_id")]
+    )
+    encoder.register(
+        CodeStatusEvent,
+        "code_status",
+        [
+            ("activity", "activity"),
+            ("state", "state"),
+            ("tool", "tool"),
+            ("run_id", "run_id"),
+        ],
+    )
+    encoder.register(
+        HotCodeEvent, "hot_code", [("content", "content"), ("run_id", "run_id")]
+    )
+    encoder.register(
+        CodeExecutionOutputEvent,
+        "hot_code_output",
+        [("content", "content"), ("run_id", "run_id")],
+    )
+    encoder.register(
+        ComputerExecutionOutputEvent,
+        "computer_output",
+        [("content", "content"), ("run_id", "run_id")],
+    )
+    encoder.register(
+        CodeExecutionGeneratedFileEvent,
+        "code_interpreter_file",
+        [
+            ("filename", "filename"),
+            ("file_id", "file_id"),
+            ("mime_type", "mime_type"),
+            ("url", "url"),
+            ("base64", "base64_data"),
+            ("run_id", "run_id"),
+        ],
+    )
+    encoder.register(
+        ScratchpadEvent,
+        "scratchpad_status",
+        [
+            ("state", "state"),
+            ("operation", "operation"),
+            ("activity", "activity"),
+            ("tool", "tool"),
+            ("entry", lambda e, run_id: e.entry or e.content or ""),
+            ("run_id", lambda e, run_id: getattr(e, "run_id", run_id)),
+        ],
+    )
+    encoder.register(
+        ResearchStatusEvent,
+        "research_status",
+        [
+            ("activity", "activity"),
+            ("tool", "tool"),
+            ("state", "state"),
+            ("run_id", "run_id"),
+        ],
+    )
+    encoder.register(
+        WebStatusEvent,
+        "web_status",
+        [
+            ("status", "status"),
+            ("run_id", "run_id"),
+            ("tool", "tool"),
+            ("message", "message"),
+        ],
+    )
+    return encoder
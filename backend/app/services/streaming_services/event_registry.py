@@ -0,0 +1,67 @@
+# backend/app/services/streaming_services/event_registry.py
+
+
+class StreamContext:
+    """
+    Per-run state handed to every event handler.
+
+    tools: the run's ToolBatch; handlers submit tool calls to it and the
+    transport streams their outcomes as they finish (at the latest on
+    TURN_END).
+    """
+
+    def __init__(self, run_id, coalescer=None, tools=None):
+        self.run_id = run_id
+        self.coalescer = coalescer
+        self.tools = tools
+
+
+class EventHandlerRegistry:
+    """
+    Maps SDK event classes to stream handlers.
+
+    A handler is called as handler(event, ctx) and returns an iterable of
+    items to write to the stream:
+        str       — an encoded NDJSON line
+        event     — a raw token event, for the consumer-side TokenCoalescer
+        callable  — blocking work returning a line; the transport decides
+                    where to run it (inline for WSGI, the threadpool for ASGI)
+
+    Lookup walks the event's MRO once per class and caches the result, so
+    subclasses inherit their base's handler, registering on `object` gives a
+    catch-all, and dispatch is a single dict hit for every event after the
+    first of its type. New SDK event types only need a register() call.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._resolved = {}
+
+    def register(self, *event_classes):
+        def decorator(handler):
+            for event_cls in event_classes:
+                self._handlers[event_cls] = handler
+            self._resolved.clear()
+            return handler
+
+        return decorator
+
+    def resolve(self, event_cls):
+        try:
+            return self._resolved[event_cls]
+        except KeyError:
+            pass
+
+        handler = None
+        for base in event_cls.__mro__:
+            handler = self._handlers.get(base)
+            if handler is not None:
+                break
+        self._resolved[event_cls] = handler
+        return handler
+
+    def dispatch(self, event, ctx):
+        handler = self._resolved.get(type(event)) or self.resolve(type(event))
+        if handler is None:
+            return ()
+        return handler(event, ctx)
@@ -0,0 +1,256 @@
+# backend/app/services/streaming_services/replay_buffer.py
+import itertools
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+
+from backend.app.services.logging_service.logger import LoggingUtility
+from backend.app.services.streaming_services.stream_executor import HEARTBEAT
+
+logging_utility = LoggingUtility()
+
+
+class RunBuffer:
+    """
+    Sequenced record of the NDJSON lines written for one run.
+
+    Sequence numbers are line indexes within the run's stream (0-based), so a
+    client that has received N lines resumes from offset N. Readers block on
+    a condition until new lines arrive or the run is closed.
+
+    Storage is left to subclasses: _store(line) and _load(start, end).
+    """
+
+    def __init__(self, run_id, owner=None):
+        self.run_id = run_id
+        self.owner = owner
+        self.created_at = time.time()
+        self.closed_at = None
+        self.next_seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def closed(self):
+        return self.closed_at is not None
+
+    @property
+    def first_seq(self):
+        return 0
+
+    def append(self, line):
+        with self._cond:
+            self._store(line)
+            self.next_seq += 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            if self.closed_at is None:
+                self.closed_at = time.time()
+            self._cond.notify_all()
+
+    def read(self, offset=0, timeout=300, heartbeat=None):
+        """
+        Yields (seq, line) from offset onwards, following the run live until
+        it is closed. If offset has already been evicted from the buffer,
+        reading starts at first_seq — callers can detect the gap from the
+        first seq they receive. Stops silently after `timeout` seconds
+        without new lines.
+
+        With `heartbeat` (seconds), yields (None, HEARTBEAT) whenever the run
+        has been quiet for that long.
+        """
+        seq = max(offset, 0)
+        idle = 0.0
+        while True:
+            beat = False
+            with self._cond:
+                while seq >= self.next_seq and not self.closed:
+                    if idle >= timeout:
+                        return
+                    wait = timeout - idle
+                    if heartbeat is not None:
+                        wait = min(wait, heartbeat)
+                    started = time.monotonic()
+                    self._cond.wait(wait)
+                    idle += time.monotonic() - started
+                    if heartbeat is not None and seq >= self.next_seq:
+                        beat = not self.closed and idle < timeout
+                        break
+                if not beat:
+                    seq = max(seq, self.first_seq)
+                    end = self.next_seq
+                    batch = self._load(seq, end) if seq < end else []
+                    finished = self.closed and end == self.next_seq
+
+            if beat:
+                yield None, HEARTBEAT
+                continue
+
+            idle = 0.0
+            for line in batch:
+                yield seq, line
+                seq += 1
+
+            if finished and seq >= end:
+                return
+
+    def discard(self):
+        pass
+
+    def _store(self, line):
+        raise NotImplementedError
+
+    def _load(self, start, end):
+        raise NotImplementedError
+
+
+class MemoryRunBuffer(RunBuffer):
+    """Ring buffer: keeps the most recent max_events lines."""
+
+    def __init__(self, run_id, owner=None, max_events=5000):
+        super().__init__(run_id, owner)
+        self._lines = deque(maxlen=max_events)
+
+    @property
+    def first_seq(self):
+        return self.next_seq - len(self._lines)
+
+    def _store(self, line):
+        self._lines.append(line)
+
+    def _load(self, start, end):
+        first = self.first_seq
+        return list(itertools.islice(self._lines, start - first, end - first))
+
+
+class DiskRunBuffer(RunBuffer):
+    """Append-only <directory>/<run_id>.ndjson with an in-memory line offset index."""
+
+    def __init__(self, run_id, owner=None, directory=None):
+        super().__init__(run_id, owner)
+        self.path = os.path.join(directory or tempfile.gettempdir(), f"{run_id}.ndjson")
+        self._offsets = []
+        self._size = 0
+        self._file = open(self.path, "w+b")
+
+    def _store(self, line):
+        data = line.encode("utf-8")
+        self._offsets.append(self._size)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _load(self, start, end):
+        stop = self._offsets[end] if end < len(self._offsets) else self._size
+        base = self._offsets[start]
+        with open(self.path, "rb") as f:
+            f.seek(base)
+            data = f.read(stop - base)
+        # Cut at the recorded offsets: str.splitlines() would also break
+        # on U+2028 etc., which JSON may carry unescaped.
+        bounds = self._offsets[start:end] + [stop]
+        return [
+            data[a - base : b - base].decode("utf-8")
+            for a, b in zip(bounds, bounds[1:])
+        ]
+
+    def discard(self):
+        try:
+            self._file.close()
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class ReplayStore:
+    """
+    Per-run replay buffers keyed by run_id, so a client whose connection
+    drops can reconnect and resume instead of re-running inference.
+
+    Finished runs are kept for STREAM_REPLAY_TTL seconds; at most
+    STREAM_REPLAY_MAX_RUNS buffers are held (oldest finished runs go first;
+    a run started while every buffer belongs to a live run gets no replay).
+
+    Config keys:
+        STREAM_REPLAY_BACKEND     "" (disabled, default) | "memory" | "disk"
+        STREAM_REPLAY_MAX_EVENTS  lines kept per run by the memory ring (default 5000)
+        STREAM_REPLAY_MAX_RUNS    buffers held at once (default 256)
+        STREAM_REPLAY_TTL         seconds a finished run stays resumable (default 600)
+        STREAM_REPLAY_DIR         directory for the disk backend (default: system temp)
+    """
+
+    def __init__(self, app=None):
+        self.backend = ""
+        self.max_events = 5000
+        self.max_runs = 256
+        self.ttl = 600
+        self.directory = None
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.backend = (app.config.get("STREAM_REPLAY_BACKEND") or "").lower()
+        self.max_events = int(app.config.get("STREAM_REPLAY_MAX_EVENTS", 5000))
+        self.max_runs = int(app.config.get("STREAM_REPLAY_MAX_RUNS", 256))
+        self.ttl = float(app.config.get("STREAM_REPLAY_TTL", 600))
+        self.directory = app.config.get("STREAM_REPLAY_DIR") or None
+        if self.backend == "disk" and self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.extensions["replay_store"] = self
+
+    @property
+    def enabled(self):
+        return self.backend in ("memory", "disk")
+
+    def create(self, run_id, owner=None):
+        """Returns a new buffer for run_id, or None when replay is disabled."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if not self._evict():
+                logging_utility.warning(
+                    f"[{run_id}] Replay disabled for this run: "
+                    f"all {self.max_runs} replay buffers belong to live runs."
+                )
+                return None
+            if self.backend == "disk":
+                buffer = DiskRunBuffer(run_id, owner, directory=self.directory)
+            else:
+                buffer = MemoryRunBuffer(run_id, owner, max_events=self.max_events)
+            self._buffers[run_id] = buffer
+        return buffer
+
+    def get(self, run_id):
+        with self._lock:
+            return self._buffers.get(run_id)
+
+    def _evict(self):
+        """
+        Drops expired runs, then the oldest finished ones while at
+        max_runs. Live runs are never dropped (their producer is still
+        writing); returns False if there is still no room.
+        """
+        now = time.time()
+        for run_id, buffer in list(self._buffers.items()):
+            if buffer.closed and now - buffer.closed_at > self.ttl:
+                self._drop(run_id)
+
+        finished = (rid for rid, b in list(self._buffers.items()) if b.closed)
+        while len(self._buffers) >= self.max_runs:
+            run_id = next(finished, None)
+            if run_id is None:
+                return False
+            self._drop(run_id)
+        return True
+
+    def _drop(self, run_id):
+        buffer = self._buffers.pop(run_id)
+        buffer.discard()
+        logging_utility.info(f"[{run_id}] Replay buffer evicted.")
@@ -0,0 +1,184 @@
+# backend/app/services/streaming_services/sse.py
+import zlib
+
+from backend.app.services.streaming_services.stream_executor import HEARTBEAT
+
+# wbits for zlib.compressobj(): gzip container vs zlib (HTTP "deflate") container.
+_WBITS = {"gzip": 31, "deflate": 15}
+
+
+def wants_sse(accept_header):
+    return "text/event-stream" in (accept_header or "")
+
+
+def negotiate_encoding(accept_encoding, allowed):
+    """
+    Picks a Content-Encoding from the client's Accept-Encoding header, in the
+    server's order of preference (`allowed`, e.g. "gzip,deflate"). Returns
+    None for identity.
+    """
+    offered = {}
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+
+    for name in (allowed or "").split(","):
+        name = name.strip().lower()
+        if name in _WBITS and offered.get(name, offered.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+def parse_last_event_id(value):
+    """'<run_id>:<seq>' -> (run_id, seq), or None if it isn't one of our ids."""
+    run_id, sep, seq = (value or "").rpartition(":")
+    if not sep or not run_id or not seq.isdigit():
+        return None
+    return run_id, int(seq)
+
+
+class SSEEncoder:
+    """
+    Frames NDJSON lines as Server-Sent Events, optionally compressed.
+
+    Each line becomes one event whose id is "<run_id>:<seq>", seq being the
+    line's index in the run (the same numbering as the replay buffer), so a
+    reconnecting client's Last-Event-ID says exactly where to resume.
+    HEARTBEAT items become ": ping" comments that keep proxies from timing
+    out idle connections.
+
+    With an encoding, the whole stream is one gzip/deflate member. Frames are
+    compressed against a shared dictionary, and Z_SYNC_FLUSH is issued once
+    at least `flush_bytes` of uncompressed text is pending (0: after every
+    frame), on every heartbeat, and at the end — so the client can always
+    decode everything sent so far without waiting for more output.
+    """
+
+    HEARTBEAT_FRAME = ": ping\n\n"
+
+    def __init__(self, run_id, start_seq=0, encoding=None, flush_bytes=0, level=6):
+        self.run_id = run_id
+        self.next_seq = start_seq
+        self.encoding = encoding
+        self.flush_bytes = flush_bytes
+        self._pending = 0
+        self._compressor = (
+            zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+            if encoding
+            else None
+        )
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @classmethod
+    def from_config(cls, config, run_id, accept_encoding=None, start_seq=0):
+        return cls(
+            run_id,
+            start_seq=start_seq,
+            encoding=negotiate_encoding(
+                accept_encoding, config.get("STREAM_SSE_ENCODINGS", "gzip,deflate")
+            ),
+            flush_bytes=int(config.get("STREAM_SSE_FLUSH_BYTES", 0)),
+            level=int(config.get("STREAM_SSE_COMPRESS_LEVEL", 6)),
+        )
+
+    @property
+    def headers(self):
+        headers = {
+            "X-Conversation-Id": self.run_id,
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            # nginx and friends: don't buffer the event stream.
+            "X-Accel-Buffering": "no",
+        }
+        if self.encoding:
+            headers["Content-Encoding"] = self.encoding
+            headers["Vary"] = "Accept-Encoding"
+        return headers
+
+    def frame(self, line, numbered=True):
+        data = "".join("data: " + part + "\n" for part in line.rstrip("\n").split("\n"))
+        if not numbered:
+            # No id field: the client's last event id stays where it was.
+            return data + "\n"
+        seq = self.next_seq
+        self.next_seq += 1
+        return f"id: {self.run_id}:{seq}\n{data}\n"
+
+    def encode(self, item):
+        """
+        Returns the bytes to write for one item: an NDJSON line (numbered
+        sequentially), HEARTBEAT, or a (seq, line) pair from
+        RunBuffer.read() — seq None means an unnumbered frame.
+        """
+        numbered = True
+        if isinstance(item, tuple):
+            seq, item = item
+            if seq is None:
+                numbered = False
+            else:
+                self.next_seq = seq
+
+        if item is HEARTBEAT:
+            text, flush = self.HEARTBEAT_FRAME, True
+        else:
+            text, flush = self.frame(item, numbered), False
+
+        raw = text.encode("utf-8")
+        self.bytes_in += len(raw)
+        if self._compressor is None:
+            self.bytes_out += len(raw)
+            return raw
+
+        self._pending += len(raw)
+        out = self._compressor.compress(raw)
+        if flush or self._pending >= self.flush_bytes:
+            out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._pending = 0
+        self.bytes_out += len(out)
+        return out
+
+    def close(self):
+        """Terminates the compressed stream (no-op for identity)."""
+        if self._compressor is None:
+            return b""
+        out = self._compressor.flush(zlib.Z_FINISH)
+        self.bytes_out += len(out)
+        return out
+
+    def stream(self, items):
+        """Wraps an iterator of encode()-able items into the SSE byte stream."""
+        try:
+            for item in items:
+                chunk = self.encode(item)
+                if chunk:
+                    yield chunk
+            tail = self.close()
+            if tail:
+                yield tail
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    async def astream(self, items):
+        """Async counterpart of stream() for the ASGI transport."""
+        try:
+            async for item in items:
+                chunk = self.encode(item)
+                if chunk:
+                    yield chunk
+            tail = self.close()
+            if tail:
+                yield tail
+        finally:
+            aclose = getattr(items, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,325 @@
+# backend/app/services/streaming_services/stream_executor.py
+import json
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+_SENTINEL = object()
+
+# Yielded by StreamExecutor.stream(heartbeat=...) when the stream is idle.
+HEARTBEAT = object()
+
+
+class StreamCapacityError(Exception):
+    """Raised when the stream pool and its wait queue are both full."""
+
+    def __init__(self, retry_after):
+        super().__init__("Stream capacity exhausted")
+        self.retry_after = retry_after
+
+
+class StreamExecutor:
+    """
+    Fixed-size worker pool for SDK inference streams.
+
+    The ProjectDavid SDK drives its own event loop with run_until_complete(),
+    so every stream still needs a thread with no running loop. Instead of one
+    new thread per request, streams run on a bounded pool and requests are
+    admitted up front: once max_workers streams are running and max_queue are
+    waiting, new requests are rejected immediately (503 + Retry-After) rather
+    than piling more threads onto the GIL.
+
+    Usage (Flask route):
+        stream_executor.reserve()           # raises StreamCapacityError
+        try:
+            ...create message / run...
+        except Exception:
+            stream_executor.release()
+            raise
+        return Response(stream_executor.stream(generate_events_stream), ...)
+
+    stream() submits the worker straight away, so the slot is handed over
+    even if the response is never iterated. Async streams that run on the
+    event loop instead (the ASGI route) take their slot with hold().
+
+    Config keys:
+        STREAM_EXECUTOR_MAX_WORKERS   concurrent SDK streams (default 32)
+        STREAM_EXECUTOR_MAX_QUEUE     admitted streams waiting for a worker (default 64)
+        STREAM_EXECUTOR_RETRY_AFTER   Retry-After seconds on rejection (default 5)
+        STREAM_EXECUTOR_ITEM_TIMEOUT  max seconds between chunks (default 300)
+    """
+
+    def __init__(self, app=None):
+        self.max_workers = 32
+        self.max_queue = 64
+        self.retry_after = 5
+        self.item_timeout = 300
+        self._pool = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._rejected_total = 0
+        self._completed_total = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_workers = int(app.config.get("STREAM_EXECUTOR_MAX_WORKERS", 32))
+        self.max_queue = int(app.config.get("STREAM_EXECUTOR_MAX_QUEUE", 64))
+        self.retry_after = int(app.config.get("STREAM_EXECUTOR_RETRY_AFTER", 5))
+        self.item_timeout = float(app.config.get("STREAM_EXECUTOR_ITEM_TIMEOUT", 300))
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sdk-stream"
+        )
+        app.extensions["stream_executor"] = self
+
+    # ─────────────────────────────────────────────────────────────
+    # Admission control
+    # ─────────────────────────────────────────────────────────────
+    def reserve(self):
+        """Claims a slot for one stream, or raises StreamCapacityError."""
+        with self._lock:
+            if self._active + self._queued >= self.max_workers + self.max_queue:
+                self._rejected_total += 1
+                raise StreamCapacityError(self.retry_after)
+            self._queued += 1
+
+    def release(self):
+        """Gives back a reserved slot that will never be streamed."""
+        with self._lock:
+            self._queued -= 1
+
+    def _occupy(self):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+    def _vacate(self):
+        with self._lock:
+            self._active -= 1
+            self._completed_total += 1
+
+    def hold(self, stream):
+        """
+        Moves a reserved slot onto an async generator that runs outside the
+        pool (the ASGI route's event stream) and returns a generator
+        re-yielding it. The slot is given back when that generator finishes
+        or is closed, or is garbage-collected without ever being iterated.
+        """
+        self._occupy()
+        once = threading.Lock()
+
+        def vacate():
+            if once.acquire(blocking=False):
+                self._vacate()
+
+        async def held():
+            try:
+                async for item in stream:
+                    yield item
+            finally:
+                vacate()
+
+        gen = held()
+        weakref.finalize(gen, vacate)
+        return gen
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active_streams": self._active,
+                "queued_streams": self._queued,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected_total": self._rejected_total,
+                "completed_total": self._completed_total,
+            }
+
+    # ─────────────────────────────────────────────────────────────
+    # Streaming
+    # ─────────────────────────────────────────────────────────────
+    def stream(
+        self,
+        generator_func,
+        *args,
+        coalescer=None,
+        replay=None,
+        heartbeat=None,
+        **kwargs,
+    ):
+        """
+        Submits generator_func to the pool (handing it the reserved slot) and
+        returns a generator that yields its items back on the calling thread.
+
+        If the client goes away, the consumer generator is closed (or dropped
+        unstarted) and the worker stops pulling from the SDK at the next
+        chunk, freeing the slot.
+
+        With a TokenCoalescer, the worker may also yield raw token events;
+        they are merged here, where we can wake up on the coalescing deadline
+        even while the SDK is quiet.
+
+        With a replay RunBuffer, every line written to the client is recorded
+        first, and a client that goes away detaches instead of cancelling:
+        the worker runs the stream to completion, recording straight into the
+        buffer, so the client can reconnect and resume from its last offset.
+
+        With `heartbeat` (seconds), HEARTBEAT is yielded whenever nothing has
+        been written for that long; it is never recorded for replay.
+        """
+        q = queue.Queue()
+        cancelled = threading.Event()
+        handoff = threading.Lock()
+        detached = []
+        done = []
+
+        def record(item):
+            # Worker side, after detaching: nobody is coalescing any more.
+            if isinstance(item, Exception):
+                logging_utility.error(f"Stream worker failed: {item}")
+                item = json.dumps({"type": "error", "error": str(item)}) + "\n"
+            elif coalescer is not None and coalescer.accepts(item):
+                item = coalescer.encoder.encode(item, coalescer.run_id)
+            replay.append(item)
+
+        def drain():
+            # Anything the client never picked up goes to the buffer first.
+            while True:
+                try:
+                    pending = q.get_nowait()
+                except queue.Empty:
+                    return
+                if pending is not _SENTINEL:
+                    record(pending)
+
+        def deliver(item):
+            with handoff:
+                if not detached:
+                    q.put(item)
+                    return
+            drain()
+            if item is not _SENTINEL:
+                record(item)
+
+        def worker():
+            self._occupy()
+            try:
+                if cancelled.is_set():
+                    return
+                gen = generator_func(*args, **kwargs)
+                try:
+                    for chunk in gen:
+                        if cancelled.is_set():
+                            break
+                        deliver(chunk)
+                finally:
+                    gen.close()
+                deliver(_SENTINEL)
+            except Exception as e:
+                deliver(e)
+            finally:
+                with handoff:
+                    done.append(True)
+                    if detached:
+                        replay.close()
+                self._vacate()
+
+        def emit(lines):
+            if replay is not None:
+                for line in lines:
+                    replay.append(line)
+            return lines
+
+        once = threading.Lock()
+
+        def hang_up(finished):
+            if not once.acquire(blocking=False):
+                return
+            if replay is None or finished:
+                cancelled.set()
+                if replay is not None:
+                    replay.close()
+                return
+            with handoff:
+                if coalescer is not None:
+                    emit(coalescer.flush())
+                detached.append(True)
+                if done:
+                    # The worker finished before we noticed the disconnect.
+                    drain()
+                    replay.close()
+            logging_utility.info(
+                f"[{replay.run_id}] Client detached; recording to replay buffer."
+            )
+
+        self._pool.submit(worker)
+        consumer = self._consume(q, emit, hang_up, coalescer, heartbeat)
+        # A generator closed before its first next() never runs its finally.
+        weakref.finalize(consumer, hang_up, False)
+        return consumer
+
+    def _consume(self, q, emit, hang_up, coalescer, heartbeat):
+        finished = False
+        waited = 0.0
+        try:
+            while True:
+                timeout = self.item_timeout - waited
+                if heartbeat is not None:
+                    timeout = min(timeout, heartbeat)
+                if coalescer is not None and coalescer.pending:
+                    timeout = min(timeout, coalescer.time_left())
+
+                started = time.monotonic()
+                try:
+                    item = q.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    waited += time.monotonic() - started
+                    if coalescer is not None and coalescer.pending:
+                        yield from emit(coalescer.flush())
+                        continue
+                    if heartbeat is not None and waited < self.item_timeout:
+                        yield HEARTBEAT
+                        continue
+                    logging_utility.warning("Stream timed out waiting for SDK worker.")
+                    finished = True
+                    yield from emit(
+                        [
+                            json.dumps({"type": "error", "error": "Stream timeout"})
+                            + "\n"
+                        ]
+                    )
+                    break
+
+                waited = 0.0
+                if coalescer is not None and (
+                    item is _SENTINEL or isinstance(item, Exception)
+                ):
+                    yield from emit(coalescer.flush())
+
+                if item is _SENTINEL:
+                    finished = True
+                    break
+
+                if isinstance(item, Exception):
+                    # We can't change the HTTP status code once streaming starts,
+                    # so we log the error and break the stream with a JSON error block.
+                    logging_utility.error(f"Stream worker failed: {item}")
+                    finished = True
+                    yield from emit(
+                        [json.dumps({"type": "error", "error": str(item)}) + "\n"]
+                    )
+                    break
+
+                if coalescer is not None:
+                    yield from emit(coalescer.push(item))
+                else:
+                    yield from emit([item])
+        finally:
+            hang_up(finished)
@@ -0,0 +1,117 @@
+# backend/app/services/streaming_services/token_coalescer.py
+import time
+from dataclasses import replace
+
+from projectdavid import ContentEvent, ReasoningEvent
+
+
+class TokenCoalescer:
+    """
+    Merges runs of ContentEvent / ReasoningEvent tokens into fewer NDJSON lines.
+
+    Leading-edge throttle: a token that arrives after a quiet period of at
+    least `window_ms` is emitted immediately (so first-token latency is
+    unchanged); tokens arriving inside the window are buffered and flushed as
+    one merged event when the window closes, the buffer reaches `max_bytes`,
+    or a different kind of item arrives.
+
+    This is a plain state machine — it never blocks or sleeps. The stream
+    consumer drives it: push() every item, and when nothing arrives before
+    `deadline`, call flush().
+
+    Items are either SDK token events (see accepts()) or already-encoded
+    NDJSON lines, which are passed through after flushing the buffer so the
+    original ordering is preserved.
+    """
+
+    MERGEABLE = (ContentEvent, ReasoningEvent)
+
+    def __init__(self, encoder, run_id, window_ms=20, max_bytes=4096):
+        self.encoder = encoder
+        self.run_id = run_id
+        self.window = window_ms / 1000.0
+        self.max_bytes = max_bytes
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_emit = float("-inf")
+        self.deadline = None
+
+        self.tokens_in = 0
+        self.lines_out = 0
+
+    @classmethod
+    def from_config(cls, config, encoder, run_id):
+        """Returns a coalescer, or None when STREAM_COALESCE_WINDOW_MS is 0 (default)."""
+        window_ms = float(config.get("STREAM_COALESCE_WINDOW_MS", 0) or 0)
+        if window_ms <= 0:
+            return None
+        return cls(
+            encoder,
+            run_id,
+            window_ms=window_ms,
+            max_bytes=int(config.get("STREAM_COALESCE_MAX_BYTES", 4096)),
+        )
+
+    def accepts(self, item):
+        return type(item) in self.MERGEABLE
+
+    @property
+    def pending(self):
+        return bool(self._buffer)
+
+    def time_left(self, now=None):
+        if self.deadline is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.deadline - now)
+
+    def push(self, item, now=None):
+        """Feeds one item; returns the lines that are ready to be written."""
+        now = time.monotonic() if now is None else now
+
+        if not self.accepts(item):
+            out = self.flush(now)
+            out.append(item)
+            self.lines_out += 1
+            return out
+
+        self.tokens_in += 1
+        out = []
+        if self._buffer and type(self._buffer[0]) is not type(item):
+            out = self.flush(now)
+
+        if not self._buffer and now - self._last_emit >= self.window:
+            self._last_emit = now
+            self.lines_out += 1
+            out.append(self.encoder.encode(item, self.run_id))
+            return out
+
+        if not self._buffer:
+            self.deadline = max(now, self._last_emit + self.window)
+        self._buffer.append(item)
+        self._buffered_bytes += len(item.content or "")
+
+        if self._buffered_bytes >= self.max_bytes or now >= self.deadline:
+            out.extend(self.flush(now))
+        return out
+
+    def flush(self, now=None):
+        """Emits whatever is buffered as a single merged event."""
+        if not self._buffer:
+            return []
+
+        first = self._buffer[0]
+        if len(self._buffer) == 1:
+            merged = first
+        else:
+            merged = replace(
+                first, content="".join(e.content or "" for e in self._buffer)
+            )
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self.deadline = None
+        self._last_emit = time.monotonic() if now is None else now
+        self.lines_out += 1
+        return [self.encoder.encode(merged, self.run_id)]
@@ -0,0 +1,211 @@
+# backend/app/services/streaming_services/tool_scheduler.py
+import asyncio
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
+
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+
+# event: the ToolCallRequestEvent; success: what event.execute() returned;
+# error: set if the handler timed out or could not be started, or execute()
+# itself raised.
+ToolOutcome = namedtuple(
+    "ToolOutcome", ["event", "success", "duration", "timed_out", "error"]
+)
+
+
+class ToolTimeoutError(Exception):
+    pass
+
+
+class ToolCapacityError(Exception):
+    """Too many timed-out handlers are still running to start another."""
+
+
+class ToolScheduler:
+    """
+    Runs ToolCallRequestEvents concurrently on a bounded pool.
+
+    Each call is event.execute(handler) — the SDK marks the action as
+    processing, calls the handler and submits its output — on the `tool-call`
+    pool. The handler itself runs on a second pool so it can be bounded by a
+    per-tool timeout, counted from when the handler starts: on timeout the
+    SDK submits the error as the tool output and the run carries on.
+
+    A timed-out handler thread cannot be killed; it is abandoned and keeps
+    its handler thread until it returns, and its result is discarded. The
+    handler pool has room for TOOL_HANDLER_MAX_ABANDONED such threads on top
+    of one per tool call, so hung handlers never hold up new calls; once
+    that many are still running, new calls fail straight away with
+    ToolCapacityError instead of queueing behind them.
+
+    Calls are grouped per run in a ToolBatch; see StreamContext.tools.
+
+    Config keys:
+        TOOL_EXECUTOR_MAX_WORKERS   concurrent tool calls, all runs (default 8)
+        TOOL_CALL_TIMEOUT           default per-tool timeout in seconds (default 60)
+        TOOL_CALL_TIMEOUTS          JSON object of per-tool overrides,
+                                    e.g. {"get_flight_times": 10}
+        TOOL_HANDLER_MAX_ABANDONED  timed-out handlers allowed to keep running
+                                    (default TOOL_EXECUTOR_MAX_WORKERS)
+    """
+
+    def __init__(self, app=None):
+        self.max_workers = 8
+        self.max_abandoned = 8
+        self.default_timeout = 60.0
+        self.timeouts = {}
+        self._pool = None
+        self._handler_pool = None
+        self._lock = threading.Lock()
+        self._abandoned = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_workers = int(app.config.get("TOOL_EXECUTOR_MAX_WORKERS", 8))
+        self.max_abandoned = int(
+            app.config.get("TOOL_HANDLER_MAX_ABANDONED", self.max_workers)
+        )
+        self.default_timeout = float(app.config.get("TOOL_CALL_TIMEOUT", 60))
+        timeouts = app.config.get("TOOL_CALL_TIMEOUTS") or {}
+        if isinstance(timeouts, str):
+            timeouts = json.loads(timeouts)
+        self.timeouts = {name: float(t) for name, t in timeouts.items()}
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tool-call"
+        )
+        self._handler_pool = ThreadPoolExecutor(
+            max_workers=self.max_workers + self.max_abandoned,
+            thread_name_prefix="tool-handler",
+        )
+        app.extensions["tool_scheduler"] = self
+
+    def timeout_for(self, tool_name):
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    def batch(self, run_id):
+        return ToolBatch(self, run_id)
+
+    def _abandon(self, future):
+        with self._lock:
+            self._abandoned += 1
+            abandoned = self._abandoned
+        logging_utility.warning(
+            f"Abandoned a timed-out tool handler; {abandoned} still running."
+        )
+        future.add_done_callback(self._abandoned_done)
+
+    def _abandoned_done(self, future):
+        with self._lock:
+            self._abandoned -= 1
+
+    def _execute(self, event, handler):
+        timeout = self.timeout_for(event.tool_name)
+        failures = []
+
+        def timed_handler(tool_name, arguments):
+            with self._lock:
+                abandoned = self._abandoned
+            if abandoned >= self.max_abandoned:
+                failures.append(
+                    ToolCapacityError(
+                        f"Tool '{tool_name}' not started: {abandoned} timed-out "
+                        "tool handlers are still running"
+                    )
+                )
+                raise failures[-1]
+
+            started = []
+            running = threading.Event()
+
+            def run():
+                started.append(time.monotonic())
+                running.set()
+                return handler(tool_name, arguments)
+
+            future = self._handler_pool.submit(run)
+            running.wait()
+            try:
+                return future.result(
+                    timeout=max(0.0, started[0] + timeout - time.monotonic())
+                )
+            except FutureTimeoutError:
+                self._abandon(future)
+                failures.append(
+                    ToolTimeoutError(f"Tool '{tool_name}' timed out after {timeout:g}s")
+                )
+                raise failures[-1]
+
+        start_time = time.time()
+        error = None
+        try:
+            # execute() reports success even when the handler fails: the SDK
+            # submits the error as the tool output.
+            success = event.execute(timed_handler)
+        except Exception as e:
+            success, error = False, e
+        duration = time.time() - start_time
+
+        if failures:
+            error = failures[-1]
+        timed_out = isinstance(error, ToolTimeoutError)
+        return ToolOutcome(event, success, duration, timed_out, error)
+
+
+class ToolBatch:
+    """
+    The tool calls of one run. submit() starts a call immediately; ready()
+    and completed() hand back outcomes in completion order.
+    """
+
+    def __init__(self, scheduler, run_id):
+        self.scheduler = scheduler
+        self.run_id = run_id
+        self._futures = []
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        return bool(self._futures)
+
+    def submit(self, event, handler):
+        future = self.scheduler._pool.submit(self.scheduler._execute, event, handler)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def _take(self, done_only):
+        with self._lock:
+            if done_only:
+                taken, remaining = [], []
+                for future in self._futures:
+                    (taken if future.done() else remaining).append(future)
+                self._futures = remaining
+            else:
+                taken, self._futures = self._futures, []
+        return taken
+
+    def ready(self):
+        """Outcomes of calls that have already finished (non-blocking)."""
+        return [f.result() for f in self._take(done_only=True)]
+
+    def completed(self):
+        """Blocks until every submitted call finishes, yielding each as it does."""
+        for future in as_completed(self._take(done_only=False)):
+            yield future.result()
+
+    async def acompleted(self):
+        """Async completed() for the ASGI transport."""
+        futures = [asyncio.wrap_future(f) for f in self._take(done_only=False)]
+        for next_done in asyncio.as_completed(futures):
+            yield await next_done
@@ -0,0 +1,285 @@
+# backend/app/services/vector_store_services/chunked_uploads.py
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from werkzeug.utils import secure_filename
+
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadNotFound(LookupError):
+    pass
+
+
+class OffsetMismatch(ValueError):
+    """The chunk does not start where the upload currently ends."""
+
+    def __init__(self, offset):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class ChecksumMismatch(ValueError):
+    pass
+
+
+class ChunkedUpload:
+    """State of one resumable upload; persisted as JSON next to its data file."""
+
+    FIELDS = (
+        "upload_id",
+        "user_id",
+        "filename",
+        "mimetype",
+        "size",
+        "sha256",
+        "offset",
+        "created_at",
+    )
+
+    def __init__(self, **state):
+        for name in self.FIELDS:
+            setattr(self, name, state.get(name))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @property
+    def complete(self):
+        return self.offset == self.size
+
+
+class ChunkedUploadStore:
+    """
+    Resumable uploads: init() a session, append() the file in chunks at
+    explicit offsets, and verify() it once every byte is there.
+
+    Chunks are written straight into `<UPLOAD_CHUNK_DIR>/<id>/<filename>`
+    (the SDK picks its parser from the extension); the session (declared
+    size and SHA-256, committed offset) lives in `<id>.json`, so an
+    interrupted upload, or a restarted server, resumes from the last
+    committed offset rather than from zero. A chunk that arrives at the
+    wrong offset is rejected with the current one (OffsetMismatch), and one
+    whose X-Chunk-SHA256 does not match is rolled back (ChecksumMismatch).
+    The whole-file SHA-256 is kept up to date as chunks arrive, so verify()
+    only re-reads the file after a restart.
+
+    Sessions untouched for UPLOAD_CHUNK_TTL seconds are removed. Appends to
+    one session are serialised within this process; run a single worker
+    per UPLOAD_CHUNK_DIR (or route an upload's requests to one worker).
+
+    Config keys:
+        UPLOAD_CHUNK_DIR       session directory (default <tmp>/vector-uploads)
+        UPLOAD_CHUNK_MAX_SIZE  largest file accepted in bytes (default 1 GiB)
+        UPLOAD_CHUNK_SIZE      largest chunk accepted in bytes (default 8 MiB)
+        UPLOAD_CHUNK_TTL       seconds an idle session is kept (default 86400)
+    """
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.max_size = 1024 * 1024 * 1024
+        self.chunk_size = 8 * 1024 * 1024
+        self.ttl = 86400
+        self._locks = {}
+        self._hashes = {}  # upload_id -> (offset, running sha256)
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.directory = app.config.get("UPLOAD_CHUNK_DIR") or os.path.join(
+            tempfile.gettempdir(), "vector-uploads"
+        )
+        self.max_size = int(app.config.get("UPLOAD_CHUNK_MAX_SIZE", self.max_size))
+        self.chunk_size = int(app.config.get("UPLOAD_CHUNK_SIZE", self.chunk_size))
+        self.ttl = float(app.config.get("UPLOAD_CHUNK_TTL", self.ttl))
+        os.makedirs(self.directory, exist_ok=True)
+        app.extensions["chunked_uploads"] = self
+
+    # ── paths / persistence ──────────────────────────────────
+    def data_path(self, upload):
+        return os.path.join(self.directory, upload.upload_id, upload.filename)
+
+    def _state_path(self, upload_id):
+        return os.path.join(self.directory, upload_id + ".json")
+
+    def _save(self, upload):
+        path = self._state_path(upload.upload_id)
+        with open(path + ".tmp", "w") as fh:
+            json.dump(upload.to_dict(), fh)
+        os.replace(path + ".tmp", path)
+
+    def _upload_lock(self, upload_id):
+        with self._lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def get(self, upload_id, user_id):
+        """The caller's session; UploadNotFound for unknown ids or other users'."""
+        if not _UPLOAD_ID.match(upload_id or ""):
+            raise UploadNotFound(upload_id)
+        try:
+            with open(self._state_path(upload_id)) as fh:
+                upload = ChunkedUpload(**json.load(fh))
+        except (OSError, ValueError):
+            raise UploadNotFound(upload_id)
+        if upload.user_id != user_id:
+            raise UploadNotFound(upload_id)
+        return upload
+
+    # ── protocol ─────────────────────────────────────────────
+    def init(self, user_id, filename, size, sha256=None, mimetype=None):
+        filename = secure_filename(filename or "")
+        if not filename:
+            raise ValueError("A filename is required")
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            raise ValueError("size must be a positive integer")
+        if size > self.max_size:
+            raise ValueError(f"File too large (max {self.max_size} bytes)")
+        if sha256 is not None and not re.match(r"^[0-9a-f]{64}$", str(sha256)):
+            raise ValueError("sha256 must be a hex SHA-256 digest")
+
+        self._sweep()
+        upload = ChunkedUpload(
+            upload_id=uuid.uuid4().hex,
+            user_id=user_id,
+            filename=filename,
+            mimetype=mimetype or "application/octet-stream",
+            size=size,
+            sha256=sha256,
+            offset=0,
+            created_at=time.time(),
+        )
+        os.mkdir(os.path.join(self.directory, upload.upload_id))
+        open(self.data_path(upload), "wb").close()
+        self._save(upload)
+        with self._lock:
+            self._hashes[upload.upload_id] = (0, hashlib.sha256())
+        return upload
+
+    def append(self, upload_id, user_id, offset, stream, checksum=None):
+        """
+        Writes the chunk read from `stream` at `offset` and returns the
+        updated session. The chunk must start at the committed offset and
+        may not run past the declared size or UPLOAD_CHUNK_SIZE.
+        """
+        with self._upload_lock(upload_id):
+            upload = self.get(upload_id, user_id)
+            if offset != upload.offset:
+                raise OffsetMismatch(upload.offset)
+            limit = min(self.chunk_size, upload.size - upload.offset)
+
+            chunk_hash = hashlib.sha256()
+            with self._lock:
+                hashed_to, running = self._hashes.get(upload_id, (None, None))
+            running = running.copy() if hashed_to == offset else None
+            written = 0
+            with open(self.data_path(upload), "r+b") as fh:
+                # Anything past the committed offset is from an interrupted chunk.
+                fh.seek(offset)
+                fh.truncate()
+                while True:
+                    data = stream.read(min(64 * 1024, limit + 1 - written))
+                    if not data:
+                        break
+                    written += len(data)
+                    if written > limit:
+                        fh.truncate(offset)
+                        raise ValueError(
+                            f"Chunk exceeds {limit} bytes (chunk size or remaining size)"
+                        )
+                    fh.write(data)
+                    chunk_hash.update(data)
+                    if running is not None:
+                        running.update(data)
+                if checksum and chunk_hash.hexdigest() != checksum.lower():
+                    fh.truncate(offset)
+                    raise ChecksumMismatch("Chunk checksum mismatch")
+
+            upload.offset += written
+            self._save(upload)
+            if running is not None:
+                with self._lock:
+                    self._hashes[upload_id] = (upload.offset, running)
+            return upload
+
+    def content_hash(self, upload):
+        """SHA-256 of the assembled file (re-read only if not tracked in memory)."""
+        with self._lock:
+            hashed_to, running = self._hashes.get(upload.upload_id, (None, None))
+        if hashed_to == upload.offset:
+            return running.hexdigest()
+        digest = hashlib.sha256()
+        with open(self.data_path(upload), "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def verify(self, upload):
+        """
+        Checks that a session is ready for ingestion and returns its content
+        hash. Raises ValueError if bytes are missing, ChecksumMismatch if the
+        file does not match the SHA-256 declared at init().
+        """
+        if not upload.complete:
+            raise ValueError(
+                f"Upload incomplete: {upload.offset} of {upload.size} bytes"
+            )
+        content_hash = self.content_hash(upload)
+        if upload.sha256 and content_hash != upload.sha256:
+            raise ChecksumMismatch("File checksum mismatch")
+        return content_hash
+
+    def discard(self, upload_id):
+        shutil.rmtree(os.path.join(self.directory, upload_id), ignore_errors=True)
+        try:
+            os.unlink(self._state_path(upload_id))
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._hashes.pop(upload_id, None)
+            self._locks.pop(upload_id, None)
+
+    def _sweep(self):
+        """Removes sessions idle for longer than the TTL (at most once a minute)."""
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < 60:
+                return
+            self._last_sweep = now
+        for name in os.listdir(self.directory):
+            upload_id, ext = os.path.splitext(name)
+            if ext != ".json" or not _UPLOAD_ID.match(upload_id):
+                continue
+            # The state file is rewritten on every append.
+            try:
+                idle = now - os.path.getmtime(os.path.join(self.directory, name))
+            except OSError:
+                idle = self.ttl + 1
+            if idle > self.ttl:
+                logging_utility.info(f"Removing expired upload {upload_id}")
+                self.discard(upload_id)
+
+    def stats(self):
+        with self._lock:
+            tracked = len(self._hashes)
+        sessions = sum(1 for n in os.listdir(self.directory) if n.endswith(".json"))
+        return {
+            "directory": self.directory,
+            "sessions": sessions,
+            "hash_tracked": tracked,
+            "max_size": self.max_size,
+            "chunk_size": self.chunk_size,
+        }
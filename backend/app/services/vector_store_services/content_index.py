@@ -0,0 +1,137 @@
+# backend/app/services/vector_store_services/content_index.py
+import threading
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.entity_services.single_flight import SingleFlight
+from backend.app.services.logging_service.logger import LoggingUtility
+from backend.app.services.vector_store_services.store_resolver import \
+    is_not_found
+
+logging_utility = LoggingUtility()
+
+# user_metadata key the content hash is stored under on each store file.
+HASH_KEY = "content_sha256"
+
+
+def _is_completed(record):
+    status = getattr(record, "status", None)
+    return getattr(status, "value", status) == "completed"
+
+
+class ContentIndex:
+    """
+    Content-addressed index of the files in each vector store, so a file
+    whose bytes are already in the store is not ingested and embedded again.
+
+    Every upload records the SHA-256 of its content in the file's metadata
+    (HASH_KEY), which makes the store itself the source of truth: a store's
+    index is built from list_store_files() the first time it is needed and
+    then kept, and updated by this process's uploads, for
+    VECTOR_STORE_DEDUP_TTL seconds. Files removed upstream within that
+    window can still be matched; lower the TTL if stores are pruned often.
+    Identical concurrent uploads to the same store (e.g. the same file twice
+    in one request) are collapsed into one ingestion.
+
+    Config keys:
+        VECTOR_STORE_DEDUP             enable deduplication (default True)
+        VECTOR_STORE_DEDUP_TTL         seconds a store's index is kept (default 600)
+        VECTOR_STORE_DEDUP_CACHE_SIZE  stores indexed at once (default 256)
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.cache = None
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.duplicates = 0
+        self.index_loads = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("VECTOR_STORE_DEDUP", True))
+        ttl = float(app.config.get("VECTOR_STORE_DEDUP_TTL", 600))
+        size = int(app.config.get("VECTOR_STORE_DEDUP_CACHE_SIZE", 256))
+        self.cache = TTLCache(maxsize=size, ttl=ttl)
+        app.extensions["content_index"] = self
+
+    def _index(self, vectors, vector_store_id):
+        """sha256 -> file record for one store, loaded on first use."""
+        index = self.cache.get(vector_store_id)
+        if index is None:
+            index = self._flight.do(
+                ("index", vector_store_id), self._load, vectors, vector_store_id
+            )
+        return index
+
+    def _load(self, vectors, vector_store_id):
+        index = {}
+        for record in vectors.list_store_files(vector_store_id):
+            content_hash = (getattr(record, "meta_data", None) or {}).get(HASH_KEY)
+            if content_hash and _is_completed(record):
+                index.setdefault(content_hash, record)
+        with self._lock:
+            self.index_loads += 1
+        self.cache.set(vector_store_id, index)
+        return index
+
+    def lookup(self, vectors, vector_store_id, content_hash):
+        """The store's file with this content, or None (also if the store can't be listed)."""
+        try:
+            return self._index(vectors, vector_store_id).get(content_hash)
+        except Exception as e:
+            if is_not_found(e):
+                raise
+            logging_utility.warning(
+                f"Could not index vector store {vector_store_id}: {e}"
+            )
+            return None
+
+    def add_file(self, vectors, vector_store_id, content_hash, add):
+        """
+        Returns (record, duplicate). If a file with `content_hash` is already
+        in the store, returns its record; otherwise calls add() (which must
+        store the file with HASH_KEY in its metadata) and indexes the result.
+        """
+        if not self.enabled or not content_hash:
+            return add(), False
+
+        leader = []
+
+        def add_once():
+            leader.append(True)
+            record = self.lookup(vectors, vector_store_id, content_hash)
+            if record is not None:
+                return record, False
+            record = add()
+            index = self.cache.get(vector_store_id)
+            if index is not None:
+                index.setdefault(content_hash, record)
+            return record, True
+
+        record, created = self._flight.do(
+            ("add", vector_store_id, content_hash), add_once
+        )
+        duplicate = not (created and leader)
+        with self._lock:
+            if duplicate:
+                self.duplicates += 1
+            else:
+                self.uploads += 1
+        return record, duplicate
+
+    def forget(self, vector_store_id):
+        self.cache.invalidate(vector_store_id)
+
+    def stats(self):
+        with self._lock:
+            counters = {
+                "enabled": self.enabled,
+                "uploads": self.uploads,
+                "duplicates": self.duplicates,
+                "index_loads": self.index_loads,
+            }
+        counters["cache"] = self.cache.stats() if self.cache is not None else None
+        return counters
@@ -0,0 +1,102 @@
+# backend/app/services/vector_store_services/store_resolver.py
+from datetime import datetime
+
+import httpx
+
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+
+def is_not_found(error):
+    """True if an SDK call failed with HTTP 404 (VectorStoreClientError wraps it)."""
+    cause = error.__cause__ or error
+    if isinstance(cause, httpx.HTTPStatusError):
+        return cause.response.status_code == 404
+    return str(error).startswith("API 404")
+
+
+class VectorStoreResolver:
+    """
+    Per-user cache of the vector store uploads go to: the earliest store
+    named VECTOR_STORE_NAME. Resolving it costs a list_my_vector_stores()
+    round-trip, so the id is kept for VECTOR_STORE_CACHE_TTL seconds, or
+    until invalidate() (call it when the store turns out to be gone).
+
+    Config keys:
+        VECTOR_STORE_NAME        store name to resolve (default "file_search")
+        VECTOR_STORE_CACHE_TTL   seconds; 0 disables the cache (default 3600)
+        VECTOR_STORE_CACHE_SIZE  cached users (default 1024)
+    """
+
+    def __init__(self, app=None):
+        self.store_name = "file_search"
+        self.cache = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.store_name = app.config.get("VECTOR_STORE_NAME", "file_search")
+        ttl = float(app.config.get("VECTOR_STORE_CACHE_TTL", 3600))
+        size = int(app.config.get("VECTOR_STORE_CACHE_SIZE", 1024))
+        self.cache = TTLCache(maxsize=size, ttl=ttl) if ttl > 0 else None
+        app.extensions["vector_stores"] = self
+
+    def resolve(self, vectors, user_id):
+        """The user's target vector_store_id, or None if there is no such store."""
+        if self.cache is not None:
+            vector_store_id = self.cache.get(user_id)
+            if vector_store_id is not None:
+                return vector_store_id
+
+        stores = [
+            s for s in vectors.list_my_vector_stores() if s.name == self.store_name
+        ]
+        if not stores:
+            return None
+
+        earliest_store = min(
+            stores, key=lambda s: getattr(s, "created_at", datetime.utcnow())
+        )
+        logging_utility.info(
+            f"Earliest vector store for '{self.store_name}': {earliest_store.id}"
+        )
+        if self.cache is not None:
+            self.cache.set(user_id, earliest_store.id)
+        return earliest_store.id
+
+    def with_store(self, vectors, user_id, fn):
+        """
+        Returns fn(vector_store_id) for the user's store. If the cached store
+        turns out to be gone (404), resolves it again and retries once.
+        Raises LookupError if the user has no store.
+        """
+        vector_store_id = self.resolve(vectors, user_id)
+        if vector_store_id is None:
+            raise LookupError(f"Vector store '{self.store_name}' not found")
+        try:
+            return fn(vector_store_id)
+        except Exception as e:
+            if not is_not_found(e):
+                raise
+            logging_utility.warning(
+                f"Vector store {vector_store_id} not found; re-resolving."
+            )
+            self.invalidate(user_id)
+
+        vector_store_id = self.resolve(vectors, user_id)
+        if vector_store_id is None:
+            raise LookupError(f"Vector store '{self.store_name}' not found")
+        return fn(vector_store_id)
+
+    def invalidate(self, user_id):
+        if self.cache is not None:
+            self.cache.invalidate(user_id)
+
+    def stats(self):
+        return {
+            "store_name": self.store_name,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
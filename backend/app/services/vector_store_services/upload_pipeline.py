@@ -0,0 +1,368 @@
+# backend/app/services/vector_store_services/upload_pipeline.py
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from werkzeug.sansio.multipart import (Data, Epilogue, Field, File,
+                                       MultipartDecoder, NeedData)
+from werkzeug.utils import secure_filename
+
+from backend.app.services.logging_service.logger import LoggingUtility
+
+logging_utility = LoggingUtility()
+
+
+# One received file part, spooled to `path`; in_memory: the file lives on
+# the RAM-backed spool directory (see SpooledPart); sha256: hex digest of
+# its content.
+UploadPart = namedtuple(
+    "UploadPart",
+    ["index", "filename", "mimetype", "path", "size", "in_memory", "sha256"],
+)
+
+
+class MemoryBudget:
+    """Bytes that spooled parts may hold in RAM at once, shared across requests."""
+
+    def __init__(self, limit=0):
+        self.limit = limit
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    def take(self, size):
+        with self._lock:
+            if self.in_use + size > self.limit:
+                return False
+            self.in_use += size
+            return True
+
+    def give(self, size):
+        with self._lock:
+            self.in_use -= size
+
+
+class SpooledPart:
+    """
+    Receives one file part in memory, rolling over to a named temp file on
+    disk once it grows past `max_memory` bytes, or once `budget` (a
+    MemoryBudget, charged chunk by chunk as the bytes arrive) has no room
+    for the next chunk. The content's SHA-256 is computed as the bytes
+    arrive.
+
+    The SDK only ingests files by path, so a part that stayed in memory is
+    materialised by finish() in `memory_dir` (a tmpfs such as /dev/shm),
+    which is a single RAM-to-RAM write; the SDK's read of it never touches
+    the container's overlay filesystem. It keeps its share of the budget
+    until the file is removed. Without a memory_dir, or if writing there
+    fails, it goes to the regular temp dir, exactly like a rolled-over part.
+    """
+
+    def __init__(self, suffix, max_memory=0, budget=None):
+        self.suffix = suffix
+        self.max_memory = max_memory
+        self.budget = budget
+        self.size = 0
+        self.held = 0
+        self.hash = hashlib.sha256()
+        self._buffer = io.BytesIO()
+        self._file = None
+
+    def write(self, data):
+        self.size += len(data)
+        self.hash.update(data)
+        if self._file is None and (
+            self.size > self.max_memory or not self._charge(len(data))
+        ):
+            self._file = tempfile.NamedTemporaryFile(delete=False, suffix=self.suffix)
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+            self._uncharge()
+        (self._file or self._buffer).write(data)
+
+    def _charge(self, size):
+        if self.budget is None:
+            return True
+        if not self.budget.take(size):
+            return False
+        self.held += size
+        return True
+
+    def _uncharge(self):
+        if self.held:
+            self.budget.give(self.held)
+            self.held = 0
+
+    def _write_out(self, directory):
+        out = tempfile.NamedTemporaryFile(
+            delete=False, suffix=self.suffix, dir=directory
+        )
+        try:
+            with out:
+                out.write(self._buffer.getbuffer())
+        except BaseException:
+            os.unlink(out.name)
+            raise
+        return out.name
+
+    def finish(self, memory_dir=None):
+        """Returns (path, in_memory)."""
+        if self._file is not None:
+            self._file.close()
+            return self._file.name, False
+        try:
+            path = self._write_out(memory_dir)
+        except OSError:
+            if memory_dir is None:
+                raise
+            # tmpfs full or gone: use the disk.
+            memory_dir = None
+            path = self._write_out(None)
+        if memory_dir is None:
+            self._uncharge()
+        self._buffer = None
+        return path, memory_dir is not None
+
+    def discard(self):
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+        self._buffer = None
+        self._uncharge()
+
+
+def iter_file_parts(
+    stream, boundary, chunk_size=64 * 1024, max_parts=None, spool=None, finish=None
+):
+    """
+    Reads a multipart/form-data body incrementally and yields each file part
+    as soon as its last byte has arrived, hashed and spooled by `spool(suffix)` (a
+    SpooledPart by default) and written out by `finish(spooled)` -> (path,
+    in_memory). Files keep their original extension (the SDK's
+    FileProcessor keys off it). Non-file fields and parts without a usable
+    filename are skipped.
+
+    The consumer owns the yielded files. If the generator is closed early,
+    the part being received is discarded.
+    """
+    spool = spool or SpooledPart
+    finish = finish or (lambda spooled: spooled.finish())
+    decoder = MultipartDecoder(boundary, max_parts=max_parts)
+    part = out = None
+    index = 0
+    try:
+        while True:
+            data = stream.read(chunk_size)
+            decoder.receive_data(data or None)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, File):
+                    filename = secure_filename(event.filename or "")
+                    if filename:
+                        out = spool(os.path.splitext(filename)[1])
+                        mimetype = event.headers.get("Content-Type") or ""
+                        part = (
+                            filename,
+                            mimetype.split(";")[0].strip()
+                            or "application/octet-stream",
+                        )
+                elif isinstance(event, Field):
+                    part = out = None
+                elif isinstance(event, Data) and out is not None:
+                    out.write(event.data)
+                    if not event.more_data:
+                        spooled, out = out, None
+                        path, in_memory = finish(spooled)
+                        filename, mimetype = part
+                        received = UploadPart(
+                            index,
+                            filename,
+                            mimetype,
+                            path,
+                            spooled.size,
+                            in_memory,
+                            spooled.hash.hexdigest(),
+                        )
+                        part = None
+                        index += 1
+                        yield received
+                event = decoder.next_event()
+            if not data or isinstance(event, Epilogue):
+                break
+    finally:
+        if out is not None:
+            out.discard()
+
+
+def _default_memory_dir():
+    path = "/dev/shm"
+    return path if os.path.isdir(path) and os.access(path, os.W_OK) else None
+
+
+class UploadPipeline:
+    """
+    Pushes uploaded files to the vector store concurrently.
+
+    run() consumes parts from iter_file_parts() and hands each to a bounded
+    pool as soon as it has been received, so file 1 is being ingested while
+    file 2 is still arriving, and an N-file upload takes roughly
+    max(ingestion) instead of sum(ingestion) (up to UPLOAD_MAX_WORKERS files
+    at a time, across all requests).
+
+    Parts up to UPLOAD_SPOOL_MAX_MEMORY bytes are buffered in memory and
+    handed to the SDK from UPLOAD_SPOOL_MEMORY_DIR (a tmpfs), so the common
+    small-document upload never writes to or reads from the overlay disk.
+    At most UPLOAD_SPOOL_MEMORY_BUDGET bytes are held in memory at once,
+    across all requests, counting parts still arriving as well as spooled
+    files; parts that are bigger, or outgrow what is left of the budget,
+    go to the regular temp dir as before.
+
+    Config keys:
+        UPLOAD_MAX_WORKERS          concurrent ingestion calls (default 4)
+        UPLOAD_READ_CHUNK           request body read size in bytes (default 64 KiB)
+        UPLOAD_MAX_PARTS            multipart parts accepted per request (default 100)
+        UPLOAD_SPOOL_MAX_MEMORY     per-part in-memory limit in bytes (default 8 MiB)
+        UPLOAD_SPOOL_MEMORY_BUDGET  bytes held in memory overall (default 32 MiB)
+        UPLOAD_SPOOL_MEMORY_DIR     RAM-backed dir (default /dev/shm if writable;
+                                    "" spools everything to disk)
+    """
+
+    def __init__(self, app=None):
+        self.max_workers = 4
+        self.read_chunk = 64 * 1024
+        self.max_parts = 100
+        self.spool_max_memory = 0
+        self.memory = MemoryBudget()
+        self.memory_dir = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self.spooled_in_memory = 0
+        self.spooled_to_disk = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_workers = int(app.config.get("UPLOAD_MAX_WORKERS", 4))
+        self.read_chunk = int(app.config.get("UPLOAD_READ_CHUNK", 64 * 1024))
+        self.max_parts = int(app.config.get("UPLOAD_MAX_PARTS", 100))
+        self.spool_max_memory = int(
+            app.config.get("UPLOAD_SPOOL_MAX_MEMORY", 8 * 1024 * 1024)
+        )
+        self.memory = MemoryBudget(
+            int(app.config.get("UPLOAD_SPOOL_MEMORY_BUDGET", 32 * 1024 * 1024))
+        )
+        memory_dir = app.config.get("UPLOAD_SPOOL_MEMORY_DIR")
+        if memory_dir is None:
+            memory_dir = _default_memory_dir()
+        self.memory_dir = memory_dir or None
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="vector-upload"
+        )
+        app.extensions["upload_pipeline"] = self
+
+    def parts(self, stream, boundary):
+        return iter_file_parts(
+            stream,
+            boundary,
+            chunk_size=self.read_chunk,
+            max_parts=self.max_parts,
+            spool=self._spool,
+            finish=self._finish,
+        )
+
+    def _spool(self, suffix):
+        if not self.memory_dir:
+            return SpooledPart(suffix)
+        return SpooledPart(suffix, max_memory=self.spool_max_memory, budget=self.memory)
+
+    def _finish(self, spooled):
+        path, in_memory = spooled.finish(self.memory_dir)
+        with self._lock:
+            if in_memory:
+                self.spooled_in_memory += 1
+            else:
+                self.spooled_to_disk += 1
+        return path, in_memory
+
+    def discard(self, part):
+        """Removes a part's file and returns its share of the memory budget."""
+        try:
+            os.unlink(part.path)
+        finally:
+            if part.in_memory:
+                self.memory.give(part.size)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "memory_dir": self.memory_dir,
+                "memory_budget": self.memory.limit,
+                "memory_in_use": self.memory.in_use,
+                "spooled_in_memory": self.spooled_in_memory,
+                "spooled_to_disk": self.spooled_to_disk,
+            }
+
+    def run(self, parts, upload):
+        """
+        Yields ("received", part) as each part arrives and ("uploaded", result)
+        as each upload finishes (completion order). upload(part) returns the
+        per-file metadata; it runs on the pool and its failures are reported
+        in the result rather than raised. Temp files are removed once their
+        upload is done.
+        """
+        pending = set()
+        try:
+            for part in parts:
+                pending.add(self.submit(upload, part))
+                yield "received", part
+                done = {f for f in pending if f.done()}
+                pending -= done
+                for future in done:
+                    yield "uploaded", future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield "uploaded", future.result()
+        finally:
+            # Client went away: let running uploads finish, drop queued ones.
+            if hasattr(parts, "close"):
+                parts.close()
+            for future in pending:
+                if future.cancel():
+                    self.discard(future.part)
+
+    def ingest(self, fn, *args, **kwargs):
+        """Runs one ingestion call on the upload pool and waits for its result."""
+        return self._pool.submit(fn, *args, **kwargs).result()
+
+    def submit(self, upload, part):
+        future = self._pool.submit(self._upload, upload, part)
+        future.part = part
+        return future
+
+    def _upload(self, upload, part):
+        start_time = time.time()
+        result = {
+            "index": part.index,
+            "name": part.filename,
+            "size": part.size,
+            "mime": part.mimetype,
+        }
+        try:
+            result.update(upload(part))
+            result["status"] = "success"
+        except Exception as e:
+            logging_utility.error(f"Upload of '{part.filename}' failed: {e}")
+            result["status"] = "error"
+            result["error"] = str(e)
+        finally:
+            self.discard(part)
+        result["duration"] = round(time.time() - start_time, 3)
+        return result
@@ -13,6 +13,124 @@ class Config:
         "SQLALCHEMY_TRACK_MODIFICATIONS", "True"
     ).lower() in ["true", "1", "t"]
 
+    # Bounded pool for SDK inference streams (see StreamExecutor)
+    STREAM_EXECUTOR_MAX_WORKERS = int(os.environ.get("STREAM_EXECUTOR_MAX_WORKERS", 32))
+    STREAM_EXECUTOR_MAX_QUEUE = int(os.environ.get("STREAM_EXECUTOR_MAX_QUEUE", 64))
+    STREAM_EXECUTOR_RETRY_AFTER = int(os.environ.get("STREAM_EXECUTOR_RETRY_AFTER", 5))
+    STREAM_EXECUTOR_ITEM_TIMEOUT = float(
+        os.environ.get("STREAM_EXECUTOR_ITEM_TIMEOUT", 300)
+    )
+
+    # Token coalescing for the NDJSON stream; 0 disables (see TokenCoalescer)
+    STREAM_COALESCE_WINDOW_MS = float(os.environ.get("STREAM_COALESCE_WINDOW_MS", 0))
+    STREAM_COALESCE_MAX_BYTES = int(os.environ.get("STREAM_COALESCE_MAX_BYTES", 4096))
+
+    # Resumable streams: "" disables, "memory" or "disk" (see ReplayStore)
+    STREAM_REPLAY_BACKEND = os.environ.get("STREAM_REPLAY_BACKEND", "")
+    STREAM_REPLAY_MAX_EVENTS = int(os.environ.get("STREAM_REPLAY_MAX_EVENTS", 5000))
+    STREAM_REPLAY_MAX_RUNS = int(os.environ.get("STREAM_REPLAY_MAX_RUNS", 256))
+    STREAM_REPLAY_TTL = float(os.environ.get("STREAM_REPLAY_TTL", 600))
+    STREAM_REPLAY_DIR = os.environ.get("STREAM_REPLAY_DIR")
+
+    # SSE variant of the stream (Accept: text/event-stream, see SSEEncoder)
+    STREAM_SSE_HEARTBEAT = float(os.environ.get("STREAM_SSE_HEARTBEAT", 15))
+    STREAM_SSE_ENCODINGS = os.environ.get("STREAM_SSE_ENCODINGS", "gzip,deflate")
+    STREAM_SSE_FLUSH_BYTES = int(os.environ.get("STREAM_SSE_FLUSH_BYTES", 0))
+    STREAM_SSE_COMPRESS_LEVEL = int(os.environ.get("STREAM_SSE_COMPRESS_LEVEL", 6))
+
+    # Concurrent tool execution for ToolCallRequestEvent (see ToolScheduler)
+    TOOL_EXECUTOR_MAX_WORKERS = int(os.environ.get("TOOL_EXECUTOR_MAX_WORKERS", 8))
+    TOOL_CALL_TIMEOUT = float(os.environ.get("TOOL_CALL_TIMEOUT", 60))
+    TOOL_CALL_TIMEOUTS = os.environ.get("TOOL_CALL_TIMEOUTS", "{}")
+    TOOL_HANDLER_MAX_ABANDONED = int(
+        os.environ.get("TOOL_HANDLER_MAX_ABANDONED", TOOL_EXECUTOR_MAX_WORKERS)
+    )
+
+    # Tool registry for the stream (see ToolBackend); 0 TTL disables the cache.
+    # RIPEstat tools are never cached there: RipeStatCache owns their freshness.
+    TOOL_RESULT_CACHE_TTL = float(os.environ.get("TOOL_RESULT_CACHE_TTL", 300))
+    TOOL_RESULT_CACHE_SIZE = int(os.environ.get("TOOL_RESULT_CACHE_SIZE", 512))
+    TOOL_RESULT_CACHE_EXCLUDE = os.environ.get(
+        "TOOL_RESULT_CACHE_EXCLUDE", "getWhatsMyIp,get_flight_times"
+    )
+
+    # Shared SDK client for all blueprints (see EntityClientProvider)
+    ENTITIES_BASE_URL = os.environ.get("ENTITIES_BASE_URL")
+    ENTITIES_POOL_MAX_CONNECTIONS = int(
+        os.environ.get("ENTITIES_POOL_MAX_CONNECTIONS", 100)
+    )
+    ENTITIES_POOL_MAX_KEEPALIVE = int(os.environ.get("ENTITIES_POOL_MAX_KEEPALIVE", 20))
+    ENTITIES_KEEPALIVE_EXPIRY = float(os.environ.get("ENTITIES_KEEPALIVE_EXPIRY", 30))
+    ENTITIES_REINIT_BACKOFF = float(os.environ.get("ENTITIES_REINIT_BACKOFF", 10))
+    ENTITIES_HEALTH_INTERVAL = float(os.environ.get("ENTITIES_HEALTH_INTERVAL", 30))
+    ENTITIES_HEALTH_PATH = os.environ.get("ENTITIES_HEALTH_PATH", "/")
+    ENTITIES_HEALTH_FAILURES = int(os.environ.get("ENTITIES_HEALTH_FAILURES", 3))
+    ENTITIES_SINGLE_FLIGHT = os.environ.get(
+        "ENTITIES_SINGLE_FLIGHT",
+        "threads.list_threads,messages.list_messages,"
+        "vectors.list_my_vector_stores,assistants.retrieve_assistant",
+    )
+
+    # Thread / message listing cache (see ListingCache); 0 TTL disables it
+    LISTING_CACHE_TTL = float(os.environ.get("LISTING_CACHE_TTL", 30))
+    LISTING_CACHE_SIZE = int(os.environ.get("LISTING_CACHE_SIZE", 1024))
+    LISTING_CACHE_REDIS_URL = os.environ.get("LISTING_CACHE_REDIS_URL")
+    LISTING_CACHE_LOCAL_TTL = float(os.environ.get("LISTING_CACHE_LOCAL_TTL", 5))
+
+    # Batched assistant feature toggles (see AssistantSettingsBatcher)
+    ASSISTANT_SETTINGS_FLAGS = os.environ.get(
+        "ASSISTANT_SETTINGS_FLAGS", "deep_research,web_access"
+    )
+    ASSISTANT_SETTINGS_DEBOUNCE = float(
+        os.environ.get("ASSISTANT_SETTINGS_DEBOUNCE", 0.2)
+    )
+    ASSISTANT_SETTINGS_MAX_WAIT = float(
+        os.environ.get("ASSISTANT_SETTINGS_MAX_WAIT", 1)
+    )
+    ASSISTANT_SETTINGS_CACHE_TTL = float(
+        os.environ.get("ASSISTANT_SETTINGS_CACHE_TTL", 300)
+    )
+
+    # Lists at least this long are streamed instead of rendered in one go
+    JSON_STREAM_MIN_ITEMS = int(os.environ.get("JSON_STREAM_MIN_ITEMS", 500))
+
+    # Upload target store, cached per user (see VectorStoreResolver)
+    VECTOR_STORE_NAME = os.environ.get("VECTOR_STORE_NAME", "file_search")
+    VECTOR_STORE_CACHE_TTL = float(os.environ.get("VECTOR_STORE_CACHE_TTL", 3600))
+    VECTOR_STORE_CACHE_SIZE = int(os.environ.get("VECTOR_STORE_CACHE_SIZE", 1024))
+
+    # Content-hash upload deduplication per store (see ContentIndex)
+    VECTOR_STORE_DEDUP = os.environ.get("VECTOR_STORE_DEDUP", "true").lower() in [
+        "true",
+        "1",
+        "t",
+    ]
+    VECTOR_STORE_DEDUP_TTL = float(os.environ.get("VECTOR_STORE_DEDUP_TTL", 600))
+    VECTOR_STORE_DEDUP_CACHE_SIZE = int(
+        os.environ.get("VECTOR_STORE_DEDUP_CACHE_SIZE", 256)
+    )
+
+    # Concurrent multi-file uploads (see UploadPipeline)
+    UPLOAD_MAX_WORKERS = int(os.environ.get("UPLOAD_MAX_WORKERS", 4))
+    UPLOAD_READ_CHUNK = int(os.environ.get("UPLOAD_READ_CHUNK", 64 * 1024))
+    UPLOAD_MAX_PARTS = int(os.environ.get("UPLOAD_MAX_PARTS", 100))
+    UPLOAD_SPOOL_MAX_MEMORY = int(
+        os.environ.get("UPLOAD_SPOOL_MAX_MEMORY", 8 * 1024 * 1024)
+    )
+    UPLOAD_SPOOL_MEMORY_BUDGET = int(
+        os.environ.get("UPLOAD_SPOOL_MEMORY_BUDGET", 32 * 1024 * 1024)
+    )
+    # Unset: /dev/shm when writable; empty string: always spool to disk.
+    UPLOAD_SPOOL_MEMORY_DIR = os.environ.get("UPLOAD_SPOOL_MEMORY_DIR")
+
+    # Resumable chunked uploads (see ChunkedUploadStore)
+    UPLOAD_CHUNK_DIR = os.environ.get("UPLOAD_CHUNK_DIR")
+    UPLOAD_CHUNK_MAX_SIZE = int(
+        os.environ.get("UPLOAD_CHUNK_MAX_SIZE", 1024 * 1024 * 1024)
+    )
+    UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024))
+    UPLOAD_CHUNK_TTL = float(os.environ.get("UPLOAD_CHUNK_TTL", 86400))
+
     @staticmethod
     def init_app(app):
         pass
@@ -0,0 +1,59 @@
+# scripts/bench_event_encoder.py
+# Per-token encode cost of the NDJSON stream: legacy json.dumps(dict) vs the
+# template-based EventEncoder (json and orjson backends).
+#
+#   python -m scripts.bench_event_encoder [iterations]
+import json
+import sys
+import timeit
+
+from projectdavid import ContentEvent, ReasoningEvent
+
+from backend.app.services.streaming_services.event_encoder import \
+    build_ndjson_encoder
+
+RUN_ID = "run_ar29rE9odEf9Kq2ciZoq5W"
+
+
+def legacy_encode(event):
+    return (
+        json.dumps(
+            {
+                "type": "content",
+                "content": event.content,
+                "run_id": event.run_id,
+            }
+        )
+        + "\n"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tokens = {
+        "ascii token": ContentEvent(run_id=RUN_ID, content=" the"),
+        "unicode token": ContentEvent(run_id=RUN_ID, content=' "ça" — ✓\n'),
+        "reasoning chunk": ReasoningEvent(run_id=RUN_ID, content="Let me think " * 8),
+    }
+
+    json_encoder = build_ndjson_encoder("json")
+    orjson_encoder = build_ndjson_encoder("orjson")
+
+    print(f"{iterations:,} iterations per case, ns/event\n")
+    print(f"{'case':<18}{'legacy':>10}{'template':>10}{orjson_encoder.backend:>10}")
+    for name, event in tokens.items():
+        if isinstance(event, ContentEvent):
+            assert json_encoder.encode(event) == legacy_encode(event)
+        legacy = timeit.timeit(lambda: legacy_encode(event), number=iterations)
+        templ = timeit.timeit(lambda: json_encoder.encode(event), number=iterations)
+        fast = timeit.timeit(lambda: orjson_encoder.encode(event), number=iterations)
+        print(
+            f"{name:<18}"
+            f"{legacy / iterations * 1e9:>10.0f}"
+            f"{templ / iterations * 1e9:>10.0f}"
+            f"{fast / iterations * 1e9:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
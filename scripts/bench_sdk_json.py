@@ -0,0 +1,111 @@
+# scripts/bench_sdk_json.py
+# Cost of turning an SDK MessagesList into a JSON response body: the old
+# probe-and-trial-dumps helpers vs the SerializerRegistry + SDKJSONProvider.
+#
+#   python -m scripts.bench_sdk_json [iterations]
+import json
+import sys
+import timeit
+
+from flask import Flask
+from projectdavid_common.schemas.messages_schema import (MessageRead,
+                                                         MessagesList)
+
+from backend.app.services.serialization_services.sdk_json import (
+    SDKJSONProvider, sdk_serializers, stream_json_list)
+
+
+def legacy_safe_count(obj):
+    for attr in ("data", "items", "messages", "results"):
+        seq = getattr(obj, attr, None)
+        if isinstance(seq, (list, tuple)):
+            return len(seq)
+    try:
+        return len(obj)
+    except Exception:
+        try:
+            return len(list(obj))
+        except Exception:
+            return None
+
+
+def legacy_jsonify_sdk_list(obj):
+    if isinstance(obj, (list, tuple)):
+        return obj
+    for attr in ("data", "items", "messages", "results"):
+        seq = getattr(obj, attr, None)
+        if isinstance(seq, (list, tuple)):
+            return seq
+    try:
+        json.dumps(obj)
+        return obj
+    except Exception:
+        return {"repr": repr(obj), "type": type(obj).__name__}
+
+
+def legacy_body(messages):
+    # Flask's default provider can't encode the models, so the old route had
+    # to dump them by hand before jsonify() could run.
+    legacy_safe_count(messages)
+    items = [m.model_dump(mode="json") for m in legacy_jsonify_sdk_list(messages)]
+    return json.dumps({"messages": items}, sort_keys=True)
+
+
+def message(i):
+    return MessageRead(
+        id=f"message_{i:06d}",
+        assistant_id="asst_13HyDgBnZxVwh5XexYu74F",
+        completed_at=1700000000 + i,
+        content="Lorem ipsum dolor sit amet, " * 6,
+        created_at=1700000000 + i,
+        incomplete_at=None,
+        incomplete_details=None,
+        meta_data={"source": "bench"},
+        object="thread.message",
+        role="assistant" if i % 2 else "user",
+        run_id="run_ar29rE9odEf9Kq2ciZoq5W",
+        status="completed",
+        thread_id="thread_bench",
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = Flask(__name__)
+    app.json = SDKJSONProvider(app)
+    dumps = app.json.dumps
+
+    def registry_body(messages):
+        sdk_serializers.count(messages)
+        return dumps({"messages": sdk_serializers.list_items(messages)})
+
+    def streamed_body(messages):
+        items = sdk_serializers.list_items(messages)
+        return "".join(stream_json_list("messages", items, dumps))
+
+    print(f"{iterations:,} iterations per case, µs/response\n")
+    print(
+        f"{'messages':<10}{'legacy':>10}{'registry':>10}{'streamed':>10}{'cached':>10}"
+    )
+    for size in (20, 200, 2000):
+        messages = MessagesList(data=[message(i) for i in range(size)])
+        # What the listing cache holds after the first load.
+        plain = sdk_serializers.to_plain(list(messages.data))
+        assert json.loads(legacy_body(messages)) == json.loads(registry_body(messages))
+
+        n = max(1, iterations * 20 // size)
+        legacy = timeit.timeit(lambda: legacy_body(messages), number=n)
+        registry = timeit.timeit(lambda: registry_body(messages), number=n)
+        streamed = timeit.timeit(lambda: streamed_body(messages), number=n)
+        cached = timeit.timeit(lambda: dumps({"messages": plain}), number=n)
+        print(
+            f"{size:<10}"
+            f"{legacy / n * 1e6:>10.0f}"
+            f"{registry / n * 1e6:>10.0f}"
+            f"{streamed / n * 1e6:>10.0f}"
+            f"{cached / n * 1e6:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
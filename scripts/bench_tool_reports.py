@@ -0,0 +1,236 @@
+# scripts/bench_tool_reports.py
+# Cost of formatting large RIPEstat / ONS answers for the model: the legacy
+# `response += ...` formatters vs TextReport, with the row and character
+# limits off (same output) and at their defaults (truncated output).
+#
+#   python -m scripts.bench_tool_reports [iterations]
+import sys
+import timeit
+
+from backend.app.services.function_call_service.handlers import text_report
+from backend.app.services.function_call_service.handlers.ons_data_handler import \
+    OnsDataHandler
+from backend.app.services.function_call_service.handlers.ripe_stat_handler import \
+    RipeStatHandler
+
+TIMELINE = {"starttime": "2024-01-01T00:00:00", "endtime": "2024-06-30T16:00:00"}
+
+
+def prefix(i):
+    return f"{10 + i // 65536 % 200}.{i // 256 % 256}.{i % 256}.0/24"
+
+
+def announced_prefixes(size):
+    return {
+        "status": "ok",
+        "data": {
+            "prefixes": [
+                {"prefix": prefix(i), "timelines": [TIMELINE] * (1 + i % 3)}
+                for i in range(size)
+            ]
+        },
+    }
+
+
+def bgp_updates(size):
+    return {
+        "status": "ok",
+        "data": {
+            "updates": [
+                {
+                    "type": "A" if i % 5 else "W",
+                    "timestamp": f"2024-05-01T12:{i // 60 % 60:02d}:{i % 60:02d}",
+                    "attrs": {
+                        "target_prefix": prefix(i),
+                        "path": [3333, 1299, 174, 64500 + i % 500],
+                        "community": ["1299:30000", "3333:100", f"174:{i % 90}"],
+                        "source_id": f"{i % 26:02d}-192.0.2.{i % 250}",
+                    },
+                }
+                for i in range(size)
+            ]
+        },
+    }
+
+
+def routing_history(size):
+    origins = 20
+    return {
+        "status": "ok",
+        "data": {
+            "by_origin": [
+                {
+                    "origin": str(64500 + o),
+                    "prefixes": [
+                        {"prefix": prefix(o * size + i), "timelines": [TIMELINE] * 2}
+                        for i in range(size // origins)
+                    ],
+                }
+                for o in range(origins)
+            ]
+        },
+    }
+
+
+def ons_records(size):
+    return [
+        {
+            "time": 2010 + i % 14,
+            "geography": f"E0600{i % 400:04d}",
+            "Geography": "Local authority " + str(i % 400),
+            "measure-of-wellbeing": "life-satisfaction",
+            "MeasureOfWellbeing": "Life satisfaction",
+            "estimate": "average-mean",
+            "Estimate": "Average (mean)",
+            "Value": 7.2 + (i % 17) / 10,
+        }
+        for i in range(size)
+    ]
+
+
+def legacy_announced_prefixes(data):
+    response = "Announced Prefixes:\n\n"
+    for prefix_data in data.get("data", {}).get("prefixes", []):
+        response += f"Prefix: {prefix_data.get('prefix', '')}\n"
+        response += "Timelines:\n"
+        for timeline in prefix_data.get("timelines", []):
+            response += f"- Start: {timeline.get('starttime', '')}, End: {timeline.get('endtime', '')}\n"
+        response += "\n"
+    response += "---\n"
+    return response
+
+
+def legacy_bgp_updates(data):
+    response = "BGP Updates:\n\n"
+    for update in data.get("data", {}).get("updates", []):
+        attrs = update.get("attrs", {})
+        response += f"Type: {update.get('type', '')}, Timestamp: {update.get('timestamp', '')}, Prefix: {attrs.get('target_prefix', '')}, Path: {attrs.get('path', [])}, Community: {attrs.get('community', [])}, Source ID: {attrs.get('source_id', '')}\n"
+    response += "---\n"
+    return response
+
+
+def legacy_routing_history(data):
+    response = "Routing History:\n\n"
+    for origin_data in data.get("data", {}).get("by_origin", []):
+        response += f"Origin: {origin_data.get('origin', '')}\n"
+        for prefix_data in origin_data.get("prefixes", []):
+            response += f"Prefix: {prefix_data.get('prefix', '')}\n"
+            for timeline in prefix_data.get("timelines", []):
+                response += f"  Start: {timeline.get('starttime', '')}, End: {timeline.get('endtime', '')}\n"
+            response += "\n"
+    response += "---\n"
+    return response
+
+
+def legacy_ons_records(records):
+    response = "Wellbeing by Local Authority Data:\n\n"
+    for item in records:
+        for key, value in item.items():
+            response += f"{key}: {value}\n"
+        response += "---\n"
+    return response
+
+
+class StubRipeStat:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def get_announced_prefixes(self, *args):
+        return self.payloads["announced"]
+
+    def get_bgp_updates(self, *args):
+        return self.payloads["updates"]
+
+    def get_routing_history(self, *args):
+        return self.payloads["history"]
+
+
+class StubOns:
+    def __init__(self, records):
+        self.records = records
+
+    def get_wellbeing_by_local_authority_data(self, dimensions):
+        return self.records
+
+
+def set_limits(rows, chars, nested):
+    text_report.MAX_ROWS = rows
+    text_report.MAX_CHARS = chars
+    text_report.MAX_NESTED_ROWS = nested
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    defaults = (
+        text_report.MAX_ROWS,
+        text_report.MAX_CHARS,
+        text_report.MAX_NESTED_ROWS,
+    )
+    unlimited = (sys.maxsize, sys.maxsize, sys.maxsize)
+    ripe = RipeStatHandler()
+    ons = OnsDataHandler()
+
+    print(
+        f"{iterations} iterations per case, ms/response; KB of output "
+        f"(default limits: {defaults[0]} rows, {defaults[1]:,} chars)\n"
+    )
+    print(
+        f"{'case':<22}{'rows':>8}{'legacy':>10}{'report':>10}{'limited':>10}"
+        f"{'KB full':>10}{'KB ltd':>9}"
+    )
+    for size in (1_000, 10_000, 50_000):
+        ripe.ripe_stat_service = StubRipeStat(
+            {
+                "announced": announced_prefixes(size),
+                "updates": bgp_updates(size),
+                "history": routing_history(size),
+            }
+        )
+        ons.ons_api_service = StubOns(ons_records(size))
+        cases = [
+            (
+                "announced prefixes",
+                lambda: legacy_announced_prefixes(announced_prefixes_payload),
+                lambda: ripe.handle_get_announced_prefixes({"resource": "AS3333"}),
+            ),
+            (
+                "bgp updates",
+                lambda: legacy_bgp_updates(updates_payload),
+                lambda: ripe.handle_get_bgp_updates({"resource": "AS3333"}),
+            ),
+            (
+                "routing history",
+                lambda: legacy_routing_history(history_payload),
+                lambda: ripe.handle_get_routing_history({"resource": "AS3333"}),
+            ),
+            (
+                "ons records",
+                lambda: legacy_ons_records(ons.ons_api_service.records),
+                lambda: ons.handle_get_wellbeing_by_local_authority_data({}),
+            ),
+        ]
+        announced_prefixes_payload = ripe.ripe_stat_service.payloads["announced"]
+        updates_payload = ripe.ripe_stat_service.payloads["updates"]
+        history_payload = ripe.ripe_stat_service.payloads["history"]
+
+        for name, legacy, report in cases:
+            set_limits(*unlimited)
+            full = legacy()
+            assert report() == full, name
+            legacy_time = timeit.timeit(legacy, number=iterations)
+            report_time = timeit.timeit(report, number=iterations)
+            set_limits(*defaults)
+            limited_output = report()
+            limited_time = timeit.timeit(report, number=iterations)
+            print(
+                f"{name:<22}{size:>8,}"
+                f"{legacy_time / iterations * 1e3:>10.1f}"
+                f"{report_time / iterations * 1e3:>10.1f}"
+                f"{limited_time / iterations * 1e3:>10.1f}"
+                f"{len(full) / 1024:>10,.0f}"
+                f"{len(limited_output) / 1024:>9,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# scripts/bench_upload_pipeline.py
+# Wall time of a multi-file upload: the old parse-everything-then-upload-
+# sequentially route vs UploadPipeline (parts pushed to a bounded pool as
+# they arrive), spooling parts to disk or to the in-memory spool dir.
+# Ingestion is simulated with a fixed per-file latency.
+#
+#   python -m scripts.bench_upload_pipeline [ingest_ms] [file_kb]
+import io
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from werkzeug.datastructures import FileStorage
+from werkzeug.formparser import parse_form_data
+from werkzeug.test import encode_multipart
+
+from backend.app.services.vector_store_services.upload_pipeline import (
+    UploadPipeline, _default_memory_dir)
+
+BOUNDARY = "----bench-boundary"
+
+
+def body_for(n_files, file_kb):
+    payload = os.urandom(file_kb * 1024)
+    fields = {
+        f"file{i}": FileStorage(io.BytesIO(payload), f"doc{i}.pdf", f"file{i}")
+        for i in range(n_files)
+    }
+    _, body = encode_multipart(fields, boundary=BOUNDARY)
+    return body
+
+
+def ingest(ingest_s):
+    def add_file(path):
+        with open(path, "rb") as fh:
+            fh.read()
+        time.sleep(ingest_s)
+        return {"id": "vsf_bench"}
+
+    return add_file
+
+
+def legacy(body, add_file):
+    environ = {
+        "wsgi.input": io.BytesIO(body),
+        "CONTENT_LENGTH": str(len(body)),
+        "CONTENT_TYPE": f"multipart/form-data; boundary={BOUNDARY}",
+        "REQUEST_METHOD": "POST",
+    }
+    _, _, files = parse_form_data(environ)
+    results = []
+    for storage in files.values():
+        ext = os.path.splitext(storage.filename)[1]
+        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+            storage.save(tmp)
+            tmp_path = tmp.name
+        try:
+            results.append(add_file(tmp_path))
+        finally:
+            os.unlink(tmp_path)
+    return results
+
+
+def pipelined(pipeline, body, add_file):
+    parts = pipeline.parts(io.BytesIO(body), BOUNDARY.encode())
+    events = pipeline.run(parts, lambda part: add_file(part.path))
+    return [item for kind, item in events if kind == "uploaded"]
+
+
+def main():
+    ingest_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    file_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    add_file = ingest(ingest_ms / 1000)
+
+    pipelines = {}
+    spools = {"disk": ""}
+    if _default_memory_dir():
+        spools["shm"] = _default_memory_dir()
+    for workers in (4, 8):
+        for spool, memory_dir in spools.items():
+            config = {
+                "UPLOAD_MAX_WORKERS": workers,
+                "UPLOAD_SPOOL_MEMORY_DIR": memory_dir,
+            }
+            pipeline = UploadPipeline()
+            pipeline.init_app(SimpleNamespace(config=config, extensions={}))
+            pipelines[f"{workers}/{spool}"] = pipeline
+
+    print(f"{ingest_ms:g} ms simulated ingestion per {file_kb} KiB file, ms/upload\n")
+    print("pipeline columns: pool size / spool\n")
+    print(f"{'files':<8}{'legacy':>10}" + "".join(f"{k:>10}" for k in pipelines))
+    for n_files in (1, 10, 50):
+        body = body_for(n_files, file_kb)
+
+        start = time.perf_counter()
+        assert len(legacy(body, add_file)) == n_files
+        row = [time.perf_counter() - start]
+
+        for pipeline in pipelines.values():
+            start = time.perf_counter()
+            assert len(pipelined(pipeline, body, add_file)) == n_files
+            row.append(time.perf_counter() - start)
+
+        print(f"{n_files:<8}" + "".join(f"{t * 1000:>10.0f}" for t in row))
+
+
+if __name__ == "__main__":
+    main()
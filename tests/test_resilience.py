@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.app.services.api_service_external.resilience import (
+    CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy)
+
+URL = "https://stat.example.test/data"
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+def make_resilience():
+    return Resilience(
+        policy=RetryPolicy(attempts=1),
+        failure_threshold=1,
+        reset_timeout=0.05,
+        half_open_probes=1,
+    )
+
+
+def test_non_transient_error_in_half_open_probe_releases_the_probe():
+    resilience = make_resilience()
+    breaker = resilience.breaker(URL)
+
+    resilience.call(URL, lambda: Response(503))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        resilience.call(URL, lambda: Response(200))
+
+    time.sleep(0.06)
+
+    def broken():
+        raise ValueError("invalid URL")
+
+    with pytest.raises(ValueError):
+        resilience.call(URL, broken, transient=(ConnectionError,))
+    # The failed probe reopened the circuit instead of keeping its slot.
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert resilience.call(URL, lambda: Response(200)).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_transient_error_in_async_half_open_probe_releases_the_probe():
+    resilience = make_resilience()
+    breaker = resilience.breaker(URL)
+
+    async def respond(status_code):
+        return Response(status_code)
+
+    async def broken():
+        raise ValueError("invalid URL")
+
+    async def scenario():
+        await resilience.acall(URL, lambda: respond(503))
+        await asyncio.sleep(0.06)
+        with pytest.raises(ValueError):
+            await resilience.acall(URL, broken, transient=(ConnectionError,))
+        await asyncio.sleep(0.06)
+        return await resilience.acall(URL, lambda: respond(200))
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
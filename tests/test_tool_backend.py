@@ -0,0 +1,95 @@
+from concurrent.futures import Future
+
+import pytest
+from flask import Flask
+
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe import \
+    ripe_stat_cache
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.api_ripe_stat_service import \
+    RipeStatService
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.ripe_stat_cache import \
+    RipeStatCache
+from backend.app.services.api_service_external.api_public_access.api_network_engineering.ripe.ripe_stat_client import \
+    RipeStatClient
+from backend.app.services.cache_services.ttl_cache import TTLCache
+from backend.app.services.function_call_service.handlers.ripe_stat_handler import \
+    RipeStatHandler
+from backend.app.services.function_call_service.tool_backend import ToolBackend
+
+LOOKING_GLASS = {
+    "status": "ok",
+    "data": {
+        "rrcs": [
+            {
+                "rrc": "RRC00",
+                "location": "Amsterdam",
+                "peers": [{"asn": "3333", "prefix": "193.0.0.0/21"}],
+            }
+        ]
+    },
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ripe_stat_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def upstream(clock):
+    """A RipeStatClient with a memory-only cache whose calls are counted, not sent."""
+    cache = RipeStatCache(path="")
+    cache.memory = TTLCache(maxsize=16, ttl=ripe_stat_cache.DEFAULT_TTL, clock=clock)
+    client = RipeStatClient(base_url="https://stat.example.test/data", cache=cache)
+    client.calls = []
+
+    def submit(path, params=None, timeout=None):
+        client.calls.append((path, params))
+        future = Future()
+        future.set_result(LOOKING_GLASS)
+        return future
+
+    client.submit = submit
+    return client
+
+
+@pytest.fixture
+def backend(upstream):
+    handler = RipeStatHandler()
+    handler.ripe_stat_service = RipeStatService(client=upstream)
+
+    app = Flask(__name__)
+    app.config.update(TOOL_RESULT_CACHE_TTL=300, TOOL_RESULT_CACHE_EXCLUDE="")
+    return ToolBackend(
+        app, handlers={"getLookingGlass": handler.handle_get_looking_glass}
+    )
+
+
+def test_looking_glass_is_not_served_after_its_ttl(backend, upstream, clock):
+    first = backend("getLookingGlass", {"resource": "AS3333"})
+    assert "RRC00" in first
+    assert len(upstream.calls) == 1
+
+    clock.now += ripe_stat_cache.TTL_POLICY["looking-glass"] - 1
+    backend("getLookingGlass", {"resource": "AS3333"})
+    assert len(upstream.calls) == 1
+
+    clock.now += 2
+    backend("getLookingGlass", {"resource": "AS3333"})
+    assert len(upstream.calls) == 2
+
+
+def test_resource_case_shares_one_cache_entry(backend, upstream):
+    backend("getLookingGlass", {"resource": "as3333"})
+    backend("getLookingGlass", {"resource": "AS3333"})
+    assert len(upstream.calls) == 1